@@ -23,7 +23,7 @@ from tools.processing_tool_source2nc_converter.lib_data_io_nc import read_data_n
 
 from tools.processing_tool_source2nc_converter.lib_utils_interp import active_var_interp, apply_var_interp
 from tools.processing_tool_source2nc_converter.lib_utils_io import read_obj, write_obj, create_dset, write_dset
-from tools.processing_tool_source2nc_converter.lib_utils_gzip import unzip_filename, zip_filename
+from tools.processing_tool_source2nc_converter.lib_utils_gzip import unzip_filename, ZipPool
 from tools.processing_tool_source2nc_converter.lib_utils_system import fill_tags2string, make_folder
 from tools.processing_tool_source2nc_converter.lib_info_args import logger_name, \
     time_format_algorithm, zip_extension
@@ -141,6 +141,13 @@ class DriverDynamic:
         self.nc_type_file = 'NETCDF4'
         self.nc_type_engine = 'netcdf4'
 
+        self.zip_workers = min(4, os.cpu_count() or 1)
+        if 'zip_workers' in list(self.alg_ancillary.keys()):
+            self.zip_workers = self.alg_ancillary['zip_workers']
+        self.zip_level = 9
+        if 'zip_level' in list(self.alg_ancillary.keys()):
+            self.zip_level = self.alg_ancillary['zip_level']
+
         # -------------------------------------------------------------------------------------
 
     # -------------------------------------------------------------------------------------
@@ -379,152 +386,158 @@ class DriverDynamic:
 
         log_stream.info(' ---> Dump dynamic datasets [' + time_str + '] ... ')
 
-        for time_step, file_path_anc, file_path_dst in zip(time_period, file_path_obj_anc, file_path_obj_dst):
-
-            log_stream.info(' -----> Time "' + time_step.strftime(time_format_algorithm) + '" ... ')
-            file_path_zip = self.define_file_name_zip(file_path_dst)
+        # Zip pool (the files are compressed while the following steps are saved)
+        with ZipPool(zip_workers=self.zip_workers, zip_level=self.zip_level) as zip_pool:
 
-            if flag_cleaning_dynamic:
-                if os.path.exists(file_path_dst):
-                    os.remove(file_path_dst)
-                if os.path.exists(file_path_zip):
-                    os.remove(file_path_zip)
+            for time_step, file_path_anc, file_path_dst in zip(time_period, file_path_obj_anc, file_path_obj_dst):
 
-            if os.path.exists(file_path_anc):
+                log_stream.info(' -----> Time "' + time_step.strftime(time_format_algorithm) + '" ... ')
+                file_path_zip = self.define_file_name_zip(file_path_dst)
 
-                dset_obj = read_obj(file_path_anc)
+                if flag_cleaning_dynamic:
+                    if os.path.exists(file_path_dst):
+                        os.remove(file_path_dst)
+                    if os.path.exists(file_path_zip):
+                        os.remove(file_path_zip)
 
-                folder_name_dst, file_name_dst = os.path.split(file_path_dst)
-                if not os.path.exists(folder_name_dst):
-                    make_folder(folder_name_dst)
+                if os.path.exists(file_path_anc):
 
-                log_stream.info(' ------> Save filename "' + file_name_dst + '" ... ')
+                    dset_obj = read_obj(file_path_anc)
 
-                if not (os.path.exists(file_path_dst) or os.path.exists(file_path_zip)):
+                    folder_name_dst, file_name_dst = os.path.split(file_path_dst)
+                    if not os.path.exists(folder_name_dst):
+                        make_folder(folder_name_dst)
 
-                    if datasets_type == 'forcing_data':
+                    log_stream.info(' ------> Save filename "' + file_name_dst + '" ... ')
 
-                        log_stream.info(' -------> Forcing datasets ... ')
+                    if not (os.path.exists(file_path_dst) or os.path.exists(file_path_zip)):
 
-                        # Squeeze time dimensions (if equal == 1)  continuum expects 2d variables in forcing variables
-                        if self.dim_name_time in list(dset_obj.dims):
-                            time_array = dset_obj[self.dim_name_time].values
-                            if time_array.shape[0] == 1:
-                                dset_obj = dset_obj.squeeze(self.dim_name_time)
-                                dset_obj = dset_obj.drop(self.dim_name_time)
+                        if datasets_type == 'forcing_data':
 
-                        log_stream.info(' --------> Write datasets ... ')
-                        write_dset(file_path_dst, dset_obj,
-                                   dset_engine=self.nc_type_engine, dset_format=self.nc_type_file,
-                                   dset_compression=self.nc_compression_level, fill_data=-9999.0, dset_type='float32')
-                        log_stream.info(' --------> Write datasets ... DONE')
+                            log_stream.info(' -------> Forcing datasets ... ')
 
-                        log_stream.info(' -------> Forcing datasets ... DONE')
+                            # Squeeze time dimensions (if equal == 1)  continuum expects 2d variables in forcing variables
+                            if self.dim_name_time in list(dset_obj.dims):
+                                time_array = dset_obj[self.dim_name_time].values
+                                if time_array.shape[0] == 1:
+                                    dset_obj = dset_obj.squeeze(self.dim_name_time)
+                                    dset_obj = dset_obj.drop(self.dim_name_time)
 
-                    elif datasets_type == 'restart_data':
+                            log_stream.info(' --------> Write datasets ... ')
+                            write_dset(file_path_dst, dset_obj,
+                                       dset_engine=self.nc_type_engine, dset_format=self.nc_type_file,
+                                       dset_compression=self.nc_compression_level, fill_data=-9999.0, dset_type='float32')
+                            log_stream.info(' --------> Write datasets ... DONE')
 
-                        log_stream.info(' -------> Restart datasets ... ')
+                            log_stream.info(' -------> Forcing datasets ... DONE')
 
-                        var_data_dict = {}
-                        var_dims_def = {}
-                        var_dims_list = {}
-                        for var_name in var_name_obj:
+                        elif datasets_type == 'restart_data':
 
-                            log_stream.info(' --------> Configure variable "' + var_name + '" ... ')
+                            log_stream.info(' -------> Restart datasets ... ')
 
-                            var_compute, var_tag, var_scale_factor, var_format, file_compression, \
-                                file_geo_reference, file_type, file_coords, file_freq, \
-                                file_time_steps_expected, \
-                                file_time_steps_ref, file_time_steps_flag = self.extract_var_fields(src_dict[var_name])
+                            var_data_dict = {}
+                            var_dims_def = {}
+                            var_dims_list = {}
+                            for var_name in var_name_obj:
 
-                            if var_compute:
+                                log_stream.info(' --------> Configure variable "' + var_name + '" ... ')
 
-                                var_geo_data, var_geo_x, var_geo_y, var_geo_attrs = \
-                                    self.set_geo_attributes(self.static_data_src[file_geo_reference])
+                                var_compute, var_tag, var_scale_factor, var_format, file_compression, \
+                                    file_geo_reference, file_type, file_coords, file_freq, \
+                                    file_time_steps_expected, \
+                                    file_time_steps_ref, file_time_steps_flag = self.extract_var_fields(src_dict[var_name])
 
-                                if (var_geo_x.shape.__len__() == 1) and (var_geo_y.shape.__len__() == 1):
-                                    var_geo_x_2d, var_geo_y_2d = np.meshgrid(var_geo_x, var_geo_y)
-                                    if self.dim_name_geo_y not in list(var_dims_def.keys()):
-                                        var_dims_def[self.dim_name_geo_y] = var_geo_y.shape[0]
-                                    if self.dim_name_geo_x not in list(var_dims_def.keys()):
-                                        var_dims_def[self.dim_name_geo_x] = var_geo_x.shape[0]
+                                if var_compute:
 
-                                    if self.coord_name_geo_y not in list(var_data_dict.keys()):
-                                        var_data_dict[self.coord_name_geo_y] = var_geo_y_2d
-                                        var_dims_list[self.coord_name_geo_y] = deepcopy(self.dims_order_2d)
-                                    if self.coord_name_geo_x not in list(var_data_dict.keys()):
-                                        var_data_dict[self.coord_name_geo_x] = var_geo_x_2d
-                                        var_dims_list[self.coord_name_geo_x] = deepcopy(self.dims_order_2d)
-                                else:
-                                    log_stream.error(' ===> Geographical dimensions are not allowed.')
-                                    raise NotImplementedError('Case not implemented yet')
+                                    var_geo_data, var_geo_x, var_geo_y, var_geo_attrs = \
+                                        self.set_geo_attributes(self.static_data_src[file_geo_reference])
 
-                                if file_time_steps_flag not in list(var_dims_def.keys()):
-                                    var_dims_def[file_time_steps_flag] = file_time_steps_expected
+                                    if (var_geo_x.shape.__len__() == 1) and (var_geo_y.shape.__len__() == 1):
+                                        var_geo_x_2d, var_geo_y_2d = np.meshgrid(var_geo_x, var_geo_y)
+                                        if self.dim_name_geo_y not in list(var_dims_def.keys()):
+                                            var_dims_def[self.dim_name_geo_y] = var_geo_y.shape[0]
+                                        if self.dim_name_geo_x not in list(var_dims_def.keys()):
+                                            var_dims_def[self.dim_name_geo_x] = var_geo_x.shape[0]
+
+                                        if self.coord_name_geo_y not in list(var_data_dict.keys()):
+                                            var_data_dict[self.coord_name_geo_y] = var_geo_y_2d
+                                            var_dims_list[self.coord_name_geo_y] = deepcopy(self.dims_order_2d)
+                                        if self.coord_name_geo_x not in list(var_data_dict.keys()):
+                                            var_data_dict[self.coord_name_geo_x] = var_geo_x_2d
+                                            var_dims_list[self.coord_name_geo_x] = deepcopy(self.dims_order_2d)
+                                    else:
+                                        log_stream.error(' ===> Geographical dimensions are not allowed.')
+                                        raise NotImplementedError('Case not implemented yet')
 
-                                var_dset = dset_obj[var_name]
+                                    if file_time_steps_flag not in list(var_dims_def.keys()):
+                                        var_dims_def[file_time_steps_flag] = file_time_steps_expected
 
-                                if self.dim_name_time in list(var_dset.dims):
-                                    time_array = var_dset[self.dim_name_time].values
-                                    if time_array.shape[0] == 1:
-                                        var_dset = var_dset.squeeze(self.dim_name_time)
-                                        var_dset = var_dset.drop(self.dim_name_time)
+                                    var_dset = dset_obj[var_name]
 
-                                        if self.dim_name_time not in list(var_dims_def.keys()):
-                                            var_dims_def[self.dim_name_time] = None
+                                    if self.dim_name_time in list(var_dset.dims):
+                                        time_array = var_dset[self.dim_name_time].values
+                                        if time_array.shape[0] == 1:
+                                            var_dset = var_dset.squeeze(self.dim_name_time)
+                                            var_dset = var_dset.drop(self.dim_name_time)
 
-                                var_data = np.flipud(var_dset[var_name].values)
-                                var_data_dict[var_name] = var_data
+                                            if self.dim_name_time not in list(var_dims_def.keys()):
+                                                var_dims_def[self.dim_name_time] = None
 
-                                if var_data.ndim == 2:
-                                    dims_order_2d = deepcopy(self.dims_order_2d)
-                                    var_dims_list[var_name] = dims_order_2d
-                                elif var_data.ndim == 3:
-                                    dims_order_3d = deepcopy(self.dims_order_3d)
-                                    dims_order_3d[2] = file_time_steps_flag
-                                    var_dims_list[var_name] = dims_order_3d
-                                else:
-                                    log_stream.error(' ===> Datasets dimensions for ' + var_name + ' is not allowed.')
-                                    raise NotImplementedError('Case not implemented yet')
+                                    var_data = np.flipud(var_dset[var_name].values)
+                                    var_data_dict[var_name] = var_data
 
-                                log_stream.info(' --------> Configure variable "' + var_name + '" ... DONE')
+                                    if var_data.ndim == 2:
+                                        dims_order_2d = deepcopy(self.dims_order_2d)
+                                        var_dims_list[var_name] = dims_order_2d
+                                    elif var_data.ndim == 3:
+                                        dims_order_3d = deepcopy(self.dims_order_3d)
+                                        dims_order_3d[2] = file_time_steps_flag
+                                        var_dims_list[var_name] = dims_order_3d
+                                    else:
+                                        log_stream.error(' ===> Datasets dimensions for ' + var_name + ' is not allowed.')
+                                        raise NotImplementedError('Case not implemented yet')
 
-                            else:
-                                log_stream.info(' --------> Configure variable "' +
-                                                var_name + '" ... SKIPPED. Variable is not activated.')
+                                    log_stream.info(' --------> Configure variable "' + var_name + '" ... DONE')
 
-                        log_stream.info(' --------> Write datasets ... ')
-                        write_data_nc(file_path_dst, var_data_dict, var_dims_def,
-                                      var_dims_list, var_geo_attrs, file_format=self.nc_type_file)
-                        log_stream.info(' --------> Write datasets ... DONE')
+                                else:
+                                    log_stream.info(' --------> Configure variable "' +
+                                                    var_name + '" ... SKIPPED. Variable is not activated.')
 
-                        log_stream.info(' -------> Restart datasets ... DONE')
+                            log_stream.info(' --------> Write datasets ... ')
+                            write_data_nc(file_path_dst, var_data_dict, var_dims_def,
+                                          var_dims_list, var_geo_attrs, file_format=self.nc_type_file)
+                            log_stream.info(' --------> Write datasets ... DONE')
 
-                    else:
-                        log_stream.error(' ===> Datasets type ' + datasets_type + ' is not allowed.')
-                        raise IOError('Check your datasets type in the configuration file.')
+                            log_stream.info(' -------> Restart datasets ... DONE')
 
-                    log_stream.info(' ------> Save filename "' + file_name_dst + '" ... DONE')
+                        else:
+                            log_stream.error(' ===> Datasets type ' + datasets_type + ' is not allowed.')
+                            raise IOError('Check your datasets type in the configuration file.')
 
-                    log_stream.info(' ------> Zip filename "' + file_name_dst + '" ... ')
-                    if dst_dict[self.file_compression_tag]:
+                        log_stream.info(' ------> Save filename "' + file_name_dst + '" ... DONE')
 
-                        zip_filename(file_path_dst, file_path_zip)
+                        log_stream.info(' ------> Zip filename "' + file_name_dst + '" ... ')
+                        if dst_dict[self.file_compression_tag]:
 
-                        if os.path.exists(file_path_zip) and (file_path_zip != file_name_dst):
-                            os.remove(file_path_dst)
-                        log_stream.info(' ------> Zip filename "' + file_name_dst + '" ... DONE')
+                            # the done message is logged by the pool when the file is zipped
+                            zip_pool.submit(file_path_dst, file_path_zip,
+                                            log_msg=' ------> Zip filename "' + file_name_dst + '"')
+                        else:
+                            log_stream.info(' ------> Zip filename "' + file_name_dst +
+                                            '" ... SKIPPED. Zip not activated')
                     else:
-                        log_stream.info(' ------> Zip filename "' + file_name_dst + '" ... SKIPPED. Zip not activated')
-                else:
-                    log_stream.info(' ------> Save filename "' + file_name_dst +
-                                    '" ... SKIPPED. Filename previously saved')
+                        log_stream.info(' ------> Save filename "' + file_name_dst +
+                                        '" ... SKIPPED. Filename previously saved')
 
-                log_stream.info(' -----> Time "' + time_step.strftime(time_format_algorithm) + '" ... DONE')
+                    log_stream.info(' -----> Time "' + time_step.strftime(time_format_algorithm) + '" ... DONE')
 
-            else:
-                log_stream.info(' -----> Time "' + time_step.strftime(time_format_algorithm) +
-                                '" ... SKIPPED. Datasets not available')
+                else:
+                    log_stream.info(' -----> Time "' + time_step.strftime(time_format_algorithm) +
+                                    '" ... SKIPPED. Datasets not available')
+
+            # the zip pool is closed (and the zipped files are waited) at the end of the with block
+            log_stream.info(' ----> Wait zip datasets ... ')
+        log_stream.info(' ----> Wait zip datasets ... DONE')
 
         log_stream.info(' ---> Dump dynamic datasets [' + time_str + '] ... DONE')
 
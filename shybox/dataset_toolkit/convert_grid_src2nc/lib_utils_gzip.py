@@ -10,6 +10,10 @@ Version:       '1.0.0'
 # Library
 import logging
 import gzip
+import os
+import shutil
+
+from concurrent.futures import ThreadPoolExecutor
 
 from tools.processing_tool_source2nc_converter.lib_info_args import logger_name
 
@@ -35,14 +39,104 @@ def unzip_filename(file_name_zip, file_name_unzip):
 
 
 # --------------------------------------------------------------------------------
-# Method to zip file
-def zip_filename(file_name_unzip, file_name_zip):
+# Method to zip file (written to a partial file and renamed when complete)
+def zip_filename(file_name_unzip, file_name_zip, zip_level=9):
 
-    file_handle_unzip = open(file_name_unzip, 'rb')
-    file_handle_zip = gzip.open(file_name_zip, 'wb')
+    file_name_part = file_name_zip + '.part'
+    try:
+        with open(file_name_unzip, 'rb') as file_handle_unzip, open(file_name_part, 'wb') as file_handle_part:
+            with gzip.GzipFile(filename=os.path.basename(file_name_zip), mode='wb',
+                               compresslevel=zip_level, fileobj=file_handle_part) as file_handle_zip:
+                shutil.copyfileobj(file_handle_unzip, file_handle_zip, 2 ** 20)
+        os.replace(file_name_part, file_name_zip)
+    finally:
+        if os.path.exists(file_name_part):
+            os.remove(file_name_part)
+# --------------------------------------------------------------------------------
 
-    file_handle_zip.writelines(file_handle_unzip)
 
-    file_handle_zip.close()
-    file_handle_unzip.close()
+# --------------------------------------------------------------------------------
+# Class to zip files in a thread pool (concurrently with the following steps; with zip_workers <= 1 the files are
+# zipped by the caller)
+class ZipPool:
+
+    def __init__(self, zip_workers=4, zip_level=9, zip_remove_unzip=True):
+
+        self.zip_workers = zip_workers
+        self.zip_level = zip_level
+        self.zip_remove_unzip = zip_remove_unzip
+
+        self.executor = None
+        if self.zip_workers is not None and self.zip_workers > 1:
+            self.executor = ThreadPoolExecutor(max_workers=self.zip_workers, thread_name_prefix='zip')
+        self.futures = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            # the error of the body is raised (the pending files are cancelled and the zip errors are only logged)
+            self.cancel()
+
+    # Method to zip a file (and remove the unzipped file)
+    def zip_file(self, file_name_unzip, file_name_zip):
+        zip_filename(file_name_unzip, file_name_zip, zip_level=self.zip_level)
+        if self.zip_remove_unzip and os.path.exists(file_name_unzip) and (file_name_zip != file_name_unzip):
+            os.remove(file_name_unzip)
+        return file_name_zip
+
+    # Method to submit a file (zipped immediately if the pool is not active)
+    def submit(self, file_name_unzip, file_name_zip, log_msg=None):
+        if self.executor is None:
+            file_name_zip = self.zip_file(file_name_unzip, file_name_zip)
+            if log_msg is not None:
+                log_stream.info(log_msg + ' ... DONE')
+            return file_name_zip
+        future = self.executor.submit(self.zip_file, file_name_unzip, file_name_zip)
+        if log_msg is not None:
+            # the message is logged when the file is zipped (the errors are raised by the wait method)
+            future.add_done_callback(
+                lambda zip_future: log_stream.info(log_msg + ' ... DONE') if zip_future.exception() is None else None)
+        self.futures.append(future)
+        return future
+
+    # Method to wait the submitted files
+    def wait(self):
+        futures, self.futures = self.futures, []
+        file_name_list = []
+        for future in futures:
+            try:
+                file_name_list.append(future.result())
+            except Exception as exc:
+                log_stream.error(' ===> Zip file failed: ' + repr(exc))
+                raise exc
+        return file_name_list
+
+    # Method to cancel the submitted files not started (the running files are completed, errors are logged)
+    def cancel(self):
+        futures, self.futures = self.futures, []
+        for future in futures:
+            future.cancel()
+        try:
+            for future in futures:
+                if not future.cancelled() and future.exception() is not None:
+                    log_stream.error(' ===> Zip file failed: ' + repr(future.exception()))
+        finally:
+            self.shutdown()
+
+    # Method to close the pool
+    def close(self):
+        try:
+            self.wait()
+        finally:
+            self.shutdown()
+
+    # Method to shutdown the pool
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
 # --------------------------------------------------------------------------------
@@ -34,7 +34,7 @@ from shybox.generic_toolkit.lib_utils_time import is_date
 from shybox.io_toolkit.lib_io_utils import substitute_string_by_date, substitute_string_by_tags, extract_time_from_string
 from shybox.io_toolkit.lib_io_variables import fill_var_generic, fill_var_air_pressure, fill_var_error
 from shybox.io_toolkit.io_handler_base import IOHandler
-from shybox.io_toolkit.zip_handler_base import ZipHandler
+from shybox.io_toolkit.zip_handler_base import ZipHandler, get_zip_extension
 
 # logging
 logger_stream = logging.getLogger(logger_name)
@@ -75,6 +75,7 @@ class DrvData(ZipWrapper, IOWrapper):
     # global variable(s)
     class_type = 'driver_data'
     file_handler = None
+    type_format_stream = ['tiff', 'tif', 'geotiff', 'ascii', 'asc', 'txt']
     # ------------------------------------------------------------------------------------------------------------------
 
     # ------------------------------------------------------------------------------------------------------------------
@@ -88,13 +89,19 @@ class DrvData(ZipWrapper, IOWrapper):
         self.file_type = file_type
 
         super().__init__(file_name_compress=self.file_name, file_name_uncompress=None,
-                         zip_extension='.gz')
+                         zip_extension=get_zip_extension(self.file_name))
 
         extra_args = {}
         if self.zip_check:
-            super().from_path(self.file_name_uncompress, file_format=self.file_format, **extra_args)
-            self.uncompress_file_name()
-            self.file_name, self.file_tmp = self.file_name_uncompress, self.file_name_compress
+            # rasters readable by gdal are streamed (virtual file system), the other formats need random access
+            # and are uncompressed once in the zip cache
+            file_name_stream = None
+            if self.file_format is not None and self.file_format.lower() in self.type_format_stream:
+                file_name_stream = self.get_vsi_file_name()
+            if file_name_stream is None:
+                file_name_stream = self.cache_file_name()
+            super().from_path(file_name_stream, file_format=self.file_format, **extra_args)
+            self.file_name, self.file_tmp = file_name_stream, self.file_name_compress
         else:
             super().from_path(self.file_name_compress, **extra_args)
 
@@ -25,8 +25,8 @@ from tools.processing_tool_datasets_merger.lib_utils_method_interpolate import a
 from tools.processing_tool_datasets_merger.lib_utils_method_mask import active_var_mask, \
     apply_var_mask
 from tools.processing_tool_datasets_merger.lib_utils_io import read_obj, write_obj, write_dset_nc, write_dset_tiff, \
-    filter_dset_vars, adjust_dset_vars
-from tools.processing_tool_datasets_merger.lib_utils_gzip import unzip_filename, zip_filename
+    filter_dset_vars, adjust_dset_vars, define_idx_map_file, compute_idx_map_signature, read_idx_map
+from tools.processing_tool_datasets_merger.lib_utils_gzip import unzip_filename, ZipPool
 from tools.processing_tool_datasets_merger.lib_utils_system import fill_tags2string, make_folder, intersect_dicts, find_folder
 from tools.processing_tool_datasets_merger.lib_info_args import logger_name, \
     time_format_algorithm, zip_extension
@@ -162,6 +162,9 @@ class DriverDynamic:
         self.geo_dst_tag, self.geo_dst_data = self.select_geo_reference(dst_dict, self.static_data_dst)
         self.geo_dst_da = self.set_geo_reference(self.geo_dst_data, self.geo_dst_tag)
 
+        # signatures of the index maps (computed once for each domain)
+        self.idx_signature_dom = {}
+
         self.method_interpolate_source = 'nearest'
         if 'layer_method_interpolate_source' in list(alg_ancillary.keys()):
             self.method_interpolate_source = alg_ancillary['layer_method_interpolate_source']
@@ -179,9 +182,19 @@ class DriverDynamic:
         self.nc_compression_level = 9
         self.nc_type_file = 'NETCDF4'
         self.nc_type_engine = 'netcdf4'
+        self.nc_encoding_preset = 'default'
+        if 'nc_encoding_preset' in list(alg_ancillary.keys()):
+            self.nc_encoding_preset = alg_ancillary['nc_encoding_preset']
 
         self.tiff_compression_option = 'COMPRESS=DEFLATE'
 
+        self.zip_workers = min(4, os.cpu_count() or 1)
+        if 'zip_workers' in list(alg_ancillary.keys()):
+            self.zip_workers = alg_ancillary['zip_workers']
+        self.zip_level = 9
+        if 'zip_level' in list(alg_ancillary.keys()):
+            self.zip_level = alg_ancillary['zip_level']
+
         self.flag_cleaning_dynamic_ancillary = flag_cleaning_dynamic_ancillary
         self.flag_cleaning_dynamic_data = flag_cleaning_dynamic_data
         self.flag_cleaning_dynamic_tmp = flag_cleaning_dynamic_tmp
@@ -333,6 +346,21 @@ class DriverDynamic:
         return geo_da
     # -------------------------------------------------------------------------------------
 
+    # -------------------------------------------------------------------------------------
+    # Method to get the signature of the index map of a domain (same grids used by the static part)
+    def get_idx_signature(self, geo_file_name, geo_file_data, geo_key='dataset'):
+
+        if geo_file_name not in self.idx_signature_dom:
+            geo_ref_collections = self.geo_anc_data[geo_key]
+            self.idx_signature_dom[geo_file_name] = compute_idx_map_signature(
+                geo_file_data['geo_x'], geo_file_data['geo_y'],
+                geo_ref_collections['geo_x'], geo_ref_collections['geo_y'],
+                [geo_ref_collections['xllcorner'], geo_ref_collections['yllcorner'],
+                 geo_ref_collections['cellsize']])
+
+        return self.idx_signature_dom[geo_file_name]
+    # -------------------------------------------------------------------------------------
+
     # -------------------------------------------------------------------------------------
     # Method to set geographical attributes
     @staticmethod
@@ -632,268 +660,272 @@ class DriverDynamic:
         # Check elements availability
         if not file_check_destination:
 
-            for var_name_anc, var_name_dst in zip(var_list_anc, var_list_dst):
+            # Zip pool (the files are compressed while the following steps are saved)
+            with ZipPool(zip_workers=self.zip_workers, zip_level=self.zip_level) as zip_pool:
 
-                log_stream.info(' ----> Save datasets destination "' + var_name_dst + '" ... ')
+                for var_name_anc, var_name_dst in zip(var_list_anc, var_list_dst):
 
-                file_include_dst, file_compression_dst, file_geo_reference_dst, file_geo_mask_dst, \
-                    file_type_dst, file_coords_dst, file_freq_dst, \
-                    file_time_steps_expected_dst, file_time_steps_ref_dst, \
-                    file_time_steps_flag_dst,\
-                    file_domain_dst, file_layer_dst = self.extract_var_fields(dst_dict[var_name_dst])
+                    log_stream.info(' ----> Save datasets destination "' + var_name_dst + '" ... ')
 
-                var_dset_layer_dst = self.parse_var_dict(file_layer_dst, obj_list=self.alg_layer_variable)
+                    file_include_dst, file_compression_dst, file_geo_reference_dst, file_geo_mask_dst, \
+                        file_type_dst, file_coords_dst, file_freq_dst, \
+                        file_time_steps_expected_dst, file_time_steps_ref_dst, \
+                        file_time_steps_flag_dst,\
+                        file_domain_dst, file_layer_dst = self.extract_var_fields(dst_dict[var_name_dst])
 
-                file_path_collections_anc = file_path_obj_anc[var_name_anc]
-                file_path_collections_dst = file_path_obj_dst[var_name_dst]
+                    var_dset_layer_dst = self.parse_var_dict(file_layer_dst, obj_list=self.alg_layer_variable)
 
-                if file_include_dst:
+                    file_path_collections_anc = file_path_obj_anc[var_name_anc]
+                    file_path_collections_dst = file_path_obj_dst[var_name_dst]
 
-                    for (var_time, var_path_list_anc), var_path_list_dst in zip(
-                            file_path_collections_anc.items(), file_path_collections_dst.values()):
+                    if file_include_dst:
 
-                        log_stream.info(' -----> Time "' + var_time.strftime(time_format_algorithm) + '" ... ')
+                        for (var_time, var_path_list_anc), var_path_list_dst in zip(
+                                file_path_collections_anc.items(), file_path_collections_dst.values()):
 
-                        if isinstance(var_path_list_anc, list) and (var_path_list_anc.__len__() == 1):
-                            var_domain_name_anc = list(var_path_list_anc[0].keys())[0]
-                            var_file_path_anc = list(var_path_list_anc[0].values())[0]
-                        else:
-                            log_stream.error(' ===> Ancillary obj must be list and length == 1')
-                            raise NotImplementedError('Case not implemented yet')
-
-                        if isinstance(var_path_list_dst, list) and (var_path_list_dst.__len__() == 1):
-                            var_domain_name_dst = list(var_path_list_dst[0].keys())[0]
-                            var_file_path_dst = list(var_path_list_dst[0].values())[0]
-                        else:
-                            log_stream.error(' ===> Destination obj must be list and length == 1')
-                            raise NotImplementedError('Case not implemented yet')
+                            log_stream.info(' -----> Time "' + var_time.strftime(time_format_algorithm) + '" ... ')
 
-                        if os.path.exists(var_file_path_anc):
+                            if isinstance(var_path_list_anc, list) and (var_path_list_anc.__len__() == 1):
+                                var_domain_name_anc = list(var_path_list_anc[0].keys())[0]
+                                var_file_path_anc = list(var_path_list_anc[0].values())[0]
+                            else:
+                                log_stream.error(' ===> Ancillary obj must be list and length == 1')
+                                raise NotImplementedError('Case not implemented yet')
 
-                            var_dset_anc = read_obj(var_file_path_anc)
-                            var_dset_anc = filter_dset_vars(var_dset_anc, var_list=var_dset_layer_dst)
+                            if isinstance(var_path_list_dst, list) and (var_path_list_dst.__len__() == 1):
+                                var_domain_name_dst = list(var_path_list_dst[0].keys())[0]
+                                var_file_path_dst = list(var_path_list_dst[0].values())[0]
+                            else:
+                                log_stream.error(' ===> Destination obj must be list and length == 1')
+                                raise NotImplementedError('Case not implemented yet')
 
-                            if var_dset_anc:
+                            if os.path.exists(var_file_path_anc):
 
-                                # Active (if needed) interpolation method to the variable source data-array
-                                active_interp = active_var_interpolate(var_dset_anc.attrs, geo_da_dst.attrs)
+                                var_dset_anc = read_obj(var_file_path_anc)
+                                var_dset_anc = filter_dset_vars(var_dset_anc, var_list=var_dset_layer_dst)
 
-                                # Apply the interpolation method to the variable source data-array
-                                if active_interp:
+                                if var_dset_anc:
 
-                                    log_stream.info(
-                                        ' ------> Interpolate from ancillary domain "' + var_domain_name_anc +
-                                        '" to destination domain "' + var_domain_name_dst + '" ... ')
+                                    # Active (if needed) interpolation method to the variable source data-array
+                                    active_interp = active_var_interpolate(var_dset_anc.attrs, geo_da_dst.attrs)
 
-                                    if method_interpolate in ['nearest']:
-                                        var_dset_dst = apply_var_interpolate(
-                                            var_dset_anc, geo_da_dst,
-                                            dim_name_geo_x=self.dim_name_geo_x, dim_name_geo_y=self.dim_name_geo_y,
-                                            coord_name_geo_x=self.coord_name_geo_x, coord_name_geo_y=self.coord_name_geo_y,
-                                            interp_method=method_interpolate)
-                                        var_dset_dst.attrs = deepcopy(geo_da_dst.attrs)
+                                    # Apply the interpolation method to the variable source data-array
+                                    if active_interp:
 
                                         log_stream.info(
                                             ' ------> Interpolate from ancillary domain "' + var_domain_name_anc +
-                                            '" to destination domain "' + var_domain_name_dst + '" ... DONE')
+                                            '" to destination domain "' + var_domain_name_dst + '" ... ')
+
+                                        if method_interpolate in ['nearest']:
+                                            var_dset_dst = apply_var_interpolate(
+                                                var_dset_anc, geo_da_dst,
+                                                dim_name_geo_x=self.dim_name_geo_x, dim_name_geo_y=self.dim_name_geo_y,
+                                                coord_name_geo_x=self.coord_name_geo_x, coord_name_geo_y=self.coord_name_geo_y,
+                                                interp_method=method_interpolate)
+                                            var_dset_dst.attrs = deepcopy(geo_da_dst.attrs)
+
+                                            log_stream.info(
+                                                ' ------> Interpolate from ancillary domain "' + var_domain_name_anc +
+                                                '" to destination domain "' + var_domain_name_dst + '" ... DONE')
+                                        else:
+                                            log_stream.error(' ===> Interpolating method "'
+                                                             + method_interpolate + '" is not allowed')
+                                            raise NotImplementedError('Case not implemented yet')
                                     else:
-                                        log_stream.error(' ===> Interpolating method "'
-                                                         + method_interpolate + '" is not allowed')
-                                        raise NotImplementedError('Case not implemented yet')
-                                else:
-                                    var_dset_dst = deepcopy(var_dset_anc)
+                                        var_dset_dst = deepcopy(var_dset_anc)
 
-                                # Mask the variable destination data-array
-                                geo_nodata = None
-                                if 'nodata_value' in list(geo_da_dst.attrs.keys()):
-                                    geo_nodata = geo_da_dst.attrs['nodata_value']
+                                    # Mask the variable destination data-array
+                                    geo_nodata = None
+                                    if 'nodata_value' in list(geo_da_dst.attrs.keys()):
+                                        geo_nodata = geo_da_dst.attrs['nodata_value']
 
-                                if geo_nodata is not None:
-                                    var_dset_masked = var_dset_dst.where(
-                                        (geo_da_dst.values[:, :, np.newaxis] != geo_nodata))
-                                else:
-                                    var_dset_masked = deepcopy(var_dset_dst)
-
-                            else:
-                                var_dset_masked = None
-                                log_stream.warning(' ===> Datasets is undefined. Data not found')
-
-                            var_file_dict_dst = {}
-                            for file_layers_step in file_layers_name:
-                                alg_template_step = {'layer_name': file_layers_step}
-                                alg_template_intersect = intersect_dicts(self.alg_template_data, alg_template_step)
-                                var_file_path_tmp = fill_tags2string(var_file_path_dst,
-                                                                     alg_template_intersect, alg_template_step)
-                                if var_file_path_tmp not in list(var_file_dict_dst.keys()):
-                                    var_file_dict_dst[file_layers_step] = var_file_path_tmp
-
-                            var_attr_dict_dest = {}
-                            for file_layers_step, file_no_data_step, file_scale_factor_step in \
-                                    zip(file_layers_name, file_layers_no_data, file_layers_scale_factor):
-                                var_attr_dict_dest[file_layers_step] = {}
-                                var_attr_dict_dest[file_layers_step]['_FillValue'] = file_no_data_step
-                                var_attr_dict_dest[file_layers_step]['scale_factor'] = file_scale_factor_step
-
-                            var_file_list_dst = []
-                            for var_file_key, var_file_value in var_file_dict_dst.items():
-                                if var_file_key in var_dset_layer_dst:
-                                    if var_file_value not in var_file_list_dst:
-                                        var_file_list_dst.append(var_file_value)
-
-                            if var_dset_masked:
-
-                                if file_type_dst == 'netcdf':
-
-                                    if var_file_list_dst.__len__() == 1:
-                                        var_file_obj_dst = var_file_list_dst[0]
+                                    if geo_nodata is not None:
+                                        var_dset_masked = var_dset_dst.where(
+                                            (geo_da_dst.values[:, :, np.newaxis] != geo_nodata))
                                     else:
-                                        log_stream.error(' ===> File name must be unique')
-                                        raise RuntimeError('Remove {layer_name} tag from the filename')
-
-                                    if not isinstance(var_file_obj_dst, str):
-                                        log_stream.error(' ===> File name must be a string')
-                                        raise RuntimeError('Remove {layer_name} tag from the filename')
-
-                                    # Remove file (unzipped and/or zipped) previously created
-                                    if os.path.exists(var_file_obj_dst):
-                                        os.remove(var_file_obj_dst)
-                                    var_file_obj_zip = self.define_file_name_zip(var_file_obj_dst)
-                                    if os.path.exists(var_file_obj_zip):
-                                        os.remove(var_file_obj_zip)
-
-                                    var_folder_name_dst, var_file_name_dst = os.path.split(var_file_obj_dst)
-                                    make_folder(var_folder_name_dst)
-
-                                    if not var_file_name_dst.endswith('nc'):
-                                        log_stream.warning(' ===> File name extension must be "nc".\n'
-                                                           'The actual file is "' + var_file_name_dst +
-                                                           '" and it will be dumped with an unexpected extension.')
-
-                                    if self.alg_layer_nc_format == 'continuum':
-                                        var_dset_remap = create_dset_continuum(
-                                            var_time, var_dset_masked, geo_da_dst.values,
-                                            geo_da_dst['longitude'].values, geo_da_dst['latitude'].values,
-                                            geo_da_dst.attrs, var_data_attrs=var_attr_dict_dest)
-                                    elif self.alg_layer_nc_format is None:
-                                        var_dset_remap = deepcopy(var_dset_masked)
-                                    else:
-                                        log_stream.error(
-                                            ' ===> Remap type "' + str(self.alg_layer_nc_format) +
-                                            '" is not permitted. Only "continuum" or NoneType flag are activated')
-                                        raise NotImplementedError('Case not implemented yet')
-
-                                    '''
-                                    # DEBUG
-                                    plt.figure()
-                                    plt.imshow(var_dset_dst['SM'].values[:, :, 0])
-                                    plt.colorbar()
-                                    plt.figure()
-                                    plt.imshow(var_dset_masked['SM'].values[:, :, 0])
-                                    plt.colorbar()
-                                    plt.figure()
-                                    plt.imshow(var_dset_remap['SM'].values)
-                                    plt.colorbar()
-                                    
-                                    plt.figure()
-                                    plt.imshow(var_dset_remap['TQ'].values[:, :, 0])
-                                    plt.colorbar()
-                                    plt.figure()
-                                    plt.imshow(var_dset_remap['terrain'].values)
-                                    plt.colorbar()
-                                    
-                                    plt.show()
-                                    '''
+                                        var_dset_masked = deepcopy(var_dset_dst)
 
-                                    log_stream.info(' ------> Save datasets "' + var_file_name_dst + '" ... ')
-                                    write_dset_nc(var_file_obj_dst, var_dset_remap,
-                                                  dset_engine=self.nc_type_engine, dset_format=self.nc_type_file,
-                                                  dset_compression=self.nc_compression_level, fill_data=-9999.0,
-                                                  dset_type='float32')
-                                    log_stream.info(' ------> Save datasets "' + var_file_name_dst + '" ... DONE ')
-
-                                elif file_type_dst == 'tiff' or file_type_dst == 'tif':
-
-                                    log_stream.info(' ------> Save datasets group  ... ')
-
-                                    var_file_obj_dst = deepcopy(var_file_dict_dst)
+                                else:
+                                    var_dset_masked = None
+                                    log_stream.warning(' ===> Datasets is undefined. Data not found')
+
+                                var_file_dict_dst = {}
+                                for file_layers_step in file_layers_name:
+                                    alg_template_step = {'layer_name': file_layers_step}
+                                    alg_template_intersect = intersect_dicts(self.alg_template_data, alg_template_step)
+                                    var_file_path_tmp = fill_tags2string(var_file_path_dst,
+                                                                         alg_template_intersect, alg_template_step)
+                                    if var_file_path_tmp not in list(var_file_dict_dst.keys()):
+                                        var_file_dict_dst[file_layers_step] = var_file_path_tmp
+
+                                var_attr_dict_dest = {}
+                                for file_layers_step, file_no_data_step, file_scale_factor_step in \
+                                        zip(file_layers_name, file_layers_no_data, file_layers_scale_factor):
+                                    var_attr_dict_dest[file_layers_step] = {}
+                                    var_attr_dict_dest[file_layers_step]['_FillValue'] = file_no_data_step
+                                    var_attr_dict_dest[file_layers_step]['scale_factor'] = file_scale_factor_step
+
+                                var_file_list_dst = []
+                                for var_file_key, var_file_value in var_file_dict_dst.items():
+                                    if var_file_key in var_dset_layer_dst:
+                                        if var_file_value not in var_file_list_dst:
+                                            var_file_list_dst.append(var_file_value)
+
+                                if var_dset_masked:
+
+                                    if file_type_dst == 'netcdf':
+
+                                        if var_file_list_dst.__len__() == 1:
+                                            var_file_obj_dst = var_file_list_dst[0]
+                                        else:
+                                            log_stream.error(' ===> File name must be unique')
+                                            raise RuntimeError('Remove {layer_name} tag from the filename')
 
-                                    if not isinstance(var_file_obj_dst, dict):
-                                        log_stream.error(' ===> File name must be a dictionary {var_name: file_name}')
-                                        raise RuntimeError('Check your settings to pass the correct file template.')
+                                        if not isinstance(var_file_obj_dst, str):
+                                            log_stream.error(' ===> File name must be a string')
+                                            raise RuntimeError('Remove {layer_name} tag from the filename')
 
-                                    var_file_name_list = []
-                                    for var_name, var_file_path_dst in var_file_obj_dst.items():
+                                        # Remove file (unzipped and/or zipped) previously created
+                                        if os.path.exists(var_file_obj_dst):
+                                            os.remove(var_file_obj_dst)
+                                        var_file_obj_zip = self.define_file_name_zip(var_file_obj_dst)
+                                        if os.path.exists(var_file_obj_zip):
+                                            os.remove(var_file_obj_zip)
 
-                                        var_folder_name_dst, var_file_name_dst = os.path.split(var_file_path_dst)
+                                        var_folder_name_dst, var_file_name_dst = os.path.split(var_file_obj_dst)
                                         make_folder(var_folder_name_dst)
 
-                                        if (not var_file_name_dst.endswith('tiff')) and (
-                                                not var_file_name_dst.endswith('tif')):
-                                            log_stream.warning(' ===> File name extension must be "tiff" or "tif".\n'
+                                        if not var_file_name_dst.endswith('nc'):
+                                            log_stream.warning(' ===> File name extension must be "nc".\n'
                                                                'The actual file is "' + var_file_name_dst +
                                                                '" and it will be dumped with an unexpected extension.')
 
-                                        if var_file_name_dst not in var_file_name_list:
-                                            var_file_name_list.append(var_file_name_dst)
+                                        if self.alg_layer_nc_format == 'continuum':
+                                            var_dset_remap = create_dset_continuum(
+                                                var_time, var_dset_masked, geo_da_dst.values,
+                                                geo_da_dst['longitude'].values, geo_da_dst['latitude'].values,
+                                                geo_da_dst.attrs, var_data_attrs=var_attr_dict_dest)
+                                        elif self.alg_layer_nc_format is None:
+                                            var_dset_remap = deepcopy(var_dset_masked)
                                         else:
                                             log_stream.error(
-                                                ' ===> File name must be different for each variable considered')
-                                            raise RuntimeError('Insert {layer_name} tag in the filename')
+                                                ' ===> Remap type "' + str(self.alg_layer_nc_format) +
+                                                '" is not permitted. Only "continuum" or NoneType flag are activated')
+                                            raise NotImplementedError('Case not implemented yet')
 
-                                    '''
-                                    # DEBUG
-                                    var_values = var_dset_masked['SM'].values
-                                    plt.figure()
-                                    plt.imshow(var_values[:,:,0])
-                                    plt.colorbar()
-                                    '''
+                                        '''
+                                        # DEBUG
+                                        plt.figure()
+                                        plt.imshow(var_dset_dst['SM'].values[:, :, 0])
+                                        plt.colorbar()
+                                        plt.figure()
+                                        plt.imshow(var_dset_masked['SM'].values[:, :, 0])
+                                        plt.colorbar()
+                                        plt.figure()
+                                        plt.imshow(var_dset_remap['SM'].values)
+                                        plt.colorbar()
+                                    
+                                        plt.figure()
+                                        plt.imshow(var_dset_remap['TQ'].values[:, :, 0])
+                                        plt.colorbar()
+                                        plt.figure()
+                                        plt.imshow(var_dset_remap['terrain'].values)
+                                        plt.colorbar()
+                                    
+                                        plt.show()
+                                        '''
 
-                                    write_dset_tiff(var_file_obj_dst, var_dset_masked,
-                                                    file_compression_option=self.tiff_compression_option)
+                                        log_stream.info(' ------> Save datasets "' + var_file_name_dst + '" ... ')
+                                        write_dset_nc(var_file_obj_dst, var_dset_remap,
+                                                      dset_engine=self.nc_type_engine, dset_format=self.nc_type_file,
+                                                      dset_compression=self.nc_compression_level, fill_data=-9999.0,
+                                                      dset_preset=self.nc_encoding_preset)
+                                        log_stream.info(' ------> Save datasets "' + var_file_name_dst + '" ... DONE ')
 
-                                    log_stream.info(' ------> Save datasets group  ... DONE')
+                                    elif file_type_dst == 'tiff' or file_type_dst == 'tif':
 
-                                else:
-                                    log_stream.error(' ===> File format for saving datasets is not implemented ')
-                                    raise NotImplementedError('Case not implemented yet')
+                                        log_stream.info(' ------> Save datasets group  ... ')
 
-                                for var_file_step_dst in var_file_list_dst:
+                                        var_file_obj_dst = deepcopy(var_file_dict_dst)
 
-                                    var_folder_name_dst, var_file_name_dst = os.path.split(var_file_step_dst)
+                                        if not isinstance(var_file_obj_dst, dict):
+                                            log_stream.error(' ===> File name must be a dictionary {var_name: file_name}')
+                                            raise RuntimeError('Check your settings to pass the correct file template.')
 
-                                    log_stream.info(' ------> Zip datasets "' + var_file_name_dst + '" ... ')
-                                    if file_compression_dst:
-                                        if os.path.exists(var_file_step_dst):
+                                        var_file_name_list = []
+                                        for var_name, var_file_path_dst in var_file_obj_dst.items():
 
-                                            var_file_step_zip = self.define_file_name_zip(var_file_step_dst)
-                                            zip_filename(var_file_step_dst, var_file_step_zip)
+                                            var_folder_name_dst, var_file_name_dst = os.path.split(var_file_path_dst)
+                                            make_folder(var_folder_name_dst)
 
-                                            if os.path.exists(var_file_step_dst) and (var_file_step_zip != var_file_step_dst):
-                                                os.remove(var_file_step_dst)
+                                            if (not var_file_name_dst.endswith('tiff')) and (
+                                                    not var_file_name_dst.endswith('tif')):
+                                                log_stream.warning(' ===> File name extension must be "tiff" or "tif".\n'
+                                                                   'The actual file is "' + var_file_name_dst +
+                                                                   '" and it will be dumped with an unexpected extension.')
 
-                                            log_stream.info(' ------> Zip datasets "' + var_file_name_dst +
-                                                            '" ... DONE')
+                                            if var_file_name_dst not in var_file_name_list:
+                                                var_file_name_list.append(var_file_name_dst)
+                                            else:
+                                                log_stream.error(
+                                                    ' ===> File name must be different for each variable considered')
+                                                raise RuntimeError('Insert {layer_name} tag in the filename')
+
+                                        '''
+                                        # DEBUG
+                                        var_values = var_dset_masked['SM'].values
+                                        plt.figure()
+                                        plt.imshow(var_values[:,:,0])
+                                        plt.colorbar()
+                                        '''
+
+                                        write_dset_tiff(var_file_obj_dst, var_dset_masked,
+                                                        file_compression_option=self.tiff_compression_option)
+
+                                        log_stream.info(' ------> Save datasets group  ... DONE')
+
+                                    else:
+                                        log_stream.error(' ===> File format for saving datasets is not implemented ')
+                                        raise NotImplementedError('Case not implemented yet')
+
+                                    for var_file_step_dst in var_file_list_dst:
+
+                                        var_folder_name_dst, var_file_name_dst = os.path.split(var_file_step_dst)
+
+                                        log_stream.info(' ------> Zip datasets "' + var_file_name_dst + '" ... ')
+                                        if file_compression_dst:
+                                            if os.path.exists(var_file_step_dst):
+
+                                                var_file_step_zip = self.define_file_name_zip(var_file_step_dst)
+                                                # the done message is logged by the pool when the file is zipped
+                                                zip_pool.submit(var_file_step_dst, var_file_step_zip,
+                                                                log_msg=' ------> Zip datasets "' +
+                                                                var_file_name_dst + '"')
+                                            else:
+                                                log_stream.info(' ------> Zip datasets "' + var_file_name_dst +
+                                                                '" ... SKIPPED. File does not exist.')
                                         else:
                                             log_stream.info(' ------> Zip datasets "' + var_file_name_dst +
-                                                            '" ... SKIPPED. File does not exist.')
-                                    else:
-                                        log_stream.info(' ------> Zip datasets "' + var_file_name_dst +
-                                                        '" ... SKIPPED. Compression is not activated.')
+                                                            '" ... SKIPPED. Compression is not activated.')
 
-                                log_stream.info(
-                                    ' -----> Time "' + var_time.strftime(time_format_algorithm) + '" ... DONE')
+                                    log_stream.info(
+                                        ' -----> Time "' + var_time.strftime(time_format_algorithm) + '" ... DONE')
+                                else:
+                                    log_stream.info(' -----> Time "' + var_time.strftime(time_format_algorithm) +
+                                                    '" ... SKIPPED. Datasets destination is not defined')
                             else:
                                 log_stream.info(' -----> Time "' + var_time.strftime(time_format_algorithm) +
-                                                '" ... SKIPPED. Datasets destination is not defined')
-                        else:
-                            log_stream.info(' -----> Time "' + var_time.strftime(time_format_algorithm) +
-                                            '" ... SKIPPED. Datasets ancillary is not defined')
+                                                '" ... SKIPPED. Datasets ancillary is not defined')
 
-                    log_stream.info(' ----> Save datasets destination "' + var_name_dst + '" ... DONE')
+                        log_stream.info(' ----> Save datasets destination "' + var_name_dst + '" ... DONE')
 
-                else:
-                    log_stream.info(' ----> Save datasets destination "' + var_name_dst +
-                                    '" ... SKIPPED. Compute flag not activated.')
+                    else:
+                        log_stream.info(' ----> Save datasets destination "' + var_name_dst +
+                                        '" ... SKIPPED. Compute flag not activated.')
+
+                # the zip pool is closed (and the zipped files are waited) at the end of the with block
+                log_stream.info(' ----> Wait zip datasets ... ')
+            log_stream.info(' ----> Wait zip datasets ... DONE')
 
             log_stream.info(' ---> Dump dynamic datasets [' + time_str + '] ... DONE')
         else:
@@ -1001,6 +1033,14 @@ class DriverDynamic:
                                         geo_file_values, geo_file_x, geo_file_y, geo_file_attrs,\
                                             i_cols_ref, j_rows_ref, i_cols_dom, j_rows_dom = \
                                             self.set_geo_attributes(geo_file_data)
+                                        # index map of the sample method (memory mapped, only if defined for the
+                                        # domain and reference grids; otherwise the terrain indexes are used)
+                                        geo_idx_map = read_idx_map(
+                                            define_idx_map_file(geo_file_name),
+                                            idx_signature=self.get_idx_signature(geo_file_name, geo_file_data))
+                                        sample_index = None
+                                        if geo_idx_map is not None:
+                                            sample_index = (geo_idx_map['idx_flat_dom'], geo_idx_map['idx_flat_ref'])
                                     else:
                                         log_stream.error(' ===> Geographical datasets "' + geo_file_name + '" not found')
                                         raise IOError('Geographical datasets not available. Check your settings file')
@@ -1123,7 +1163,8 @@ class DriverDynamic:
                                             elif method_interpolate == 'sample':
                                                 var_dset_anc = apply_var_sample(
                                                     var_dset_src, geo_da_anc,
-                                                    i_cols_ref, j_rows_ref, i_cols_dom, j_rows_dom)
+                                                    i_cols_ref, j_rows_ref, i_cols_dom, j_rows_dom,
+                                                    sample_index=sample_index)
                                             else:
                                                 log_stream.error(' ===> Interpolating method "'
                                                                  + method_interpolate + '" is not allowed')
@@ -20,7 +20,8 @@ from tools.processing_tool_datasets_merger.lib_data_io_tiff import read_data_tif
 from tools.processing_tool_datasets_merger.lib_data_io_ascii import read_data_grid, create_data_grid
 from tools.processing_tool_datasets_merger.lib_data_io_generic import parse_data_grid, extract_data_grid
 
-from tools.processing_tool_datasets_merger.lib_utils_io import read_obj, write_obj
+from tools.processing_tool_datasets_merger.lib_utils_io import read_obj, write_obj, \
+    define_idx_map_file, compute_idx_map_signature, read_idx_map, write_idx_map
 from tools.processing_tool_datasets_merger.lib_utils_system import fill_tags2string, make_folder
 from tools.processing_tool_datasets_merger.lib_utils_gzip import unzip_filename
 from tools.processing_tool_datasets_merger.lib_utils_geo import create_idx_partial2global
@@ -447,12 +448,6 @@ class DriverStatic:
                 log_stream.error(' ===> Terrain reference obj is not in supported format')
                 raise NotImplementedError('Case not implemented yet')
 
-            geo_idx_i_ref = np.zeros(shape=(grid_x_ref.shape[0], grid_y_ref.shape[1]))
-            geo_idx_i_ref[:, :] = np.nan
-            geo_idx_j_ref = np.zeros(shape=(grid_x_ref.shape[0], grid_y_ref.shape[1]))
-            geo_idx_j_ref[:, :] = np.nan
-            geo_mask_ref = np.zeros(shape=(grid_x_ref.shape[0], grid_y_ref.shape[1]))
-            geo_mask_ref[:, :] = np.nan
             for id_dom, (key_dom, file_name_terrain_dom) in enumerate(file_obj_terrain_dom.items()):
 
                 log_stream.info(' ------> Compute idxs between domain "' + key_dom + '" and domain reference ... ')
@@ -461,60 +456,37 @@ class DriverStatic:
                 geo_x_dom, geo_y_dom, geo_xllcorner_dom, \
                     geo_yllcorner_dom, geo_cellsize_dom = self.extract_geo_fields(obj_terrain_dom)
 
-                if 'i_cols_ref' not in list(obj_terrain_dom.keys()) or 'j_rows_ref' not in list(obj_terrain_dom.keys()):
+                # index map of the domain (keyed by the signature of the domain and reference grids)
+                file_name_idx_dom = define_idx_map_file(file_name_terrain_dom)
+                idx_signature_dom = compute_idx_map_signature(
+                    geo_x_dom, geo_y_dom, geo_x_ref, geo_y_ref,
+                    [geo_xllcorner_ref, geo_yllcorner_ref, geo_cellsize_ref])
 
-                    grid_x_dom, grid_y_dom = np.meshgrid(geo_x_dom, geo_y_dom)
-
-                    geo_idx_i_dom = np.zeros(shape=(grid_x_dom.shape[0], grid_y_dom.shape[1]))
-                    geo_idx_i_dom[:, :] = np.nan
-                    geo_idx_j_dom = np.zeros(shape=(grid_x_dom.shape[0], grid_y_dom.shape[1]))
-                    geo_idx_j_dom[:, :] = np.nan
-                    for i in range(0, grid_x_dom.shape[0]):
-                        for j in range(0, grid_y_dom.shape[1]):
-
-                            i_cols = round((grid_x_dom[i, j] - geo_xllcorner_ref) / geo_cellsize_ref)
-                            j_rows = round((grid_y_dom[i, j] - geo_yllcorner_ref) / geo_cellsize_ref)
-
-                            j_rows = grid_y_ref.shape[0] - j_rows
-
-                            if (0 <= j_rows < geo_mask_ref.shape[0]) and (0 <= i_cols < geo_mask_ref.shape[1]):
+                if read_idx_map(file_name_idx_dom, idx_signature=idx_signature_dom) is None:
 
-                                geo_idx_i_ref[i, j] = i_cols
-                                geo_idx_j_ref[i, j] = j_rows
-                                geo_idx_i_dom[i, j] = i
-                                geo_idx_j_dom[i, j] = j
+                    grid_x_dom, grid_y_dom = np.meshgrid(geo_x_dom, geo_y_dom)
 
-                                geo_mask_ref[j_rows, i_cols] = id_dom
+                    geo_idx_i_ref, geo_idx_j_ref, geo_idx_i_dom, geo_idx_j_dom = create_idx_partial2global(
+                        grid_x_dom, grid_y_dom, grid_y_ref.shape[0], grid_x_ref.shape[1],
+                        geo_xllcorner_ref, geo_yllcorner_ref, geo_cellsize_ref, no_data=no_data)
 
                     # Check if the indexes are defined somewhere or not
-                    geo_idx_all_undef = False
-                    if np.isnan(geo_idx_i_ref).all():
-                        geo_idx_all_undef = True
-                        log_stream.warning(' ===> All indexes x of local domain in the reference domain are Nans'
-                                           'The routine will exit with an error because all indexes are undefined')
-                    if np.isnan(geo_idx_j_ref).all():
-                        geo_idx_all_undef = True
-                        log_stream.warning(' ===> All indexes y of local domain in the reference domain are Nans'
+                    if (geo_idx_i_ref == no_data).all() or (geo_idx_j_ref == no_data).all():
+                        log_stream.warning(' ===> All indexes of local domain in the reference domain are Nans'
                                            'The routine will exit with an error because all indexes are undefined')
-
-                    if geo_idx_all_undef:
                         log_stream.error(' ===> All indexes of local domain in the reference domain are undefined'
                                          'Check your grid in the configuration file')
                         raise RuntimeError('The indexes must be defined by a positive integer')
 
-                    # Replace nan(s) with a no_data value (to convert the data to integer)
-                    geo_idx_i_ref[np.isnan(geo_idx_i_ref)] = no_data
-                    geo_idx_j_ref[np.isnan(geo_idx_j_ref)] = no_data
-
-                    obj_terrain_dom['i_cols_ref'] = geo_idx_i_ref.astype(int)
-                    obj_terrain_dom['j_rows_ref'] = geo_idx_j_ref.astype(int)
-                    obj_terrain_dom['i_cols_dom'] = geo_idx_i_dom.astype(int)
-                    obj_terrain_dom['j_rows_dom'] = geo_idx_j_dom.astype(int)
-
-                    if os.path.exists(file_name_terrain_dom):
-                        os.remove(file_name_terrain_dom)
+                    geo_idx_mask_dom = geo_idx_i_dom != no_data
+                    geo_idx_flat_dom = np.flatnonzero(geo_idx_mask_dom)
+                    geo_idx_flat_ref = np.ravel_multi_index(
+                        (geo_idx_j_ref[geo_idx_mask_dom], geo_idx_i_ref[geo_idx_mask_dom]),
+                        (grid_y_ref.shape[0], grid_x_ref.shape[1]))
 
-                    write_obj(file_name_terrain_dom, obj_terrain_dom)
+                    write_idx_map(file_name_idx_dom, geo_idx_flat_dom, geo_idx_flat_ref, geo_idx_mask_dom,
+                                  shape_ref=(grid_y_ref.shape[0], grid_x_ref.shape[1]),
+                                  idx_signature=idx_signature_dom)
 
                     log_stream.info(' ------> Compute idxs between domain "' + key_dom +
                                     '" and domain reference ... DONE')
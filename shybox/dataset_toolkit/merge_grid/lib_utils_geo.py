@@ -33,25 +33,24 @@ def wrap_idx_partial2global(obj_terrain_reference, obj_terrain_domain):
 # Method to idxs from partial 2 global domain
 def create_idx_partial2global(
         grid_lon_partial, grid_lat_partial,
-        rows_ref, cols_ref, xllcorner_ref, yllcorner_reference, cellsize_reference):
+        rows_ref, cols_ref, xllcorner_ref, yllcorner_reference, cellsize_reference, no_data=-9999):
 
-    idx_i_reference = np.zeros(shape=[rows_ref, cols_ref])
-    idx_j_reference = np.zeros(shape=[rows_ref, cols_ref])
-    for i in range(0, grid_lon_partial.shape[0]):
-        for j in range(0, grid_lat_partial.shape[1]):
+    grid_lon_partial, grid_lat_partial = np.asarray(grid_lon_partial), np.asarray(grid_lat_partial)
 
-            i_cols = round((grid_lon_partial[i, j] - xllcorner_ref) / cellsize_reference)
-            j_rows = round((grid_lat_partial[i, j] - yllcorner_reference) / cellsize_reference)
+    # reference cells of the partial cells (half cells are rounded to the even index as python round)
+    idx_i_reference = np.rint((grid_lon_partial - xllcorner_ref) / cellsize_reference).astype(np.int64)
+    idx_j_reference = rows_ref - np.rint((grid_lat_partial - yllcorner_reference) / cellsize_reference).astype(np.int64)
 
-            j_rows = rows_ref - j_rows
+    idx_valid = (idx_j_reference >= 0) & (idx_j_reference < rows_ref) & \
+                (idx_i_reference >= 0) & (idx_i_reference < cols_ref)
 
-            idx_i_reference[i, j] = i_cols
-            idx_j_reference[i, j] = j_rows
+    idx_i_partial, idx_j_partial = np.indices(grid_lon_partial.shape)
 
-            if (j_rows >= 0 and j_rows < geo_mask_reference.shape[0]) and \
-                    (i_cols >= 0 and i_cols < geo_mask_reference.shape[1]):
-                geo_mask_reference[j_rows, i_cols] = id_domain
+    # undefined cells are set by the no_data value
+    idx_i_reference = np.where(idx_valid, idx_i_reference, no_data).astype(int)
+    idx_j_reference = np.where(idx_valid, idx_j_reference, no_data).astype(int)
+    idx_i_partial = np.where(idx_valid, idx_i_partial, no_data).astype(int)
+    idx_j_partial = np.where(idx_valid, idx_j_partial, no_data).astype(int)
 
-
-    print('ciao')
+    return idx_i_reference, idx_j_reference, idx_i_partial, idx_j_partial
 # -------------------------------------------------------------------------------------
@@ -12,6 +12,7 @@ Version:       '1.0.0'
 import logging
 
 import os
+import hashlib
 import pickle
 import tempfile
 
@@ -25,6 +26,8 @@ from copy import deepcopy
 from tools.processing_tool_datasets_merger.lib_info_args import logger_name
 from tools.processing_tool_datasets_merger.lib_data_io_tiff import write_data_tiff
 
+from shybox.type_toolkit.io_encoding import get_encoding
+
 # Logging
 log_stream = logging.getLogger(logger_name)
 
@@ -277,9 +280,11 @@ def write_dset_tiff(file_name_dict, file_dset, file_compression_option=None, fil
 def write_dset_nc(file_name,
                   dset_data, dset_attrs=None,
                   dset_mode='w', dset_engine='h5netcdf', dset_compression=0, dset_format='NETCDF4',
-                  dim_key_time='time', fill_data=-9999.0, dset_type='float32'):
+                  dim_key_time='time', fill_data=None, dset_type=None, dset_preset='default'):
 
-    dset_encoded = dict(zlib=True, complevel=dset_compression, _FillValue=fill_data, dtype=dset_type)
+    # encoding preset (chunks, compression and packing) updated by the compression level and by the type (if defined)
+    dset_encoded = get_encoding(dset_data, dset_preset, time_dim=dim_key_time,
+                                complevel=dset_compression if dset_compression > 0 else None, dtype=dset_type)
 
     dset_encoding = {}
     for var_name in dset_data.data_vars:
@@ -292,7 +297,7 @@ def write_dset_nc(file_name,
         var_data = dset_data[var_name]
         var_attrs = deepcopy(dset_data[var_name].attrs)
         if len(var_data.dims) > 0:
-            dset_encoding[var_name] = deepcopy(dset_encoded)
+            dset_encoding[var_name] = deepcopy(dset_encoded.get(var_name, {}))
 
         if var_attrs:
             for attr_key, attr_value in var_attrs.items():
@@ -308,11 +313,22 @@ def write_dset_nc(file_name,
 
                 dset_data[var_name].attrs.pop(attr_key)
 
-            if '_FillValue' not in list(dset_encoding[var_name].keys()):
-                dset_encoding[var_name]['_FillValue'] = fill_data
-
             if '_FillValue' in list(dset_data[var_name].attrs.keys()):
-                dset_data[var_name].attrs.pop['_FillValue']
+                dset_data[var_name].attrs.pop('_FillValue')
+
+        if var_name in list(dset_encoding.keys()):
+            # the non float variables are cast to the type (if defined)
+            if dset_type is not None and var_data.dtype.kind != 'f':
+                dset_encoding[var_name]['dtype'] = dset_type
+            # the fill value is used for the variables saved as float (the packed variables keep the preset value)
+            # and for the integer variables only if the value is in the range of the type
+            var_type = np.dtype(dset_encoding[var_name].get('dtype', var_data.dtype))
+            if fill_data is not None and 'scale_factor' not in list(dset_encoding[var_name].keys()):
+                if var_type.kind == 'f':
+                    dset_encoding[var_name]['_FillValue'] = fill_data
+                elif var_type.kind in 'iu' and '_FillValue' not in list(dset_encoding[var_name].keys()):
+                    if np.iinfo(var_type).min <= fill_data <= np.iinfo(var_type).max:
+                        dset_encoding[var_name]['_FillValue'] = fill_data
 
     if dim_key_time in list(dset_data.coords):
         dset_encoding[dim_key_time] = {'calendar': 'gregorian'}
@@ -355,3 +371,69 @@ def write_obj(file_name, data):
     with open(file_name, 'wb') as handle:
         pickle.dump(data, handle, protocol=pickle.HIGHEST_PROTOCOL)
 # -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to define the index map folder of a domain obj
+def define_idx_map_file(file_name, idx_extension='.idx'):
+    return os.path.splitext(file_name)[0] + idx_extension
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to compute the signature of the grids used by an index map
+def compute_idx_map_signature(*grid_fields):
+    grid_hash = hashlib.sha256()
+    for grid_field in grid_fields:
+        grid_hash.update(np.ascontiguousarray(grid_field, dtype=np.float64).tobytes())
+        grid_hash.update(b'|')
+    return grid_hash.hexdigest()
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to write index map (one uncompressed npy file for each array, the signature is written at last)
+def write_idx_map(file_name, idx_flat_dom, idx_flat_ref, idx_mask_dom, shape_ref, idx_signature):
+
+    os.makedirs(file_name, exist_ok=True)
+
+    idx_map = {'idx_flat_dom': np.asarray(idx_flat_dom, dtype=np.int32),
+               'idx_flat_ref': np.asarray(idx_flat_ref, dtype=np.int32),
+               'idx_mask_dom': np.asarray(idx_mask_dom, dtype=bool),
+               'shape_ref': np.asarray(shape_ref, dtype=np.int64),
+               'signature': np.asarray(idx_signature)}
+
+    for var_name, var_data in idx_map.items():
+        file_handle, file_tmp = tempfile.mkstemp(dir=file_name, suffix='.npy')
+        os.close(file_handle)
+        try:
+            np.save(file_tmp, var_data)
+            os.replace(file_tmp, os.path.join(file_name, var_name + '.npy'))
+        finally:
+            if os.path.exists(file_tmp):
+                os.remove(file_tmp)
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to read index map (arrays are memory mapped if mmap_mode is defined)
+def read_idx_map(file_name, idx_signature=None, mmap_mode='r'):
+
+    file_signature = os.path.join(file_name, 'signature.npy')
+    if not os.path.exists(file_signature):
+        return None
+
+    idx_map = {'signature': np.load(file_signature, allow_pickle=False)}
+    if idx_signature is not None and str(idx_map['signature']) != idx_signature:
+        log_stream.warning(' ===> Index map "' + file_name + '" is not defined for the selected grids')
+        return None
+
+    for var_name in ['idx_flat_dom', 'idx_flat_ref', 'idx_mask_dom', 'shape_ref']:
+        file_var = os.path.join(file_name, var_name + '.npy')
+        if not os.path.exists(file_var):
+            log_stream.warning(' ===> Index map "' + file_name + '" is not complete')
+            return None
+        idx_map[var_name] = np.load(file_var, mmap_mode=mmap_mode, allow_pickle=False)
+
+    return idx_map
+# -------------------------------------------------------------------------------------
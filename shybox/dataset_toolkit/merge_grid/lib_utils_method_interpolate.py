@@ -74,12 +74,35 @@ def apply_var_interpolate(var_obj_in, geo_da_out,
 # -------------------------------------------------------------------------------------
 
 
+# -------------------------------------------------------------------------------------
+# Method to compute the flat indices of the sample method (domain cells -> reference cells)
+def compute_sample_index(i_cols_ref, j_rows_ref, i_cols_dom, j_rows_dom, shape_dom, shape_ref):
+
+    i_cols_ref, j_rows_ref = np.asarray(i_cols_ref), np.asarray(j_rows_ref)
+    i_dom, j_dom = np.asarray(i_cols_dom).ravel(), np.asarray(j_rows_dom).ravel()
+
+    # domain cells (the undefined cells are set by negative values)
+    idx_valid = (i_dom >= 0) & (j_dom >= 0) & (i_dom < shape_dom[0]) & (j_dom < shape_dom[1])
+    i_dom, j_dom = i_dom[idx_valid].astype(np.int64), j_dom[idx_valid].astype(np.int64)
+
+    # reference cells (the undefined cells are set by negative values)
+    i_ref, j_ref = i_cols_ref[i_dom, j_dom].astype(np.int64), j_rows_ref[i_dom, j_dom].astype(np.int64)
+    idx_valid = (i_ref >= 0) & (j_ref >= 0) & (j_ref < shape_ref[0]) & (i_ref < shape_ref[1])
+
+    idx_flat_dom = np.ravel_multi_index((i_dom[idx_valid], j_dom[idx_valid]), tuple(shape_dom))
+    idx_flat_ref = np.ravel_multi_index((j_ref[idx_valid], i_ref[idx_valid]), tuple(shape_ref))
+
+    return idx_flat_dom, idx_flat_ref
+# -------------------------------------------------------------------------------------
+
+
 # -------------------------------------------------------------------------------------
 # Method to apply sample method
 def apply_var_sample(var_dset_in, geo_da_out,
                      i_cols_ref, j_rows_ref, i_cols_dom, j_rows_dom,
                      dim_name_time='time', dim_name_geo_x='longitude', dim_name_geo_y='latitude',
-                     coord_name_time='time', coord_name_geo_x='longitude', coord_name_geo_y='latitude'):
+                     coord_name_time='time', coord_name_geo_x='longitude', coord_name_geo_y='latitude',
+                     sample_index=None):
 
     dims_list_expected = [dim_name_geo_y, dim_name_geo_x, dim_name_time]
     coords_list_expected = [coord_name_time, coord_name_geo_x, coord_name_geo_y]
@@ -120,8 +143,23 @@ def apply_var_sample(var_dset_in, geo_da_out,
 
     geo_attrs_out = geo_da_out.attrs
 
-    i_cols_ref, j_rows_ref = i_cols_ref.astype(int), j_rows_ref.astype(int)
-    i_cols_dom, j_rows_dom = i_cols_dom.astype(int), j_rows_dom.astype(int)
+    # flat indices of the domain and reference cells (computed once for all the variables)
+    shape_dom = (var_dset_in.sizes[dim_name_geo_y], var_dset_in.sizes[dim_name_geo_x])
+    if sample_index is not None:
+        idx_flat_dom, idx_flat_ref = sample_index
+        if idx_flat_dom.shape[0] > 0 and (idx_flat_dom.max() >= np.prod(shape_dom) or
+                                          idx_flat_ref.max() >= np.prod(geo_da_out.shape[:2])):
+            log_stream.warning(' ===> Index map is not defined for the domain and reference grids')
+            sample_index = None
+    if sample_index is None:
+        if any([idx_obj is None for idx_obj in [i_cols_ref, j_rows_ref, i_cols_dom, j_rows_dom]]):
+            log_stream.error(' ===> Index map of the sample method is not available or not valid. '
+                             'Run the static part of the procedure to regenerate the index map of the domain')
+            raise RuntimeError('Index map not available. Regenerate the static datasets')
+        sample_index = compute_sample_index(
+            i_cols_ref.astype(int), j_rows_ref.astype(int), i_cols_dom.astype(int), j_rows_dom.astype(int),
+            shape_dom=shape_dom, shape_ref=geo_da_out.shape[:2])
+    idx_flat_dom, idx_flat_ref = sample_index
 
     flag_time = False
     if dim_name_time in dims_list_in and coord_name_time in coords_list_in:
@@ -141,23 +179,27 @@ def apply_var_sample(var_dset_in, geo_da_out,
         var_dset_out = xr.Dataset()
         var_dset_out.attrs = geo_attrs_out
 
-    var_dict_tmp = {}
-    for variable_name in variable_list_in:
-
-        var_values_tmp = np.zeros(shape=[geo_da_out.shape[0], geo_da_out.shape[1]])
-        var_values_tmp[:, :] = np.nan
-
-        if variable_name not in coords_list_in:
-            var_values_in = var_dset_in[variable_name].values
+    # stack all the variables (and time slices) and scatter them to the reference grid in one pass
+    var_list_in = [variable_name for variable_name in variable_list_in if variable_name not in coords_list_in]
+    var_stack_in, var_shape_in = [], {}
+    for variable_name in var_list_in:
+        var_values_in = var_dset_in[variable_name].transpose(dim_name_geo_y, dim_name_geo_x, ...).values
+        var_shape_in[variable_name] = var_values_in.shape[2:]
+        var_stack_in.append(var_values_in.reshape(var_values_in.shape[0] * var_values_in.shape[1], -1))
 
-            for i_dom, j_dom in zip(i_cols_dom.flatten(), j_rows_dom.flatten()):
-                if i_dom >= 0 and j_dom >= 0:
-                    i_cols_tmp = i_cols_ref[i_dom, j_dom]
-                    j_rows_tmp = j_rows_ref[i_dom, j_dom]
-
-                    var_values_tmp[j_rows_tmp, i_cols_tmp] = var_values_in[i_dom, j_dom]
-
-            var_dict_tmp[variable_name] = var_values_tmp
+    var_dict_tmp = {}
+    if var_stack_in:
+        var_stack_in = np.concatenate(var_stack_in, axis=1)
+        var_stack_out = np.full((geo_da_out.shape[0] * geo_da_out.shape[1], var_stack_in.shape[1]), np.nan)
+        var_stack_out[idx_flat_ref] = var_stack_in[idx_flat_dom]
+
+        var_idx = 0
+        for variable_name in var_list_in:
+            var_n = int(np.prod(var_shape_in[variable_name]))
+            var_values_tmp = var_stack_out[:, var_idx:var_idx + var_n]
+            var_dict_tmp[variable_name] = var_values_tmp.reshape(
+                (geo_da_out.shape[0], geo_da_out.shape[1]) + var_shape_in[variable_name])
+            var_idx += var_n
 
     for variable_name, variable_data in var_dict_tmp.items():
 
@@ -54,7 +54,7 @@ class IOHandler:
     def __init__(self, file_name: str, file_time: (str, pd.Timestamp) = None,
                  file_type: str = 'raster', file_format: Optional[str] = None,
                  map_dims: Optional[dict] = None, map_geo: Optional[dict] = None,
-                 map_data: (list, dict) = None, **kwargs) -> None:
+                 map_data: (list, dict) = None, file_sidecar: bool = False, **kwargs) -> None:
 
         if file_type is None:
             file_type = 'raster'
@@ -62,6 +62,8 @@ class IOHandler:
         self.file_name = file_name
         self.file_time = file_time
         self.file_type = file_type.lower()
+        # binary sidecars of the ascii grids (only for the files read many times, e.g. the static files)
+        self.file_sidecar = file_sidecar
 
         self.file_format = file_format if file_format is not None else self.file_name.split('.')[-1]
         if self.file_format.lower() in ['tif', 'tiff', 'geotiff']:
@@ -74,7 +76,7 @@ class IOHandler:
             raise ValueError(f'Format {self.file_format} not supported.')
 
         if 'raster' in self.file_type:
-            if self.file_format == 'ascii' or self.file_format == 'netcdf':
+            if self.file_format == 'ascii' or self.file_format == 'tiff' or self.file_format == 'netcdf':
 
                 if self.file_format not in self.file_type:
                     self.file_type = self.__compose_type(self.file_type, self.file_format)
@@ -129,11 +131,19 @@ class IOHandler:
         exist_flag = self.exist_data(file_name=self.file_name, mandatory=mandatory)
         if exist_flag:
 
+            # the window is pushed down to the grid readers (only the selected block is read)
+            window_kwargs = {}
+            if row_start is not None and row_end is not None and col_start is not None and col_end is not None:
+                window_kwargs = {'row_start': row_start, 'row_end': row_end, 'col_start': col_start, 'col_end': col_end}
+            window_reader = self.fx_data in self.type_data_grid.values()
+            sidecar_kwargs = {'file_sidecar': self.file_sidecar} if self.fx_data is get_file_grid_ascii else {}
+
             obj_data = self.fx_data(
                 file_name=self.file_name,
-                file_map_dims=self.map_dims, file_map_geo=self.map_geo, file_map_data=self.map_data)
+                file_map_dims=self.map_dims, file_map_geo=self.map_geo, file_map_data=self.map_data,
+                **(window_kwargs if window_reader else {}), **sidecar_kwargs)
 
-            if row_start is not None and row_end is not None and col_start is not None and col_end is not None:
+            if window_kwargs and not window_reader:
                 obj_data = obj_data.isel(latitude=slice(row_start, row_end), longitude=slice(col_start, col_end))
         else:
             obj_data = None
@@ -252,6 +262,9 @@ class IOHandler:
         """
         Check if data is available for a given time.
         """
+        # gdal virtual file names (e.g. /vsigzip/) refer to the compressed file on disk
+        if file_name.startswith('/vsi'):
+            file_name = file_name.split('/', 2)[-1]
         if os.path.exists(file_name):
             return True
         else:
@@ -31,6 +31,8 @@ class StaticHandler(IOWrapper):
         self.file_type = file_type
 
         super().from_path(os.path.join(self.folder_name, self.file_name), self.file_type)
+        # the static files are read many times (parsed grids stored in binary sidecars)
+        self.file_sidecar = True
 
     @classmethod
     def define_file_data(cls, folder_name: str, file_name: str = '{domain_name}.dem.txt',
@@ -1,31 +1,160 @@
 # ----------------------------------------------------------------------------------------------------------------------
 # libraries
 import logging
+import json
 import numpy as np
 import xarray as xr
 import rasterio as rio
+from affine import Affine
 from rasterio.crs import CRS
+from rasterio.coords import BoundingBox
+from rasterio.windows import Window
 
 from shybox.io_toolkit.lib_io_utils import create_darray
+from shybox.io_toolkit.lib_io_sidecar import get_sidecar_source, get_sidecar_signature, read_sidecar, write_sidecar
 # ----------------------------------------------------------------------------------------------------------------------
 
 
 # ----------------------------------------------------------------------------------------------------------------------
-# method to read grid data
+# method to get the window of a grid (rows and cols are given as python slices bounds)
+def get_file_window(height: int, width: int,
+                    row_start: int = None, row_end: int = None,
+                    col_start: int = None, col_end: int = None) -> Window:
+
+    row_start, row_end, _ = slice(row_start, row_end).indices(height)
+    col_start, col_end, _ = slice(col_start, col_end).indices(width)
+
+    return Window(col_off=col_start, row_off=row_start,
+                  width=max(col_end - col_start, 0), height=max(row_end - row_start, 0))
+# ----------------------------------------------------------------------------------------------------------------------
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# method to read grid data (with file_sidecar, used by the static files, the parsed grid is stored in a binary sidecar
+# next to the file and reused while the file is unchanged)
 def get_file_grid(file_name: str, file_epsg: str = 'EPSG:4326', file_dtype: str = 'float32',
                   var_limit_min: (int, float) = None, var_limit_max: (int, float) = None,
                   var_null_data: (int, float) = np.nan,
                   coord_name_x: str = 'longitude', coord_name_y: str = 'latitude',
-                  dim_name_x: str = 'longitude', dim_name_y: str = 'latitude', **kwargs) -> xr.DataArray:
+                  dim_name_x: str = 'longitude', dim_name_y: str = 'latitude',
+                  row_start: int = None, row_end: int = None, col_start: int = None, col_end: int = None,
+                  file_sidecar: bool = False, **kwargs) -> xr.DataArray:
+
+    grid_args = dict(file_epsg=file_epsg, file_dtype=file_dtype,
+                     var_limit_min=var_limit_min, var_limit_max=var_limit_max, var_null_data=var_null_data,
+                     coord_name_x=coord_name_x, coord_name_y=coord_name_y, dim_name_x=dim_name_x, dim_name_y=dim_name_y)
+    window_args = dict(row_start=row_start, row_end=row_end, col_start=col_start, col_end=col_end)
+    file_window = any(window_value is not None for window_value in window_args.values())
+
+    # the virtual paths (except the local gzip files) are read without sidecar
+    file_source = get_sidecar_source(file_name) if file_sidecar else None
+    if file_source is None:
+        return read_file_grid(file_name, **window_args, **grid_args)
+
+    file_signature = get_sidecar_signature(file_source, 'grid', **grid_args)
+    grid_arrays = read_sidecar(file_source, file_signature, mmap_mode='c')
+    if grid_arrays is None:
+        # the window is read from the file (the sidecar is written by the reads of the full grid)
+        if file_window:
+            return read_file_grid(file_name, **window_args, **grid_args)
+        data_obj = read_file_grid(file_name, **grid_args)
+        write_sidecar(file_source, file_signature, sidecar_mapped=['values'], **grid_to_arrays(data_obj))
+        return data_obj
+
+    # the values are memory-mapped (only the rows of the window are loaded)
+    data_obj = arrays_to_grid(grid_arrays, coord_name_x=coord_name_x, coord_name_y=coord_name_y,
+                              dim_name_x=dim_name_x, dim_name_y=dim_name_y)
+    if file_window:
+        data_obj = select_file_window(data_obj, **window_args, dim_name_x=dim_name_x, dim_name_y=dim_name_y).copy()
 
-    dset = rio.open(file_name)
-    bounds, res, transform = dset.bounds, dset.res, dset.transform
-    data = dset.read()
+    return data_obj
+# ----------------------------------------------------------------------------------------------------------------------
 
-    if dset.crs is None:
-        file_crs = CRS.from_string(file_epsg)
-    else:
-        file_crs = dset.crs
+
+# ----------------------------------------------------------------------------------------------------------------------
+# method to select the window of a grid (values, coordinates and geographical attributes)
+def select_file_window(data_obj: xr.DataArray,
+                       row_start: int = None, row_end: int = None, col_start: int = None, col_end: int = None,
+                       dim_name_x: str = 'longitude', dim_name_y: str = 'latitude') -> xr.DataArray:
+
+    data_attrs = data_obj.attrs
+    window = get_file_window(data_attrs['high'], data_attrs['wide'], row_start, row_end, col_start, col_end)
+
+    transform = rio.windows.transform(window, data_attrs['transform'])
+    bounds = BoundingBox(*rio.windows.bounds(window, data_attrs['transform']))
+
+    data_obj = data_obj.isel({dim_name_y: slice(window.row_off, window.row_off + window.height),
+                              dim_name_x: slice(window.col_off, window.col_off + window.width)})
+    data_obj.attrs = {**data_attrs, 'transform': transform,
+                      'bbox': [bounds.left, bounds.bottom, bounds.right, bounds.top],
+                      'bb_left': bounds.left, 'bb_right': bounds.right,
+                      'bb_top': bounds.top, 'bb_bottom': bounds.bottom,
+                      'high': window.height, 'wide': window.width}
+
+    return data_obj
+# ----------------------------------------------------------------------------------------------------------------------
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# method to convert a grid to sidecar arrays
+def grid_to_arrays(data_obj: xr.DataArray) -> dict:
+
+    data_attrs = dict(data_obj.attrs)
+    transform, crs = data_attrs.pop('transform'), data_attrs.pop('crs')
+
+    return {'values': data_obj.values,
+            'x': data_obj[data_obj.dims[1]].values, 'y': data_obj[data_obj.dims[0]].values,
+            'transform': np.array(list(transform)[:6], dtype=np.float64),
+            'crs': np.array(crs.to_wkt()),
+            'attrs': np.array(json.dumps(data_attrs, default=float))}
+# ----------------------------------------------------------------------------------------------------------------------
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# method to convert sidecar arrays to a grid
+def arrays_to_grid(grid_arrays: dict,
+                   coord_name_x: str = 'longitude', coord_name_y: str = 'latitude',
+                   dim_name_x: str = 'longitude', dim_name_y: str = 'latitude') -> xr.DataArray:
+
+    data_obj = create_darray(
+        grid_arrays['values'], grid_arrays['x'], grid_arrays['y'],
+        coord_name_x=coord_name_x, coord_name_y=coord_name_y,
+        dim_name_x=dim_name_x, dim_name_y=dim_name_y)
+
+    data_attrs = json.loads(str(grid_arrays['attrs']))
+    data_obj.attrs = {'transform': Affine(*grid_arrays['transform'].tolist()),
+                      'crs': CRS.from_wkt(str(grid_arrays['crs'])), **data_attrs}
+
+    return data_obj
+# ----------------------------------------------------------------------------------------------------------------------
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# method to read grid data from the ascii file
+def read_file_grid(file_name: str, file_epsg: str = 'EPSG:4326', file_dtype: str = 'float32',
+                   var_limit_min: (int, float) = None, var_limit_max: (int, float) = None,
+                   var_null_data: (int, float) = np.nan,
+                   coord_name_x: str = 'longitude', coord_name_y: str = 'latitude',
+                   dim_name_x: str = 'longitude', dim_name_y: str = 'latitude',
+                   row_start: int = None, row_end: int = None, col_start: int = None, col_end: int = None,
+                   **kwargs) -> xr.DataArray:
+
+    with rio.open(file_name) as dset:
+
+        # read only the window of the grid (if defined)
+        if row_start is not None or row_end is not None or col_start is not None or col_end is not None:
+            window = get_file_window(dset.height, dset.width, row_start, row_end, col_start, col_end)
+            bounds, transform = BoundingBox(*rio.windows.bounds(window, dset.transform)), dset.window_transform(window)
+            data = dset.read(window=window)
+        else:
+            bounds, transform = dset.bounds, dset.transform
+            data = dset.read()
+        res = dset.res
+
+        if dset.crs is None:
+            file_crs = CRS.from_string(file_epsg)
+        else:
+            file_crs = dset.crs
 
     if file_dtype == 'float32':
         values = np.float32(data[0, :, :])
@@ -7,18 +7,20 @@ import pandas as pd
 from collections import OrderedDict
 from copy import deepcopy
 
-from shybox.io_toolkit.lib_io_utils import parse_row2str
+from shybox.generic_toolkit.lib_utils_string import parse_row2string as parse_row2str
+from shybox.io_toolkit.lib_io_sidecar import with_point_sidecar
 # ----------------------------------------------------------------------------------------------------------------------
 
 
 # ----------------------------------------------------------------------------------------------------------------------
 # method to read point data section(s)
+@with_point_sidecar
 def get_file_point_section(file_name: str, columns_name: list = None) -> (pd.DataFrame, dict):
 
     if columns_name is None:
         columns_name = ['x', 'y', 'catchment', 'section', 'code', 'area', 'thr_1', 'thr_2']
 
-    file_data = pd.read_table(file_name, header=None, delim_whitespace=True)
+    file_data = pd.read_table(file_name, header=None, sep=r'\s+')
 
     if len(columns_name) != len(file_data.columns):
         file_data = file_data.iloc[:, 0: len(columns_name)]
@@ -38,6 +40,7 @@ def get_file_point_section(file_name: str, columns_name: list = None) -> (pd.Dat
 
 # -------------------------------------------------------------------------------------
 # method to read point data dam(s)
+@with_point_sidecar
 def get_file_point_dam(file_name: str, line_delimiter: str = '#', line_reorder: bool = False) -> (dict, dict):
 
     file_handle = open(file_name, 'r')
@@ -187,6 +190,7 @@ def get_file_point_dam(file_name: str, line_delimiter: str = '#', line_reorder:
 
 # -------------------------------------------------------------------------------------
 # method to read point data intake(s)
+@with_point_sidecar
 def get_file_point_intake(file_name: str, line_delimiter: str = '#') -> (dict, dict):
 
     file_handle = open(file_name, 'r')
@@ -255,6 +259,7 @@ def get_file_point_intake(file_name: str, line_delimiter: str = '#') -> (dict, d
 
 # -------------------------------------------------------------------------------------
 # method to read point data joint(s)
+@with_point_sidecar
 def get_file_point_joint(file_name: str, line_delimiter: str = '#') -> (dict, None):
 
     file_handle = open(file_name, 'r')
@@ -279,6 +284,7 @@ def get_file_point_joint(file_name: str, line_delimiter: str = '#') -> (dict, No
 
 # -------------------------------------------------------------------------------------
 # method to read point data lake(s)
+@with_point_sidecar
 def get_file_point_lake(file_name: str, line_delimiter: str = '#'):
 
     file_handle = open(file_name, 'r')
@@ -9,8 +9,8 @@ Version:       '1.0.0'
 #######################################################################################
 # Library
 import logging
+import hashlib
 import os
-import struct
 
 from copy import deepcopy
 
@@ -18,7 +18,7 @@ import numpy as np
 import pandas as pd
 import xarray as xr
 
-from tools.processing_tool_datasets_merger.lib_info_args import logger_name
+from shybox.generic_toolkit.lib_default_args import logger_name
 
 # Logging
 log_stream = logging.getLogger(logger_name)
@@ -28,11 +28,91 @@ import matplotlib.pylab as plt
 #######################################################################################
 
 
+# --------------------------------------------------------------------------------
+# Method to get the numpy dtype of a binary variable (struct format and byte order)
+def get_dtype_binary(var_format='i', var_byte_order='='):
+    return np.dtype(var_byte_order + var_format)
+# --------------------------------------------------------------------------------
+
+
+# --------------------------------------------------------------------------------
+# Method to open binary file as memory map (rows, cols, steps) in fortran order
+def open_data_binary(file_name, rows, cols, var_format='i', var_byte_order='=', var_mode='r'):
+
+    var_dtype = get_dtype_binary(var_format, var_byte_order)
+
+    geo_n = rows * cols
+    file_n = os.path.getsize(file_name) // var_dtype.itemsize
+    if file_n % geo_n != 0:
+        log_stream.error(' ===> File ' + file_name + ' size is not a multiple of the grid size!')
+        raise IOError('Binary file and geographical reference are not consistent')
+    var_steps = file_n // geo_n
+
+    # the steps are contiguous in fortran order (each step is read only when accessed)
+    var_data = np.memmap(file_name, dtype=var_dtype, mode=var_mode, shape=(rows, cols, var_steps), order='F')
+
+    return var_data
+# --------------------------------------------------------------------------------
+
+
+# --------------------------------------------------------------------------------
+# Class to read the scaled steps of a binary file only when accessed (wrapped by dask)
+class BinaryArray:
+
+    def __init__(self, file_name, rows, cols, var_format='i', var_scale_factor=10, var_byte_order='='):
+        self.file_name = file_name
+        self.var_data = open_data_binary(file_name, rows, cols, var_format=var_format, var_byte_order=var_byte_order)
+        self.var_scale_factor = var_scale_factor
+
+        self.shape = self.var_data.shape
+        self.ndim = self.var_data.ndim
+        self.dtype = np.dtype(np.float32)
+
+    def __getitem__(self, key):
+        return np.divide(self.var_data[key], self.var_scale_factor, dtype=np.float32)
+
+    # method to get the dask array (one chunk for each step)
+    def to_dask(self):
+        import dask.array as da
+        file_stat = os.stat(self.file_name)
+        file_token = '-'.join([os.path.abspath(self.file_name), str(file_stat.st_size), str(file_stat.st_mtime_ns),
+                               self.var_data.dtype.str, str(self.var_scale_factor), str(self.shape)])
+        # the name is given explicitly (the default token would hash the whole file)
+        return da.from_array(self, chunks=(self.shape[0], self.shape[1], 1), asarray=False,
+                             name='binary-' + hashlib.sha256(file_token.encode()).hexdigest()[:32])
+# --------------------------------------------------------------------------------
+
+
+# --------------------------------------------------------------------------------
+# Method to write 2d/3d variable in binary format (scaled and saved as 1d array in fortran order)
+def write_data_binary(file_name, var_data, var_format='i', var_scale_factor=10, var_byte_order='=',
+                      var_no_data=-9999.0):
+
+    var_dtype = get_dtype_binary(var_format, var_byte_order)
+
+    if isinstance(var_data, xr.DataArray):
+        var_data = var_data.values
+    var_data = np.asarray(var_data, dtype=np.float64)
+    if var_data.ndim == 2:
+        var_data = var_data[:, :, np.newaxis]
+
+    var_data = np.where(np.isnan(var_data), var_no_data, var_data) * var_scale_factor
+    if var_dtype.kind in ['i', 'u']:
+        var_data = np.rint(var_data)
+
+    with open(file_name, 'wb') as file_handle:
+        # the transposed array in c order is the array in fortran order
+        np.ascontiguousarray(var_data.transpose(), dtype=var_dtype).tofile(file_handle)
+
+    return file_name
+# --------------------------------------------------------------------------------
+
+
 # --------------------------------------------------------------------------------
 # Method to read 2d variable in binary format (saved as 1d integer array)
 def read_data_binary(file_name, var_geo_x, var_geo_y, var_geo_attrs=None,
-                     var_format='i', var_scale_factor=10,
-                     var_name=None, var_time=None, var_geo_1d=True, var_time_freq='H', var_time_steps_expected=1,
+                     var_format='i', var_scale_factor=10, var_byte_order='=', var_lazy=False,
+                     var_name=None, var_time=None, var_geo_1d=True, var_time_freq='h', var_time_steps_expected=1,
                      coord_name_geo_x='west_east', coord_name_geo_y='south_north', coord_name_time='time',
                      dim_name_geo_x='west_east', dim_name_geo_y='south_north', dim_name_time='time',
                      dims_order=None):
@@ -45,21 +125,16 @@ def read_data_binary(file_name, var_geo_x, var_geo_y, var_geo_attrs=None,
         # Shape values 1d
         rows = var_geo_y.shape[0]
         cols = var_geo_x.shape[0]
-        geo_n = rows * cols
 
-        # Open and read binary file [OLD]
-        file_handle = open(file_name, 'rb')
-        data_format = var_format * geo_n
-        data_stream = file_handle.read(-1)
-        var_data_1d = struct.unpack(data_format, data_stream)
-        file_handle.close()
+        # Open binary file as memory map (steps are decoded and scaled only when accessed if lazy)
+        var_data_raw = BinaryArray(file_name, rows, cols, var_format=var_format,
+                                   var_scale_factor=var_scale_factor, var_byte_order=var_byte_order)
+        var_time_steps_cmp = var_data_raw.shape[2]
 
-        var_data_1d = np.asarray(var_data_1d, dtype=np.float32)
-        var_data_1d = np.float32(var_data_1d / var_scale_factor)
-        var_n = var_data_1d.shape[0]
-
-        var_time_steps_cmp = int(var_n / geo_n)
-        var_data_3d = np.reshape(var_data_1d, (rows, cols, var_time_steps_cmp), order='F')
+        if var_lazy:
+            var_data_3d = var_data_raw.to_dask()
+        else:
+            var_data_3d = var_data_raw[:, :, :]
 
         if var_geo_1d:
             var_geo_x_2d, var_geo_y_2d = np.meshgrid(var_geo_x, var_geo_y)
@@ -72,17 +147,9 @@ def read_data_binary(file_name, var_geo_x, var_geo_y, var_geo_attrs=None,
         if geo_y_lower > geo_y_upper:
             var_geo_y_2d = np.flipud(var_geo_y_2d)
 
-        var_dims = var_data_3d.shape
-        var_high = var_dims[0]
-        var_wide = var_dims[1]
-
         if var_time_steps_cmp == var_time_steps_expected:
 
-            var_data = np.zeros(shape=[var_geo_x_2d.shape[0], var_geo_y_2d.shape[1], var_time_steps_cmp])
-            var_data[:, :, :] = np.nan
-            for step in np.arange(0, var_time_steps_cmp, 1):
-                var_data_step = var_data_3d[:, :, step]
-                var_data[:, :, step] = var_data_step
+            var_data = var_data_3d
 
         elif (var_time_steps_cmp == 1) and (var_time_steps_cmp < var_time_steps_expected):
 
@@ -90,11 +157,10 @@ def read_data_binary(file_name, var_geo_x, var_geo_y, var_geo_attrs=None,
                                ' steps expected [' + str(var_time_steps_expected) +
                                '] and found [' + str(var_time_steps_cmp) + '] are different!')
 
-            var_data = np.zeros(shape=[var_geo_x_2d.shape[0], var_geo_y_2d.shape[1], var_time_steps_expected])
-            var_data[:, :, :] = np.nan
-            for step in np.arange(0, var_time_steps_expected, 1):
-                var_data_step = var_data_3d[:, :, 0]
-                var_data[:, :, step] = var_data_step
+            if var_lazy:
+                var_data = var_data_3d.repeat(var_time_steps_expected, axis=2)
+            else:
+                var_data = np.repeat(var_data_3d, var_time_steps_expected, axis=2)
 
             var_time_steps_cmp = deepcopy(var_time_steps_expected)
 
@@ -10,21 +10,29 @@ Version:       '1.0.0'
 # ----------------------------------------------------------------------------------------------------------------------
 # libraries
 import gzip
+import shutil
+
+# buffer size used to stream the data
+buffer_size = 2 ** 20
+# gdal virtual file system prefix to read gzip files without uncompressing them
+vsi_prefix = '/vsigzip/'
 # ----------------------------------------------------------------------------------------------------------------------
 
 
 # ----------------------------------------------------------------------------------------------------------------------
-# method to unzip file
-def unzip_file_name(file_name_compress: str, file_name_uncompress: str) -> bool:
+# method to open file (streaming access to the uncompressed data)
+def open_file_name(file_name_compress: str, file_mode: str = 'rb'):
+    return gzip.open(file_name_compress, file_mode)
+# ----------------------------------------------------------------------------------------------------------------------
 
-    file_handle_compress = gzip.GzipFile(file_name_compress, "rb")
-    file_handle_uncompress = open(file_name_uncompress, "wb")
 
-    file_data_compress = file_handle_compress.read()
-    file_handle_uncompress.write(file_data_compress)
+# ----------------------------------------------------------------------------------------------------------------------
+# method to unzip file
+def unzip_file_name(file_name_compress: str, file_name_uncompress: str) -> bool:
 
-    file_handle_compress.close()
-    file_handle_uncompress.close()
+    with gzip.open(file_name_compress, 'rb') as file_handle_compress, \
+            open(file_name_uncompress, 'wb') as file_handle_uncompress:
+        shutil.copyfileobj(file_handle_compress, file_handle_uncompress, buffer_size)
 
     return True
 
@@ -33,15 +41,11 @@ def unzip_file_name(file_name_compress: str, file_name_uncompress: str) -> bool:
 
 # ----------------------------------------------------------------------------------------------------------------------
 # method to zip file
-def zip_file_name(file_name_uncompress: str, file_name_compress: str) -> bool:
-
-    file_handle_uncompress = open(file_name_uncompress, 'rb')
-    file_handle_compress = gzip.open(file_name_compress, 'wb')
-
-    file_handle_compress.writelines(file_handle_uncompress)
+def zip_file_name(file_name_uncompress: str, file_name_compress: str, compress_level: int = 9) -> bool:
 
-    file_handle_compress.close()
-    file_handle_uncompress.close()
+    with open(file_name_uncompress, 'rb') as file_handle_uncompress, \
+            gzip.open(file_name_compress, 'wb', compresslevel=compress_level) as file_handle_compress:
+        shutil.copyfileobj(file_handle_uncompress, file_handle_compress, buffer_size)
 
     return True
 
@@ -0,0 +1,58 @@
+"""
+Library Features:
+
+Name:          lib_io_lz4
+Author(s):     Fabio Delogu (fabio.delogu@cimafoundation.org)
+Date:          '20261018'
+Version:       '1.0.0'
+"""
+
+# ----------------------------------------------------------------------------------------------------------------------
+# libraries
+import shutil
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+# buffer size used to stream the data
+buffer_size = 2 ** 20
+# gdal virtual file system prefix (lz4 files are not readable by gdal without uncompressing them)
+vsi_prefix = None
+# ----------------------------------------------------------------------------------------------------------------------
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# method to open file (streaming access to the uncompressed data)
+def open_file_name(file_name_compress: str, file_mode: str = 'rb', compress_level: int = 0):
+    if lz4_frame is None:
+        raise ImportError('Lz4 compression needs the "lz4" package')
+    if 'w' in file_mode:
+        return lz4_frame.open(file_name_compress, file_mode, compression_level=compress_level)
+    return lz4_frame.open(file_name_compress, file_mode)
+# ----------------------------------------------------------------------------------------------------------------------
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# method to unzip file
+def unzip_file_name(file_name_compress: str, file_name_uncompress: str) -> bool:
+
+    with open_file_name(file_name_compress, 'rb') as file_handle_compress, \
+            open(file_name_uncompress, 'wb') as file_handle_uncompress:
+        shutil.copyfileobj(file_handle_compress, file_handle_uncompress, buffer_size)
+
+    return True
+# ----------------------------------------------------------------------------------------------------------------------
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# method to zip file
+def zip_file_name(file_name_uncompress: str, file_name_compress: str, compress_level: int = 0) -> bool:
+
+    with open(file_name_uncompress, 'rb') as file_handle_uncompress, \
+            open_file_name(file_name_compress, 'wb', compress_level=compress_level) as file_handle_compress:
+        shutil.copyfileobj(file_handle_uncompress, file_handle_compress, buffer_size)
+
+    return True
+# ----------------------------------------------------------------------------------------------------------------------
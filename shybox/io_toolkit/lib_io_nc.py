@@ -48,6 +48,7 @@ def get_file_grid(file_name: str,
                   file_epsg: str = 'EPSG:4326', file_crs: CRS = None,
                   file_transform: rasterio.transform = None,
                   file_map_dims: dict = None, file_map_geo: dict = None, file_map_data: dict = None,
+                  row_start: int = None, row_end: int = None, col_start: int = None, col_end: int = None,
                   **kwargs):
 
     file_obj = xr.open_dataset(file_name)
@@ -78,6 +79,11 @@ def get_file_grid(file_name: str,
     file_obj['longitude'] = xr.DataArray(file_x_values, dims='longitude')
     file_obj['latitude'] = xr.DataArray(file_y_values, dims='latitude')
 
+    # select the window of the grid (hyperslab read, only the selected block is decoded)
+    if row_start is not None or row_end is not None or col_start is not None or col_end is not None:
+        file_obj = file_obj.isel(latitude=slice(row_start, row_end), longitude=slice(col_start, col_end))
+        file_x_values, file_y_values = file_obj['longitude'].values, file_obj['latitude'].values
+
     file_height, file_width = file_obj['latitude'].shape[0], file_obj['longitude'].shape[0]
 
     file_x_left = np.min(np.min(file_x_values))
@@ -0,0 +1,190 @@
+"""
+Library Features:
+
+Name:          lib_io_sidecar
+Author(s):     Fabio Delogu (fabio.delogu@cimafoundation.org)
+Date:          '20261018'
+Version:       '1.0.0'
+"""
+
+# ----------------------------------------------------------------------------------------------------------------------
+# libraries
+import logging
+import functools
+import inspect
+import json
+import zipfile
+import os
+
+import numpy as np
+import pandas as pd
+
+from shybox.generic_toolkit.lib_default_args import logger_name, logger_arrow
+
+# logging
+logger_stream = logging.getLogger(logger_name)
+
+# sidecar extensions (stored next to the source file; the mapped arrays are stored in their own npy files)
+sidecar_extension = '.sidecar.npz'
+sidecar_extension_array = '.sidecar.{:}.npy'
+# ----------------------------------------------------------------------------------------------------------------------
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# method to get the sidecar file of a source file (or of one of its mapped arrays)
+def get_sidecar_file(file_name: str, sidecar_key: str = None) -> str:
+    if sidecar_key is not None:
+        return file_name + sidecar_extension_array.format(sidecar_key)
+    return file_name + sidecar_extension
+# ----------------------------------------------------------------------------------------------------------------------
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# method to get the local file of a source (gdal gzip paths are mapped to the compressed file, the other
+# virtual paths have no sidecar)
+def get_sidecar_source(file_name: str) -> (str, None):
+    if not file_name.startswith('/vsi'):
+        return file_name
+    vsi_prefix, _, vsi_file = file_name[1:].partition('/')
+    if vsi_prefix == 'vsigzip' and os.path.isfile(vsi_file):
+        return vsi_file
+    return None
+# ----------------------------------------------------------------------------------------------------------------------
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# method to get the signature of a source file (size, modification time and parser arguments)
+def get_sidecar_signature(file_name: str, file_tag: str, **kwargs) -> str:
+    file_stat = os.stat(file_name)
+    return json.dumps({'tag': file_tag, 'size': file_stat.st_size, 'mtime': file_stat.st_mtime_ns,
+                       'args': kwargs}, sort_keys=True, default=str)
+# ----------------------------------------------------------------------------------------------------------------------
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# method to read the sidecar arrays (None if not available or not valid for the source file)
+def read_sidecar(file_name: str, file_signature: str, mmap_mode: str = None) -> (dict, None):
+
+    sidecar_file = get_sidecar_file(file_name)
+    if not os.path.exists(sidecar_file):
+        return None
+
+    try:
+        with np.load(sidecar_file, allow_pickle=False) as sidecar_obj:
+            if str(sidecar_obj['signature']) != file_signature:
+                return None
+            sidecar_data = {sidecar_key: sidecar_obj[sidecar_key]
+                            for sidecar_key in sidecar_obj.files if sidecar_key not in ['signature', 'mapped']}
+            sidecar_mapped = json.loads(str(sidecar_obj['mapped'])) if 'mapped' in sidecar_obj.files else []
+        for sidecar_key in sidecar_mapped:
+            sidecar_data[sidecar_key] = np.load(
+                get_sidecar_file(file_name, sidecar_key), mmap_mode=mmap_mode, allow_pickle=False)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile) as exc:
+        logger_stream.warning(logger_arrow.warning + 'Sidecar "' + sidecar_file + '" not readable: ' + repr(exc))
+        return None
+
+    return sidecar_data
+# ----------------------------------------------------------------------------------------------------------------------
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# method to write the sidecar arrays (skipped if the folder is not writable). The mapped arrays are stored in npy
+# files (written before the npz file holding the signature) to be memory-mapped by the readers
+def write_sidecar(file_name: str, file_signature: str, sidecar_mapped: (list, tuple) = (), **sidecar_data) -> bool:
+
+    sidecar_file = get_sidecar_file(file_name)
+    sidecar_tmp = sidecar_file + '.tmp.npz'
+    try:
+        for sidecar_key in sidecar_mapped:
+            sidecar_array_file = get_sidecar_file(file_name, sidecar_key)
+            sidecar_array_tmp = sidecar_array_file + '.tmp.npy'
+            np.save(sidecar_array_tmp, np.ascontiguousarray(sidecar_data.pop(sidecar_key)))
+            os.replace(sidecar_array_tmp, sidecar_array_file)
+        np.savez(sidecar_tmp, signature=np.array(file_signature),
+                 mapped=np.array(json.dumps(list(sidecar_mapped))), **sidecar_data)
+        os.replace(sidecar_tmp, sidecar_file)
+    except OSError as exc:
+        logger_stream.warning(logger_arrow.warning + 'Sidecar "' + sidecar_file + '" not written: ' + repr(exc))
+        return False
+    finally:
+        for sidecar_tmp_file in [sidecar_tmp] + [get_sidecar_file(file_name, sidecar_key) + '.tmp.npy'
+                                                 for sidecar_key in sidecar_mapped]:
+            if os.path.exists(sidecar_tmp_file):
+                os.remove(sidecar_tmp_file)
+
+    return True
+# ----------------------------------------------------------------------------------------------------------------------
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# method to convert a point table to columnar arrays (not numeric columns are json encoded)
+def frame_to_arrays(point_dframe: (pd.DataFrame, None), point_dims: (dict, None)) -> dict:
+
+    point_meta = {'frame': point_dframe is not None, 'dims': point_dims, 'columns': [], 'encoded': []}
+    point_arrays = {}
+    if point_dframe is not None:
+        point_meta['index'] = point_dframe.index.tolist()
+        for column_id, (column_name, column_data) in enumerate(point_dframe.items()):
+            point_meta['columns'].append(column_name)
+            if column_data.dtype.kind in 'biuf':
+                point_arrays[f'column_{column_id}'] = column_data.values
+            else:
+                point_meta['encoded'].append(column_name)
+                point_arrays[f'column_{column_id}'] = np.array(
+                    [json.dumps(column_value) for column_value in column_data.tolist()], dtype=str)
+
+    point_arrays['meta'] = np.array(json.dumps(point_meta))
+
+    return point_arrays
+# ----------------------------------------------------------------------------------------------------------------------
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# method to convert columnar arrays to a point table
+def arrays_to_frame(point_arrays: dict) -> (pd.DataFrame, dict):
+
+    point_meta = json.loads(str(point_arrays['meta']))
+    if not point_meta['frame']:
+        return None, point_meta['dims']
+
+    point_data = {}
+    for column_id, column_name in enumerate(point_meta['columns']):
+        column_values = point_arrays[f'column_{column_id}']
+        if column_name in point_meta['encoded']:
+            column_values = [json.loads(column_value) for column_value in column_values.tolist()]
+        point_data[column_name] = column_values
+    point_dframe = pd.DataFrame(point_data, index=point_meta['index'], columns=point_meta['columns'])
+
+    return point_dframe, point_meta['dims']
+# ----------------------------------------------------------------------------------------------------------------------
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# decorator to cache the point tables parsed from ascii files (file_sidecar=False to parse the file)
+def with_point_sidecar(fx_point):
+
+    @functools.wraps(fx_point)
+    def wrapper(file_name: str, *args, file_sidecar: bool = True, **kwargs):
+
+        file_source = get_sidecar_source(file_name) if file_sidecar else None
+        if file_source is None:
+            return fx_point(file_name, *args, **kwargs)
+
+        fx_args = inspect.signature(fx_point).bind(file_name, *args, **kwargs)
+        fx_args.apply_defaults()
+        fx_args = {arg_name: arg_value for arg_name, arg_value in fx_args.arguments.items() if arg_name != 'file_name'}
+
+        file_signature = get_sidecar_signature(file_source, fx_point.__name__, **fx_args)
+        point_arrays = read_sidecar(file_source, file_signature)
+        if point_arrays is not None:
+            return arrays_to_frame(point_arrays)
+
+        point_dframe, point_dims = fx_point(file_name, *args, **kwargs)
+        write_sidecar(file_source, file_signature, **frame_to_arrays(point_dframe, point_dims))
+
+        return point_dframe, point_dims
+
+    return wrapper
+# ----------------------------------------------------------------------------------------------------------------------
@@ -1,5 +1,17 @@
+# ----------------------------------------------------------------------------------------------------------------------
+# libraries
+import xarray as xr
 
+from shybox.io_toolkit.lib_io_ascii_grid import read_file_grid as get_file_grid_rasterio
+# ----------------------------------------------------------------------------------------------------------------------
 
 
-def get_file_grid(file_name):
-    print()
\ No newline at end of file
+# ----------------------------------------------------------------------------------------------------------------------
+# method to read grid data (tiff files are read by rasterio, only the window of the grid is decoded)
+def get_file_grid(file_name: str, file_epsg: str = 'EPSG:4326', file_dtype: str = 'float32',
+                  row_start: int = None, row_end: int = None, col_start: int = None, col_end: int = None,
+                  **kwargs) -> xr.DataArray:
+    return get_file_grid_rasterio(
+        file_name, file_epsg=file_epsg, file_dtype=file_dtype,
+        row_start=row_start, row_end=row_end, col_start=col_start, col_end=col_end, **kwargs)
+# ----------------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,116 @@
+"""
+Library Features:
+
+Name:          lib_io_zip_cache
+Author(s):     Fabio Delogu (fabio.delogu@cimafoundation.org)
+Date:          '20261018'
+Version:       '1.0.0'
+"""
+
+# ----------------------------------------------------------------------------------------------------------------------
+# libraries
+import logging
+import hashlib
+import tempfile
+import os
+
+from typing import Callable
+
+from shybox.generic_toolkit.lib_default_args import logger_name, logger_arrow
+
+# logging
+logger_stream = logging.getLogger(logger_name)
+# ----------------------------------------------------------------------------------------------------------------------
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# class to store the uncompressed files on disk (lru eviction)
+class ZipCache:
+
+    """
+    On-disk cache of the uncompressed files, used by the formats that need random access (e.g. netcdf).
+    Each entry is named by the path, size and modification time of the compressed file and the entries
+    least recently used are removed when the size of the cache exceeds cache_size (bytes).
+    """
+
+    def __init__(self, cache_dir: str = None, cache_size: int = 2 ** 30) -> None:
+        if cache_dir is None:
+            cache_dir = os.path.join(tempfile.gettempdir(), 'shybox_zip_cache')
+        self.cache_dir = cache_dir
+        self.cache_size = cache_size
+
+    def __repr__(self):
+        return f'ZipCache({self.cache_dir})'
+
+    # method to get the file of a compressed file
+    def get_file(self, file_name_compress: str, file_name_uncompress: str) -> str:
+        file_stat = os.stat(file_name_compress)
+        file_key = hashlib.sha256('|'.join([
+            os.path.abspath(file_name_compress), str(file_stat.st_size), str(file_stat.st_mtime_ns)]).encode())
+        return os.path.join(self.cache_dir, file_key.hexdigest()[:16] + '_' + os.path.basename(file_name_uncompress))
+
+    # method to get the uncompressed file (uncompressed only if not already available)
+    def get(self, file_name_compress: str, file_name_uncompress: str, fx_uncompress: Callable) -> str:
+
+        file_name = self.get_file(file_name_compress, file_name_uncompress)
+        if os.path.exists(file_name):
+            # update the access time (used by the lru eviction)
+            os.utime(file_name)
+            return file_name
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        # uncompress to a temporary file and rename (entries can be shared by several workers)
+        file_handle, file_tmp = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        os.close(file_handle)
+        try:
+            fx_uncompress(file_name_compress, file_tmp)
+            os.replace(file_tmp, file_name)
+        finally:
+            if os.path.exists(file_tmp):
+                os.remove(file_tmp)
+
+        self.evict(file_keep=file_name)
+
+        return file_name
+
+    # method to remove the entries least recently used
+    def evict(self, file_keep: str = None) -> None:
+
+        file_list = []
+        for file_name in os.listdir(self.cache_dir):
+            file_path = os.path.join(self.cache_dir, file_name)
+            if file_name.endswith('.tmp') or file_path == file_keep:
+                continue
+            try:
+                file_stat = os.stat(file_path)
+            except FileNotFoundError:
+                continue
+            file_list.append((file_stat.st_mtime, file_stat.st_size, file_path))
+
+        cache_size = sum([file_size for _, file_size, _ in file_list])
+        if file_keep is not None and os.path.exists(file_keep):
+            cache_size += os.path.getsize(file_keep)
+
+        for _, file_size, file_path in sorted(file_list):
+            if cache_size <= self.cache_size:
+                break
+            try:
+                os.remove(file_path)
+                logger_stream.info(logger_arrow.info(tag='info_method') + 'Remove cached file "' + file_path + '"')
+            except FileNotFoundError:
+                pass
+            cache_size -= file_size
+
+    # method to remove all the entries
+    def clear(self) -> None:
+        if os.path.exists(self.cache_dir):
+            for file_name in os.listdir(self.cache_dir):
+                os.remove(os.path.join(self.cache_dir, file_name))
+# ----------------------------------------------------------------------------------------------------------------------
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# default cache shared by the zip handlers
+zip_cache = ZipCache()
+# ----------------------------------------------------------------------------------------------------------------------
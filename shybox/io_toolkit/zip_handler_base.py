@@ -7,7 +7,16 @@ from copy import deepcopy
 from shybox.default.lib_default_generic import zip_extension
 
 from shybox.io_toolkit.lib_io_gzip import (unzip_file_name as unzip_file_name_gzip,
-                                           zip_file_name as zip_file_name_gzip)
+                                           zip_file_name as zip_file_name_gzip,
+                                           open_file_name as open_file_name_gzip,
+                                           vsi_prefix as vsi_prefix_gzip)
+from shybox.io_toolkit.lib_io_zstd import (unzip_file_name as unzip_file_name_zstd,
+                                           zip_file_name as zip_file_name_zstd,
+                                           open_file_name as open_file_name_zstd)
+from shybox.io_toolkit.lib_io_lz4 import (unzip_file_name as unzip_file_name_lz4,
+                                          zip_file_name as zip_file_name_lz4,
+                                          open_file_name as open_file_name_lz4)
+from shybox.io_toolkit.lib_io_zip_cache import ZipCache, zip_cache as zip_cache_default
 # ----------------------------------------------------------------------------------------------------------------------
 
 
@@ -15,11 +24,14 @@ from shybox.io_toolkit.lib_io_gzip import (unzip_file_name as unzip_file_name_gz
 class ZipHandler:
 
     type_class = 'zip_base'
-    type_data_compress = {'gzip': zip_file_name_gzip}
-    type_data_uncompress = {'gzip': unzip_file_name_gzip}
+    type_data_format = {'gz': 'gzip', 'zst': 'zstd', 'lz4': 'lz4'}
+    type_data_compress = {'gzip': zip_file_name_gzip, 'zstd': zip_file_name_zstd, 'lz4': zip_file_name_lz4}
+    type_data_uncompress = {'gzip': unzip_file_name_gzip, 'zstd': unzip_file_name_zstd, 'lz4': unzip_file_name_lz4}
+    type_data_open = {'gzip': open_file_name_gzip, 'zstd': open_file_name_zstd, 'lz4': open_file_name_lz4}
+    type_data_vsi = {'gzip': vsi_prefix_gzip}
 
     def __init__(self, file_name_compress: str, file_name_uncompress: str = None,
-                 zip_extension: str = '.gz') -> None:
+                 zip_extension: str = '.gz', zip_cache: ZipCache = None) -> None:
 
         self.file_name_compress = file_name_compress
         self.zip_extension = check_zip_extension(zip_extension)
@@ -28,13 +40,15 @@ class ZipHandler:
             file_name_uncompress = remove_zip_extension(file_name_compress, zip_extension_template=zip_extension)
         self.file_name_uncompress = file_name_uncompress
 
-        if self.zip_extension.lower() in ['gz', '.gz']:
-            self.zip_format = 'gzip'
+        if self.zip_extension.lower() in list(self.type_data_format.keys()):
+            self.zip_format = self.type_data_format[self.zip_extension.lower()]
         else:
             raise ValueError(f'Format {self.zip_extension} not supported.')
 
         self.fx_compress = self.type_data_compress.get(self.zip_format, self.zip_error)
         self.fx_uncompress = self.type_data_uncompress.get(self.zip_format, self.zip_error)
+        self.fx_open = self.type_data_open.get(self.zip_format, self.zip_error)
+        self.zip_cache = zip_cache if zip_cache is not None else zip_cache_default
 
         if self.zip_extension in self.file_name_compress:
             self.zip_check = True
@@ -52,6 +66,34 @@ class ZipHandler:
             return None
     # ------------------------------------------------------------------------------------------------------------------
 
+    # ------------------------------------------------------------------------------------------------------------------
+    # method to open file (streaming access to the uncompressed data, nothing is written on disk)
+    def open_file_name(self, file_mode: str = 'rb'):
+        if self.zip_extension in self.file_name_compress:
+            return self.fx_open(self.file_name_compress, file_mode)
+        else:
+            return open(self.file_name_compress, file_mode)
+    # ------------------------------------------------------------------------------------------------------------------
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # method to get the gdal virtual file name (None if the format is not readable by gdal without uncompressing it)
+    def get_vsi_file_name(self) -> (str, None):
+        if self.zip_extension in self.file_name_compress:
+            vsi_prefix = self.type_data_vsi.get(self.zip_format, None)
+            if vsi_prefix is not None:
+                return vsi_prefix + os.path.abspath(self.file_name_compress)
+        return None
+    # ------------------------------------------------------------------------------------------------------------------
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # method to get the uncompressed file from the cache (for the formats that need random access)
+    def cache_file_name(self) -> (str, None):
+        if self.zip_extension in self.file_name_compress:
+            return self.zip_cache.get(self.file_name_compress, self.file_name_uncompress, self.fx_uncompress)
+        else:
+            return None
+    # ------------------------------------------------------------------------------------------------------------------
+
     # ------------------------------------------------------------------------------------------------------------------
     # method to compress file
     def compress_file_name(self):
@@ -77,7 +119,7 @@ class ZipHandler:
 def check_zip_extension(zip_extension: str = 'gz', zip_extension_expected: list = None) -> str:
 
     if zip_extension_expected is None:
-        zip_extension_expected = ['gz']
+        zip_extension_expected = ['gz', 'zst', 'lz4']
 
     # Check if string starts with point
     if zip_extension.startswith('.'):
@@ -94,6 +136,21 @@ def check_zip_extension(zip_extension: str = 'gz', zip_extension_expected: list
 # ----------------------------------------------------------------------------------------------------------------------
 
 
+# ----------------------------------------------------------------------------------------------------------------------
+# method to get the zip extension of a file (default if the file is not compressed)
+def get_zip_extension(file_name: str, zip_extension_default: str = zip_extension,
+                      zip_extension_expected: list = None) -> str:
+
+    if zip_extension_expected is None:
+        zip_extension_expected = ['gz', 'zst', 'lz4']
+
+    file_extension = os.path.splitext(file_name)[1]
+    if file_extension[1:] in zip_extension_expected:
+        return file_extension
+    return zip_extension_default
+# ----------------------------------------------------------------------------------------------------------------------
+
+
 # ----------------------------------------------------------------------------------------------------------------------
 # method to add only compressed extension
 def add_zip_extension(file_name_unzip, zip_extension_template=zip_extension):
@@ -0,0 +1,179 @@
+"""
+Library Features:
+
+Name:          lib_orchestrator_cache
+Author(s):     Fabio Delogu (fabio.delogu@cimafoundation.org)
+Date:          '20261018'
+Version:       '1.0.0'
+"""
+
+# ----------------------------------------------------------------------------------------------------------------------
+# libraries
+import logging
+import hashlib
+import pickle
+import tempfile
+import os
+
+import datetime as dt
+import pandas as pd
+
+from shybox.generic_toolkit.lib_default_args import logger_name, logger_arrow
+from shybox.type_toolkit.io_dataset_base import Dataset
+
+# logging
+logger_stream = logging.getLogger(logger_name)
+# ----------------------------------------------------------------------------------------------------------------------
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# class to store the outputs of the processes on disk (content addressed, lru eviction)
+class ProcessorCache:
+
+    """
+    On-disk cache of the process outputs. Each entry is stored as a pickle named by its key. The bytes written
+    are counted and, when the size of the cache exceeds cache_size (bytes), the folder is walked and the entries
+    least recently used are removed down to evict_ratio * cache_size (the entries written by other workers are
+    found by the walk).
+    """
+
+    file_ext = '.pkl'
+    evict_ratio = 0.8
+
+    def __init__(self, cache_dir: str, cache_size: int = 2 ** 30) -> None:
+        self.cache_dir = cache_dir
+        self.cache_size = cache_size
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.cache_bytes = sum([file_size for _, file_size, _ in self.get_entries()])
+
+    def __repr__(self):
+        return f'ProcessorCache({self.cache_dir})'
+
+    # method to get the file of a key
+    def get_file(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], key + self.file_ext)
+
+    # method to get an entry (None if not available)
+    def get(self, key: str) -> (tuple, None):
+
+        file_name = self.get_file(key)
+        if not os.path.exists(file_name):
+            return None
+
+        try:
+            with open(file_name, 'rb') as file_handle:
+                entry = pickle.load(file_handle)
+        except Exception as exc:
+            logger_stream.warning(logger_arrow.warning + 'Cache entry "' + file_name + '" not readable: ' + repr(exc))
+            return None
+
+        # update the access time (used by the lru eviction)
+        os.utime(file_name)
+
+        return entry
+
+    # method to set an entry
+    def set(self, key: str, fx_out, metadata: dict = None) -> None:
+
+        file_name = self.get_file(key)
+        os.makedirs(os.path.dirname(file_name), exist_ok=True)
+
+        # write to a temporary file and rename (entries can be shared by several workers)
+        file_handle, file_tmp = tempfile.mkstemp(dir=os.path.dirname(file_name), suffix='.tmp')
+        try:
+            with os.fdopen(file_handle, 'wb') as file_obj:
+                pickle.dump((fx_out, metadata if metadata is not None else {}), file_obj,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(file_tmp, file_name)
+        except Exception as exc:
+            if os.path.exists(file_tmp):
+                os.remove(file_tmp)
+            logger_stream.warning(logger_arrow.warning + 'Cache entry "' + file_name + '" not written: ' + repr(exc))
+            return
+
+        self.cache_bytes += os.path.getsize(file_name)
+        if self.cache_bytes > self.cache_size:
+            self.evict()
+
+    # method to get the entries (modification time, size and file)
+    def get_entries(self) -> list:
+
+        file_list = []
+        for root, _, files in os.walk(self.cache_dir):
+            for file_name in files:
+                if file_name.endswith(self.file_ext):
+                    file_path = os.path.join(root, file_name)
+                    try:
+                        file_stat = os.stat(file_path)
+                    except FileNotFoundError:
+                        continue
+                    file_list.append((file_stat.st_mtime, file_stat.st_size, file_path))
+
+        return file_list
+
+    # method to remove the entries least recently used
+    def evict(self) -> None:
+
+        file_list = self.get_entries()
+        cache_size = sum([file_size for _, file_size, _ in file_list])
+        for _, file_size, file_path in sorted(file_list):
+            if cache_size <= self.cache_size * self.evict_ratio:
+                break
+            try:
+                os.remove(file_path)
+            except FileNotFoundError:
+                pass
+            cache_size -= file_size
+
+        self.cache_bytes = cache_size
+
+    # method to remove all the entries
+    def clear(self) -> None:
+        for root, _, files in os.walk(self.cache_dir):
+            for file_name in files:
+                if file_name.endswith(self.file_ext):
+                    os.remove(os.path.join(root, file_name))
+        self.cache_bytes = 0
+# ----------------------------------------------------------------------------------------------------------------------
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# method to hash an object (None if the object can not be pickled, the outputs depending on it are not cached)
+def hash_object(obj) -> (str, None):
+    if isinstance(obj, dict):
+        obj = sorted(obj.items(), key=lambda item: str(item[0]))
+    try:
+        obj_bytes = pickle.dumps(obj, protocol=4)
+    except Exception as exc:
+        logger_stream.warning(logger_arrow.warning + 'Object not hashable, the cache is not used: ' + repr(exc))
+        return None
+    return hashlib.sha256(obj_bytes).hexdigest()
+# ----------------------------------------------------------------------------------------------------------------------
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# method to get the signature of a source (key and modification time, None if not available)
+def get_source_signature(obj, time: (dt.datetime, pd.Timestamp) = None, **kwargs) -> (str, None):
+
+    if not isinstance(obj, Dataset):
+        return None
+
+    try:
+        source_key = obj.get_key(time, **kwargs)
+    except Exception:
+        return None
+
+    if not os.path.exists(source_key):
+        return None
+
+    return f'{source_key}:{os.path.getmtime(source_key)}'
+# ----------------------------------------------------------------------------------------------------------------------
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# method to make a cache key
+def make_cache_key(*key_parts) -> (str, None):
+    if any([key_part is None for key_part in key_parts]):
+        return None
+    return hashlib.sha256('|'.join([str(key_part) for key_part in key_parts]).encode()).hexdigest()
+# ----------------------------------------------------------------------------------------------------------------------
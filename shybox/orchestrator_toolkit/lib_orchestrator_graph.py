@@ -0,0 +1,160 @@
+"""
+Library Features:
+
+Name:          lib_orchestrator_graph
+Author(s):     Fabio Delogu (fabio.delogu@cimafoundation.org)
+Date:          '20261018'
+Version:       '1.0.0'
+"""
+
+# ----------------------------------------------------------------------------------------------------------------------
+# libraries
+import logging
+import datetime as dt
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from shybox.generic_toolkit.lib_default_args import logger_name
+from shybox.orchestrator_toolkit.lib_orchestrator_process import ProcessorContainer
+
+# logging
+logger_stream = logging.getLogger(logger_name)
+# ----------------------------------------------------------------------------------------------------------------------
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# class to organize the processes in a directed acyclic graph
+class ProcessorGraph:
+
+    """
+    Graph of the processes: each node is a ProcessorContainer and its inputs are declared by name
+    (argument name -> upstream node name). Nodes are run by topological layers: the nodes of a layer
+    are independent and run concurrently, each node is run once per time step and its result is shared
+    in memory with all the downstream nodes. If the cache is active, the key of each node is made from the keys
+    of its upstream nodes.
+    """
+
+    def __init__(self) -> None:
+        self.nodes = {}
+        self.inputs = {}
+        self._layers = None
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __contains__(self, name: str):
+        return name in self.nodes
+
+    def __repr__(self):
+        return f'ProcessorGraph({self.get_layers()})'
+
+    # method to add a node to the graph
+    def add_node(self, name: str, process: ProcessorContainer, inputs: dict = None) -> None:
+
+        if name in self.nodes:
+            raise ValueError(f'Process "{name}" is already defined in the graph.')
+
+        inputs = inputs if inputs is not None else {}
+        for arg_name, node_name in inputs.items():
+            if node_name not in self.nodes:
+                raise ValueError(f'Input "{arg_name}" of process "{name}" refers to the undefined process "{node_name}".')
+
+        self.nodes[name] = process
+        self.inputs[name] = dict(inputs)
+        self._layers = None
+
+    # method to get the upstream nodes of a node
+    def get_upstream(self, name: str) -> list:
+        return list(dict.fromkeys(self.inputs[name].values()))
+
+    # method to get the downstream nodes of a node
+    def get_downstream(self, name: str) -> list:
+        return [node_name for node_name, node_inputs in self.inputs.items() if name in node_inputs.values()]
+
+    # method to get the nodes without downstream nodes (the outputs of the graph)
+    def get_sinks(self) -> list:
+        return [node_name for node_name in self.nodes if len(self.get_downstream(node_name)) == 0]
+
+    # method to get the topological layers of the graph
+    def get_layers(self) -> list:
+
+        if self._layers is not None:
+            return self._layers
+
+        node_degree = {node_name: len(self.get_upstream(node_name)) for node_name in self.nodes}
+        layer_nodes = [node_name for node_name, node_n in node_degree.items() if node_n == 0]
+
+        layers = []
+        while len(layer_nodes) > 0:
+            layers.append(layer_nodes)
+            layer_next = []
+            for node_name in layer_nodes:
+                for node_down in self.get_downstream(node_name):
+                    node_degree[node_down] -= 1
+                    if node_degree[node_down] == 0:
+                        layer_next.append(node_down)
+            layer_nodes = layer_next
+
+        if sum([len(layer) for layer in layers]) != len(self.nodes):
+            raise RuntimeError('Processes graph is not acyclic.')
+
+        self._layers = layers
+        return layers
+
+    # method to run the graph for a time step
+    def run(self, time: (dt.datetime, pd.Timestamp), write_output: bool = True,
+            max_workers: int = None, stats: list = None, **kwargs) -> dict:
+
+        """
+        Run all the nodes for a time step and return the output of the sink nodes.
+        If write_output is False, the sink nodes return (fx_out, metadata) instead of writing.
+        If stats is a list, the records of the nodes phases are appended to it.
+        """
+
+        node_sinks = self.get_sinks()
+        node_results, node_consumers = {}, {node_name: len(self.get_downstream(node_name)) for node_name in self.nodes}
+        node_keys = {}
+
+        for layer in self.get_layers():
+
+            for node_name in layer:
+                node_keys[node_name] = self.nodes[node_name].make_cache_key(
+                    time, {arg_name: node_keys[node_up] for arg_name, node_up in self.inputs[node_name].items()},
+                    **kwargs)
+
+            if len(layer) == 1 or max_workers == 1:
+                layer_results = {node_name: self._run_node(node_name, time, node_results, node_sinks,
+                                                            write_output, node_keys[node_name], stats, **kwargs)
+                                 for node_name in layer}
+            else:
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    layer_futures = {node_name: executor.submit(self._run_node, node_name, time, node_results,
+                                                                node_sinks, write_output, node_keys[node_name],
+                                                                stats, **kwargs)
+                                     for node_name in layer}
+                    layer_results = {node_name: node_future.result()
+                                     for node_name, node_future in layer_futures.items()}
+            node_results.update(layer_results)
+
+            # release the results not needed anymore by the downstream nodes
+            for node_name in layer:
+                for node_up in self.get_upstream(node_name):
+                    node_consumers[node_up] -= 1
+                    if node_consumers[node_up] == 0 and node_up not in node_sinks:
+                        node_results.pop(node_up, None)
+
+        return {node_name: node_results[node_name] for node_name in node_sinks}
+
+    # method to run a node with the results of its upstream nodes
+    def _run_node(self, name: str, time: (dt.datetime, pd.Timestamp),
+                  node_results: dict, node_sinks: list, write_output: bool, node_key: str = None,
+                  stats: list = None, **kwargs):
+
+        node_inputs = {arg_name: node_results[node_name] for arg_name, node_name in self.inputs[name].items()}
+        node_write = write_output or name not in node_sinks
+
+        return self.nodes[name].run(time, write_output=node_write, inputs=node_inputs, cache_key=node_key,
+                                    stats=stats, **kwargs)
+
+# ----------------------------------------------------------------------------------------------------------------------
@@ -5,11 +5,19 @@ import datetime as dt
 from typing import Callable
 from functools import partial
 
+import logging
 import pandas as pd
 import xarray as xr
 
 from shybox.generic_toolkit.lib_utils_time import convert_time_format
-from shybox.type_toolkit.io_dataset_grid import DataObj
+from shybox.generic_toolkit.lib_default_args import logger_name, logger_arrow
+from shybox.type_toolkit.io_dataset_grid import DataObj, DataMem
+from shybox.orchestrator_toolkit.lib_orchestrator_cache import (
+    ProcessorCache, hash_object, get_source_signature, make_cache_key)
+from shybox.orchestrator_toolkit.lib_orchestrator_stats import measure_phase
+
+# logging
+logger_stream = logging.getLogger(logger_name)
 
 class ProcessorContainer:
     def __init__(self,
@@ -17,21 +25,23 @@ class ProcessorContainer:
                  in_obj: DataObj,
                  args: dict = {},
                  out_obj: DataObj = None,
-                 in_opts: dict = {}, out_opts: dict = {}) -> None:
-
-        self.break_point = False
+                 in_opts: dict = {}, out_opts: dict = {},
+                 name: str = None, cache: ProcessorCache = None) -> None:
 
-        fx_args, fx_static = {}, {}
+        fx_args, fx_static, fx_static_key = {}, {}, {}
         for arg_name, arg_value in args.items():
             if isinstance(arg_value, DataObj):
                 if not arg_value.is_static:
                     fx_args[arg_name] = arg_value
                 else:
                     fx_static[arg_name] = arg_value.get_data()
+                    fx_static_key[arg_name] = get_source_signature(arg_value)
             else:
                 fx_static[arg_name] = arg_value
+                fx_static_key[arg_name] = arg_value
 
         self.fx_name = function.__name__
+        self.name = name if name is not None else self.fx_name
         self.fx_obj = partial(function, **fx_static)
 
         self.fx_static = fx_static
@@ -43,40 +53,106 @@ class ProcessorContainer:
         self.out_obj = out_obj
         self.out_opts = out_opts
 
-    def __repr__(self):
-        return f'ProcessorContainer({self.fx_name})'
+        # static arguments are hashed once (the static data are identified by their source)
+        self.cache = cache
+        self.fx_static_key = hash_object(fx_static_key) if cache is not None else None
 
-    def run(self, time: (dt.datetime, str, pd.Timestamp), **kwargs) -> None:
+    def __repr__(self):
+        return f'ProcessorContainer({self.name})'
+
+    @property
+    def output(self):
+        return self.out_obj
+
+    def make_cache_key(self, time: (dt.datetime, pd.Timestamp), input_keys: dict = None, **kwargs) -> (str, None):
+        """
+        Make the key of the output for a time step: hash of process name, static arguments, input sources
+        (key and modification time, or the keys of the upstream processes) and time step.
+        None if the cache is not active or an input can not be identified.
+        """
+
+        if self.cache is None:
+            return None
+
+        input_keys = dict(input_keys) if input_keys is not None else {}
+        if 'data' not in input_keys:
+            if isinstance(self.in_obj, dict):
+                return None
+            input_keys['data'] = get_source_signature(self.in_obj, time, **kwargs)
+        for arg_name, arg_value in self.fx_args.items():
+            input_keys[arg_name] = get_source_signature(arg_value, time, **kwargs)
+
+        input_parts = [f'{arg_name}={input_keys[arg_name]}' if input_keys[arg_name] is not None else None
+                       for arg_name in sorted(input_keys)]
+
+        return make_cache_key(self.name, self.fx_name, self.fx_static_key, *input_parts, time)
+
+    def run(self, time: (dt.datetime, str, pd.Timestamp), write_output: bool = True,
+            inputs: dict = None, cache_key: str = None, stats: list = None, **kwargs):
+        """
+        Run the process for a time step. If stats is a list, a record for each phase (get_data, fx, write_data)
+        is appended to it.
+        """
 
         if isinstance(time, str):
             time = convert_time_format(time, 'str_to_stamp')
 
-        if 'data' not in kwargs:
+        # inputs already computed upstream (in memory), the data are not read again
+        inputs = dict(inputs) if inputs is not None else {}
+        if 'data' in inputs:
+            data_raw = None
+        elif 'data' not in kwargs:
             data_raw = self.in_obj
         else:
             data_raw = kwargs['data']
 
-        if isinstance(data_raw, dict):
-            if 'tiles' in list(self.in_opts.keys()):
-                for data_key, data_tmp in data_raw.items():
-                    fx_data = data_tmp.squeeze_data_by_time(time_step=time, **kwargs)
-                metadata = {'tiles': list(data_raw.keys())}
-            else:
-                for data_key, data_tmp in data_raw.items():
-                    self.run(time, data = data_tmp, **kwargs)
-                return
+        # check the outputs already computed for the same sources and arguments
+        cache_out = None
+        if cache_key is not None and self.cache is not None and not isinstance(data_raw, dict):
+            with measure_phase(stats, self.name, 'cache', time):
+                cache_out = self.cache.get(cache_key)
 
+        if cache_out is not None:
+            fx_out, metadata = cache_out
         else:
-            fx_data = data_raw.get_data(time_step=time, **kwargs)
-            metadata = {}
+            if data_raw is None:
+                fx_data = inputs.pop('data')
+                metadata = {}
+            elif isinstance(data_raw, dict):
+                if 'tiles' in list(self.in_opts.keys()):
+                    for data_key, data_tmp in data_raw.items():
+                        fx_data = data_tmp.squeeze_data_by_time(time_step=time, **kwargs)
+                    metadata = {'tiles': list(data_raw.keys())}
+                else:
+                    fx_out = []
+                    for data_key, data_tmp in data_raw.items():
+                        fx_out.append(self.run(time, data = data_tmp, write_output = write_output,
+                                               inputs = inputs, stats = stats, **kwargs))
+                    return fx_out
+
+            else:
+                with measure_phase(stats, self.name, 'get_data', time):
+                    fx_data = data_raw.get_data(time_step=time, **kwargs)
+                metadata = {}
+
+            #fx_args = {arg_name: arg_value.get_data(time, **kwargs) for arg_name, arg_value in self.fx_args.items()}
+            fx_args = {arg_name: arg_value for arg_name, arg_value in self.fx_args.items()}
+            fx_args.update(inputs)
+            with measure_phase(stats, self.name, 'fx', time):
+                fx_out = self.fx_obj(data=fx_data, **fx_args)
+
+            if cache_key is not None and self.cache is not None:
+                self.cache.set(cache_key, fx_out, metadata)
 
-        #fx_args = {arg_name: arg_value.get_data(time, **kwargs) for arg_name, arg_value in self.fx_args.items()}
-        fx_args = {arg_name: arg_value for arg_name, arg_value in self.fx_args.items()}
-        fx_out = self.fx_obj(data=fx_data, **fx_args)
+        logger_stream.info(logger_arrow.info(tag='info_method') + 'Process "' + self.name + '" - ' + str(time))
 
-        out_opts = self.out_opts
-        print(f'{self.fx_name} - {time}, {kwargs}')
+        # if the output is not written, it is returned with its metadata (e.g. to be written by the caller)
+        if not write_output:
+            return fx_out, metadata
 
-        self.out_obj.write_data(fx_out, time, metadata = metadata, **kwargs)
+        # in memory outputs are only passed to the downstream processes
+        if self.out_obj is not None and not isinstance(self.out_obj, DataMem):
+            with measure_phase(stats, self.name, 'write_data', time):
+                self.out_obj.write_data(fx_out, time, metadata = metadata, **kwargs)
 
-        return fx_out
\ No newline at end of file
+        return fx_out
@@ -0,0 +1,156 @@
+"""
+Library Features:
+
+Name:          lib_orchestrator_stats
+Author(s):     Fabio Delogu (fabio.delogu@cimafoundation.org)
+Date:          '20261018'
+Version:       '1.0.0'
+"""
+
+# ----------------------------------------------------------------------------------------------------------------------
+# libraries
+import logging
+import threading
+import time
+import os
+
+import pandas as pd
+
+from contextlib import contextmanager
+
+from shybox.generic_toolkit.lib_default_args import logger_name
+
+# logging
+logger_stream = logging.getLogger(logger_name)
+
+# fields of the stats records (rss and i/o are counters of the whole process, they include the other threads)
+STATS_FIELDS = ['process', 'time', 'phase', 'wall_time', 'cpu_time',
+                'rss_peak_delta_process', 'bytes_read_process', 'bytes_written_process']
+
+# peaks of the running phases (the high-water mark of the process is reset at each phase boundary, so the peak
+# read at a boundary is added to all the phases running at that moment)
+PEAK_PHASES = {}
+PEAK_LOCK = threading.Lock()
+# ----------------------------------------------------------------------------------------------------------------------
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# method to get the current resident set size of the process (bytes, None if not available)
+def get_rss() -> (int, None):
+    try:
+        with open('/proc/self/statm', 'r') as file_handle:
+            rss_pages = int(file_handle.read().split()[1])
+        return rss_pages * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, IndexError, ValueError, AttributeError):
+        return None
+# ----------------------------------------------------------------------------------------------------------------------
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# method to get the peak resident set size of the process since the last reset (bytes, None if not available)
+def get_rss_peak() -> (int, None):
+    try:
+        with open('/proc/self/status', 'r') as file_handle:
+            for line in file_handle:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, IndexError, ValueError):
+        return None
+    return None
+# ----------------------------------------------------------------------------------------------------------------------
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# method to reset the peak resident set size of the process to the current one (False if not available)
+def reset_rss_peak() -> bool:
+    try:
+        with open('/proc/self/clear_refs', 'w') as file_handle:
+            file_handle.write('5')
+        return True
+    except OSError:
+        return False
+# ----------------------------------------------------------------------------------------------------------------------
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# method to update the peaks of the running phases and reset the high-water mark (at the phase boundaries)
+def update_rss_peak(phase_id: object, phase_start: bool = True) -> (int, None):
+
+    with PEAK_LOCK:
+        rss_peak = get_rss_peak()
+        if rss_peak is not None:
+            for running_id, running_peak in PEAK_PHASES.items():
+                if running_peak is not None:
+                    PEAK_PHASES[running_id] = max(running_peak, rss_peak)
+
+        if phase_start:
+            # the peak is measured only if the high-water mark can be reset (otherwise it is the process peak)
+            PEAK_PHASES[phase_id] = get_rss() if rss_peak is not None and reset_rss_peak() else None
+            return PEAK_PHASES[phase_id]
+
+        reset_rss_peak()
+        return PEAK_PHASES.pop(phase_id, None)
+# ----------------------------------------------------------------------------------------------------------------------
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# method to get the bytes read and written by the process (None if not available)
+def get_io_bytes() -> tuple:
+    try:
+        with open('/proc/self/io', 'r') as file_handle:
+            io_counters = dict([line.split(':') for line in file_handle.read().splitlines() if ':' in line])
+        return int(io_counters['rchar']), int(io_counters['wchar'])
+    except (OSError, KeyError, ValueError):
+        return None, None
+# ----------------------------------------------------------------------------------------------------------------------
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# method to measure a phase of a process (the record is appended to the stats list). Wall and cpu times are
+# measured for the running thread; the rss peak (over the rss at the start of the phase) and the i/o are read for
+# the whole process, so with graph_workers > 1 they include the phases running in the other threads
+@contextmanager
+def measure_phase(stats: (list, None), process: str, phase: str, time_step: pd.Timestamp = None):
+
+    if stats is None:
+        yield
+        return
+
+    phase_id = object()
+    rss_start = update_rss_peak(phase_id, phase_start=True)
+    read_start, write_start = get_io_bytes()
+    cpu_start, wall_start = time.thread_time(), time.perf_counter()
+    try:
+        yield
+    finally:
+        wall_time, cpu_time = time.perf_counter() - wall_start, time.thread_time() - cpu_start
+        rss_peak = update_rss_peak(phase_id, phase_start=False)
+        read_end, write_end = get_io_bytes()
+
+        stats.append({
+            'process': process, 'time': time_step, 'phase': phase,
+            'wall_time': wall_time, 'cpu_time': cpu_time,
+            'rss_peak_delta_process': rss_peak - rss_start if rss_start is not None else None,
+            'bytes_read_process': read_end - read_start if read_start is not None else None,
+            'bytes_written_process': write_end - write_start if write_start is not None else None})
+# ----------------------------------------------------------------------------------------------------------------------
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# method to dump the stats records (csv or json, according to the file extension)
+def dump_stats(stats: list, file_name: str) -> None:
+
+    stats_table = pd.DataFrame(stats, columns=STATS_FIELDS)
+
+    folder_name = os.path.dirname(file_name)
+    if folder_name != '':
+        os.makedirs(folder_name, exist_ok=True)
+
+    file_ext = os.path.splitext(file_name)[1].lower()
+    if file_ext == '.csv':
+        stats_table.to_csv(file_name, index=False)
+    elif file_ext == '.json':
+        stats_table.to_json(file_name, orient='records', date_format='iso', indent=2)
+    else:
+        raise ValueError(f'Stats file format "{file_ext}" not supported (use ".csv" or ".json").')
+# ----------------------------------------------------------------------------------------------------------------------
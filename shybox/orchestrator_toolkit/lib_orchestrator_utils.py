@@ -9,9 +9,12 @@ Version:       '1.0.0'
 # ----------------------------------------------------------------------------------------------------------------------
 # libraries
 import xarray as xr
-#import rioxarray as rxr
-from osgeo import gdal
+import rioxarray as rxr
+import numpy as np
+from affine import Affine
+from osgeo import gdal, gdal_array
 import tempfile
+import uuid
 import os
 
 from typing import Iterable
@@ -28,16 +31,26 @@ PROCESSES = {}
 
 # ----------------------------------------------------------------------------------------------------------------------
 # method to decorate processing algorithm
-def as_process(input_type: str = 'xarray', output_type: str = 'xarray', **kwargs):
+def as_process(input_type: str = 'xarray', output_type: str = 'xarray', adapter: str = 'tmp', **kwargs):
+
+    # adapter used for the gdal/file conversions: 'tmp' (temporary files, default) or 'mem' (in memory datasets);
+    # with 'mem' the 'file' inputs are '/vsimem/' paths, readable only through gdal (not with os, open or subprocess)
+    if adapter == 'mem':
+        to_gdal, from_gdal, to_file, from_file = xarray_to_mem, mem_to_xarray, xarray_to_vsimem, vsimem_to_xarray
+    elif adapter == 'tmp':
+        to_gdal, from_gdal, to_file, from_file = xarray_to_gdal, gdal_to_xarray, xarray_to_file, file_to_xarray
+    else:
+        raise ValueError(f'Adapter {adapter} not supported.')
+
     def decorator(func):
         def wrapper(data, *args, **kwargs):
             # Ensure the input is in the correct format
             if input_type == 'gdal':
                 # convert xr.DataArray to gdal.Dataset
-                data = xarray_to_gdal(data)
+                data = to_gdal(data)
             elif input_type == 'file':
                 # convert filename to xr.DataArray
-                data = xarray_to_file(data)
+                data = to_file(data)
 
             # Call the original function
             result = func(data, *args, **kwargs)
@@ -49,10 +62,10 @@ def as_process(input_type: str = 'xarray', output_type: str = 'xarray', **kwargs
             # Ensure the output is in the correct format
             if output_type == 'gdal':
                 # Add your output validation logic here
-                result = gdal_to_xarray(result)
+                result = from_gdal(result)
             elif output_type == 'file':
                 # Add your output validation logic here
-                result = file_to_xarray(result)
+                result = from_file(result)
             return result
 
         if output_type in ['tif', 'tiff', 'gdal', 'xarray', 'file']:
@@ -64,7 +77,12 @@ def as_process(input_type: str = 'xarray', output_type: str = 'xarray', **kwargs
         elif output_type in ['text', 'txt']:
             setattr(wrapper, 'output_ext', 'txt')
 
+        # keep the name of the original function (needed to pickle the process in the worker pools)
         wrapper.__name__ = func.__name__
+        wrapper.__qualname__ = func.__qualname__
+        wrapper.__module__ = func.__module__
+        wrapper.__doc__ = func.__doc__
+        wrapper.adapter = adapter
         for key, value in kwargs.items():
             setattr(wrapper, key, value)
         # Add the wrapped function to the global list of processes
@@ -88,7 +106,10 @@ def with_list_input(func):
 
 @with_list_input
 def remove(filename: str):
-    os.remove(filename)
+    if filename.startswith('/vsimem/'):
+        gdal.Unlink(filename)
+    else:
+        os.remove(filename)
 
 @with_list_input
 def grid_to_xarray(data: DataGrid) -> (xr.DataArray, xr.Dataset):
@@ -109,12 +130,10 @@ def xarray_to_file(data_array: xr.DataArray) -> str:
     return temp_file.name
 
 
-'''
 @with_list_input
 def file_to_xarray(filename: str) -> xr.DataArray:
     # Open the file with xarray
     return rxr.open_rasterio(filename)
-'''
 
 @with_list_input
 def xarray_to_gdal(data_array: xr.DataArray) -> gdal.Dataset:
@@ -144,4 +163,84 @@ def gdal_to_xarray(dataset: gdal.Dataset) -> xr.DataArray:
     # Optionally, delete the temporary file after opening it with GDAL
     os.remove(temp_file.name)
 
-    return data_array
\ No newline at end of file
+    return data_array
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# in memory adapters (no temporary files, no compression)
+@with_list_input
+def xarray_to_mem(data_array: xr.DataArray) -> gdal.Dataset:
+
+    # wrap a copy of the numpy buffer in a gdal dataset (the process may write into it, the source must not change)
+    data_values = np.array(data_array.values, copy=True, order='C')
+    gdal_dataset = gdal_array.OpenArray(data_values)
+    if gdal_dataset is None:
+        raise RuntimeError('Data array can not be wrapped in a gdal dataset.')
+
+    gdal_dataset.SetGeoTransform(data_array.rio.transform().to_gdal())
+    if data_array.rio.crs is not None:
+        gdal_dataset.SetProjection(data_array.rio.crs.to_wkt())
+
+    no_data = data_array.rio.nodata
+    if no_data is not None:
+        for band_id in range(gdal_dataset.RasterCount):
+            gdal_dataset.GetRasterBand(band_id + 1).SetNoDataValue(float(no_data))
+
+    return gdal_dataset
+
+
+@with_list_input
+def mem_to_xarray(dataset: gdal.Dataset) -> xr.DataArray:
+
+    # read the values directly from the dataset buffers
+    data_values = dataset.ReadAsArray()
+    if data_values.ndim == 2:
+        data_values = data_values[np.newaxis, :, :]
+    band_n, rows_n, cols_n = data_values.shape
+
+    geo_transform = dataset.GetGeoTransform()
+    x_coords = geo_transform[0] + (np.arange(cols_n) + 0.5) * geo_transform[1]
+    y_coords = geo_transform[3] + (np.arange(rows_n) + 0.5) * geo_transform[5]
+
+    data_array = xr.DataArray(
+        data_values, dims=['band', 'y', 'x'],
+        coords={'band': np.arange(1, band_n + 1), 'y': y_coords, 'x': x_coords})
+
+    projection = dataset.GetProjection()
+    if projection:
+        data_array = data_array.rio.write_crs(projection)
+    data_array = data_array.rio.write_transform(Affine.from_gdal(*geo_transform))
+
+    no_data = dataset.GetRasterBand(1).GetNoDataValue()
+    if no_data is not None:
+        data_array = data_array.rio.write_nodata(no_data)
+
+    return data_array
+
+
+@with_list_input
+def xarray_to_vsimem(data_array: xr.DataArray) -> str:
+
+    # write an uncompressed geotiff in the gdal memory filesystem
+    file_name = f'/vsimem/{uuid.uuid4().hex}.tif'
+    driver = gdal.GetDriverByName('GTiff')
+    gdal_dataset = driver.CreateCopy(file_name, xarray_to_mem(data_array))
+    gdal_dataset.FlushCache()
+    gdal_dataset = None
+
+    return file_name
+
+
+@with_list_input
+def vsimem_to_xarray(filename: str) -> xr.DataArray:
+
+    gdal_dataset = gdal.Open(filename)
+    data_array = mem_to_xarray(gdal_dataset)
+    gdal_dataset = None
+
+    # remove the file if it is in the gdal memory filesystem
+    if filename.startswith('/vsimem/'):
+        gdal.Unlink(filename)
+
+    return data_array
+# ----------------------------------------------------------------------------------------------------------------------
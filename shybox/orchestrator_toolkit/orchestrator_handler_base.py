@@ -15,23 +15,39 @@ Options = dict()
 from shybox.generic_toolkit.lib_utils_time import convert_time_format
 from shybox.orchestrator_toolkit.lib_orchestrator_utils import PROCESSES
 from shybox.orchestrator_toolkit.lib_orchestrator_process import ProcessorContainer
+from shybox.orchestrator_toolkit.lib_orchestrator_graph import ProcessorGraph
+from shybox.orchestrator_toolkit.lib_orchestrator_cache import ProcessorCache
+from shybox.orchestrator_toolkit.lib_orchestrator_stats import STATS_FIELDS, measure_phase, dump_stats
 
-from shybox.type_toolkit.io_dataset_grid import DataObj
+from shybox.type_toolkit.io_dataset_grid import DataObj, DataMem
+
+from shybox.generic_toolkit.lib_default_args import logger_name, logger_arrow
 
 import datetime as dt
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from typing import Optional
+import logging
 import tempfile
 import os
 import shutil
 import pandas as pd
 import xarray as xr
 
+# logging
+logger_stream = logging.getLogger(logger_name)
+
 class OrchestratorHandler:
 
     default_options = {
         'intermediate_output'   : 'Mem', # 'Mem' or 'Tmp'
         'break_on_missing_tiles': False,
-        'tmp_dir'               : None
+        'tmp_dir'               : None,
+        'run_mode'              : 'serial', # 'serial' or 'parallel'
+        'max_workers'           : None,
+        'graph_workers'         : None, # workers for the independent processes of a time step
+        'cache_dir'             : None, # folder of the process outputs cache (None to disable it)
+        'cache_size'            : 2 ** 30, # bytes
+        'stats_file'            : None # file (csv or json) to dump the process stats at the end of the run
     }
 
     def __init__(self,
@@ -42,9 +58,11 @@ class OrchestratorHandler:
         self.data_in = data_in
         self.data_out = data_out
         self.processes = []
-        self.break_points = []
+        self.graph = ProcessorGraph()
+        self.failed_steps = {}
+        self.stats = []
 
-        self.options = self.default_options
+        self.options = self.default_options.copy()
         if options is not None:
             self.options.update(options)
 
@@ -53,6 +71,10 @@ class OrchestratorHandler:
             os.makedirs(tmp_dir, exist_ok = True)
             self.tmp_dir = tempfile.mkdtemp(dir = tmp_dir)
 
+        self.cache = None
+        if self.options.get('cache_dir', None) is not None:
+            self.cache = ProcessorCache(self.options['cache_dir'], self.options.get('cache_size', 2 ** 30))
+
     @classmethod
     def from_options(cls, options: dict) -> 'Orchestrator':
 
@@ -86,7 +108,9 @@ class OrchestratorHandler:
         output_name = 'test'
         output_type = self.options['intermediate_output']
         if output_type == 'Mem':
-            out_obj = DataObj
+            # in memory outputs are passed directly to the downstream processes (the object identifies the output)
+            output_name = function.__name__ if function is not None else output_name
+            out_obj = DataMem(name=output_name, in_obj=in_obj)
         elif output_type == 'Tmp':
             filename = 'test' #os.path.basename(output_pattern)
             out_obj = DataObj(path=self.tmp_dir, filename=filename)
@@ -94,26 +118,54 @@ class OrchestratorHandler:
 
         return out_obj
 
-    def add_process(self, function, output: (DataObj, xr.Dataset, dict) = None, **kwargs) -> None:
-
-        if len(self.processes) == 0:
-            previous = None
-            this_input = self.data_in
+    def add_process(self, function, output: (DataObj, xr.Dataset, dict) = None,
+                    name: str = None, inputs: (str, dict) = None, **kwargs) -> None:
+        """
+        Add a process to the graph.
+        The inputs are declared by name as {argument name: process name} (a string is used for the "data"
+        argument); the name "data_in" refers to the input data of the orchestrator. If the inputs are not
+        declared, the process is linked to the previous one (linear chain). The arguments set to the output of
+        a previous process are linked to that process too.
+        """
+
+        this_name = name if name is not None else function.__name__
+        if name is None and this_name in self.graph:
+            this_name = f'{this_name}_{len(self.processes)}'
+
+        if inputs is None:
+            inputs = {'data': self.processes[-1].name} if len(self.processes) > 0 else {}
+        elif isinstance(inputs, str):
+            inputs = {'data': inputs}
+        else:
+            inputs = dict(inputs)
+
+        for arg_name, arg_value in list(kwargs.items()):
+            for process in self.processes:
+                if process.out_obj is not None and arg_value is process.out_obj:
+                    kwargs.pop(arg_name)
+                    inputs[arg_name] = process.name
+                    break
+
+        for arg_name, node_name in list(inputs.items()):
+            if node_name == 'data_in':
+                inputs.pop(arg_name)
+                if arg_name != 'data':
+                    kwargs[arg_name] = self.data_in
+
+        if 'data' in inputs:
+            this_input = self.graph.nodes[inputs['data']].output if inputs['data'] in self.graph else None
         else:
-            previous = self.processes[-1]
-            this_input = previous.output
+            this_input = self.data_in
 
         this_output = self.make_output(this_input, output, function)
         this_process = ProcessorContainer(
             function = function,
             in_obj = this_input, in_opts=self.options,
             args = kwargs,
-            out_obj = this_output, out_opts=self.options)
-
-
-        if this_process.break_point:
-            self.break_points.append(len(self.processes))
+            out_obj = this_output, out_opts=self.options,
+            name = this_name, cache = self.cache)
 
+        self.graph.add_node(this_name, this_process, inputs)
         self.processes.append(this_process)
 
     def run(self, time: (pd.Timestamp, str, pd.date_range), **kwargs) -> None:
@@ -135,44 +187,105 @@ class OrchestratorHandler:
         if len(time_steps) == 0:
             return None
 
-        for ts in time_steps:
-            self.run_single_ts(time=ts, **kwargs)
+        self.stats = []
+        run_mode = self.options.get('run_mode', 'serial')
+        if run_mode == 'serial':
+            for ts in time_steps:
+                self.run_single_ts(time=ts, **kwargs)
+        elif run_mode == 'parallel':
+            self.run_parallel_ts(time_steps, **kwargs)
+        else:
+            raise ValueError(f'Run mode {run_mode} not supported.')
+
+        stats_file = self.options.get('stats_file', None)
+        if stats_file is not None:
+            dump_stats(self.stats, stats_file)
+
         return None
-    
+
+    def get_stats(self) -> pd.DataFrame:
+        """
+        Get the stats of the processes (a row for each process, time step and phase).
+        """
+        return pd.DataFrame(self.stats, columns=STATS_FIELDS)
+
+    def run_parallel_ts(self, time_steps: pd.DatetimeIndex, **kwargs) -> dict:
+        """
+        Run the time steps in a process pool.
+        Each worker runs the whole graph for one time step, the outputs of the sink processes are sent back
+        and written here in time order. A failing time step is reported in self.failed_steps and does not
+        stop the other ones.
+        """
+
+        max_workers = self.options.get('max_workers', None)
+        self.failed_steps = {}
+        step_results, step_next = {}, 0
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            step_futures = {executor.submit(_run_ts_worker, self, ts, kwargs): step_id
+                            for step_id, ts in enumerate(time_steps)}
+            for step_future in as_completed(step_futures):
+                step_id = step_futures[step_future]
+                try:
+                    step_results[step_id] = step_future.result()
+                except Exception as exc:
+                    self._fail_step(time_steps[step_id], exc)
+                    step_results[step_id] = None
+
+                # write the outputs available in time order
+                while step_next in step_results:
+                    step_out = step_results.pop(step_next)
+                    if step_out is not None:
+                        step_out, step_stats = step_out
+                        self.stats.extend(step_stats)
+                        try:
+                            for out_name, out_step in step_out.items():
+                                self._write_output(self.graph.nodes[out_name], out_step,
+                                                   time_steps[step_next], stats=self.stats, **kwargs)
+                        except Exception as exc:
+                            self._fail_step(time_steps[step_next], exc)
+                    step_next += 1
+
+        # clean up the temporary directory
+        self.clean_up()
+
+        return self.failed_steps
+
+    def _fail_step(self, time: pd.Timestamp, exc: Exception) -> None:
+        logger_stream.warning(logger_arrow.warning + 'Time step "' + str(time) + '" failed: ' + repr(exc))
+        self.failed_steps[time] = repr(exc)
+
+    @staticmethod
+    def _write_output(process: ProcessorContainer, step_out: (tuple, list), time: pd.Timestamp,
+                      stats: list = None, **kwargs) -> None:
+        if isinstance(step_out, list):
+            for step_out_tmp in step_out:
+                OrchestratorHandler._write_output(process, step_out_tmp, time, stats=stats, **kwargs)
+        elif process.out_obj is not None and not isinstance(process.out_obj, DataMem):
+            fx_out, metadata = step_out
+            with measure_phase(stats, process.name, 'write_data', time):
+                process.out_obj.write_data(fx_out, time, metadata=metadata, **kwargs)
+
     def run_single_ts(self, time: (pd.Timestamp, str, pd.date_range), **kwargs) -> None:
-        
-        if isinstance(time, str):
-            time = convert_time_format(time, 'str_to_stamp')
 
-        if len(self.break_points) == 0:
-            self._run_processes(self.processes, time, **kwargs)
-        else:
-            # proceed in chunks: run until the breakpoint, then stop
-            i = 0
-            processes_to_run = []
-            while i < len(self.processes):
-                #collect all processes until the breakpoint
-                if i not in self.break_points:
-                    processes_to_run.append(self.processes[i])
-                else:
-                    # run the processes until the breakpoint
-                    self._run_processes(processes_to_run, time, **kwargs)
-                    # then run the breakpoint by itself
-                    self.processes[i].run(time, **kwargs)
-
-                    # reset the list of processes
-                    processes_to_run = []
-
-                i += 1
-            # run the remaining processes
-            self._run_processes(processes_to_run, time, **kwargs)
-        
+        self._run_chain(time, stats=self.stats, **kwargs)
+
         # clean up the temporary directory
         self.clean_up()
 
-    def _run_processes(self, processes, time: dt.datetime, **kwargs) -> None:
-        if len(processes) == 0:
-            return
+    def _run_chain(self, time: (pd.Timestamp, str, pd.date_range), write_output: bool = True,
+                   stats: list = None, **kwargs) -> dict:
 
-        for process in processes:
-            process.run(time, **kwargs)
\ No newline at end of file
+        if isinstance(time, str):
+            time = convert_time_format(time, 'str_to_stamp')
+
+        # if write_output is False, the outputs of the sink processes are returned instead of written
+        return self.graph.run(time, write_output=write_output,
+                              max_workers=self.options.get('graph_workers', None), stats=stats, **kwargs)
+
+# ----------------------------------------------------------------------------------------------------------------------
+# method to run a single time step in a worker process (defined at module level to be picklable)
+def _run_ts_worker(handler: OrchestratorHandler, time: pd.Timestamp, kwargs: dict):
+    step_stats = []
+    step_out = handler._run_chain(time, write_output=False, stats=step_stats, **kwargs)
+    return step_out, step_stats
+# ----------------------------------------------------------------------------------------------------------------------
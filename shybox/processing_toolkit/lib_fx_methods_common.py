@@ -22,6 +22,8 @@ from repurpose.resample import resample_to_grid
 
 from lib_utils_io import create_darray_2d
 
+from shybox.processing_toolkit.lib_proc_plan import get_resample_plan, get_regular_axis, REGULAR_METHODS
+
 # logging
 warnings.filterwarnings("ignore")
 
@@ -71,62 +73,100 @@ def resample_data(
         **kwargs):
 
     # define geographical information
-    if (geo_x_out.ndim == 1) and (geo_y_out.ndim == 1):
-        geo_x_grid_out, geo_y_grid_out = np.meshgrid(geo_x_out, geo_y_out)
-    elif (geo_x_out.ndim == 2) and (geo_y_out.ndim == 2):
-        geo_x_grid_out, geo_y_grid_out = deepcopy(geo_x_out), deepcopy(geo_y_out)
-    else:
-        logging.error(' ===> Geographical information format is not supported')
-        raise NotImplemented('Case not implemented yet')
+    def get_grid_out():
+        if (geo_x_out.ndim == 1) and (geo_y_out.ndim == 1):
+            geo_x_grid_out, geo_y_grid_out = np.meshgrid(geo_x_out, geo_y_out)
+        elif (geo_x_out.ndim == 2) and (geo_y_out.ndim == 2):
+            geo_x_grid_out, geo_y_grid_out = deepcopy(geo_x_out), deepcopy(geo_y_out)
+        else:
+            logging.error(' ===> Geographical information format is not supported')
+            raise NotImplementedError('Geographical information format is not supported (1d or 2d arrays)')
+
+        # check south-north array orientation
+        geo_y_upper_out, geo_y_lower_out = geo_y_grid_out[0, 0], geo_y_grid_out[-1, 0]
+        if geo_y_upper_out < geo_y_lower_out:
+            geo_y_grid_out = np.flipud(geo_y_grid_out)
 
-    # check south-north array orientation
-    geo_y_upper_out, geo_y_lower_out = geo_y_grid_out[0, 0], geo_y_grid_out[-1, 0]
-    if geo_y_upper_out < geo_y_lower_out:
-        geo_y_grid_out = np.flipud(geo_y_grid_out)
+        return geo_x_grid_out, geo_y_grid_out
 
-    geo_grid_out = GridDefinition(lons=geo_x_grid_out, lats=geo_y_grid_out)
+    # regular output grid (resampled by index arithmetic, without coordinates grids and trees)
+    geo_x_axis_out, geo_y_axis_out = get_regular_axis(geo_x_out, 1), get_regular_axis(geo_y_out, 0)
+    if geo_y_axis_out is not None and geo_y_axis_out[0] < geo_y_axis_out[-1]:
+        geo_y_axis_out = np.flipud(geo_y_axis_out)
+
+    geo_x_grid_out, geo_y_grid_out, geo_grid_out = None, None, None
+    regular_out = (geo_x_axis_out is not None) and (geo_y_axis_out is not None) and \
+        (resampling_method in REGULAR_METHODS)
+    if not regular_out:
+        geo_x_grid_out, geo_y_grid_out = get_grid_out()
+        geo_x_axis_out, geo_y_axis_out = geo_x_grid_out[0, :], geo_y_grid_out[:, 0]
+        geo_grid_out = GridDefinition(lons=geo_x_grid_out, lats=geo_y_grid_out)
 
     obj_out, mask_lon, mask_lat = {}, None, None
     for var_key, var_da_in in obj_in.items():
 
         values_grid_in = var_da_in.values
         geo_x_arr_in, geo_y_arr_in = var_da_in[var_name_geo_x].values, var_da_in[var_name_geo_y].values
-        geo_x_grid_in, geo_y_grid_in = np.meshgrid(geo_x_arr_in, geo_y_arr_in)
-
-        geo_y_upper_in, geo_y_lower_in = geo_y_grid_in[0, 0], geo_y_grid_in[-1, 0]
-        if geo_y_upper_in < geo_y_lower_in:
-            geo_y_grid_in = np.flipud(geo_y_grid_in)
-            values_grid_in = np.flipud(values_grid_in)
-
-        geo_grid_in = GridDefinition(lons=geo_x_grid_in, lats=geo_y_grid_in)
-
-        if resampling_method == 'nn':
-            values_masked = resample_nearest(
-                geo_grid_in, values_grid_in, geo_grid_out,
-                radius_of_influence=resampling_max_distance,
-                fill_value=resampling_fill_value)
-
-        elif resampling_method == 'gauss':
-            values_masked = resample_gauss(
-                geo_grid_in, values_grid_in, geo_grid_out,
-                radius_of_influence=resampling_max_distance, neighbours=resampling_neighbours, sigmas=250000,
-                fill_value=resampling_fill_value)
-
-        elif resampling_method == 'idw':
-            weight_fx = lambda r: 1 / r ** 2
-            values_masked = resample_custom(
-                geo_grid_in, values_grid_in, geo_grid_out,
-                radius_of_influence=resampling_max_distance, neighbours=resampling_neighbours,
-                weight_funcs=weight_fx,
-                fill_value=resampling_fill_value)
-        else:
-            logging.error(' ===> Resampling method "' + resampling_method + '" is not available')
-            raise NotImplemented('Case not implemented yet')
+        geo_x_grid_in, geo_y_grid_in = None, None
+
+        geo_x_axis_in, geo_y_axis_in = get_regular_axis(geo_x_arr_in, 1), get_regular_axis(geo_y_arr_in, 0)
+        if regular_out and (geo_x_axis_in is not None) and (geo_y_axis_in is not None):
+
+            if geo_y_axis_in[0] < geo_y_axis_in[-1]:
+                geo_y_axis_in, values_grid_in = np.flipud(geo_y_axis_in), np.flipud(values_grid_in)
+
+            resample_plan = get_resample_plan(
+                geo_x_axis_in, geo_y_axis_in, geo_x_axis_out, geo_y_axis_out,
+                method=resampling_method, max_distance=resampling_max_distance)
+            values_out_resampled = resample_plan.apply(values_grid_in, fill_value=resampling_fill_value)
 
-        if resampling_fill_value is None:
-            values_out_resampled = values_masked.data
         else:
-            values_out_resampled = deepcopy(values_masked)
+
+            if geo_grid_out is None:
+                geo_x_grid_out, geo_y_grid_out = get_grid_out()
+                geo_grid_out = GridDefinition(lons=geo_x_grid_out, lats=geo_y_grid_out)
+
+            geo_x_grid_in, geo_y_grid_in = np.meshgrid(geo_x_arr_in, geo_y_arr_in)
+
+            geo_y_upper_in, geo_y_lower_in = geo_y_grid_in[0, 0], geo_y_grid_in[-1, 0]
+            if geo_y_upper_in < geo_y_lower_in:
+                geo_y_grid_in = np.flipud(geo_y_grid_in)
+                values_grid_in = np.flipud(values_grid_in)
+
+            geo_grid_in = GridDefinition(lons=geo_x_grid_in, lats=geo_y_grid_in)
+
+            if resampling_method == 'nn':
+                values_masked = resample_nearest(
+                    geo_grid_in, values_grid_in, geo_grid_out,
+                    radius_of_influence=resampling_max_distance,
+                    fill_value=resampling_fill_value)
+
+            elif resampling_method == 'gauss':
+                values_masked = resample_gauss(
+                    geo_grid_in, values_grid_in, geo_grid_out,
+                    radius_of_influence=resampling_max_distance, neighbours=resampling_neighbours, sigmas=250000,
+                    fill_value=resampling_fill_value)
+
+            elif resampling_method == 'idw':
+                weight_fx = lambda r: 1 / r ** 2
+                values_masked = resample_custom(
+                    geo_grid_in, values_grid_in, geo_grid_out,
+                    radius_of_influence=resampling_max_distance, neighbours=resampling_neighbours,
+                    weight_funcs=weight_fx,
+                    fill_value=resampling_fill_value)
+            elif resampling_method in REGULAR_METHODS:
+                logging.error(' ===> Resampling method "' + resampling_method +
+                              '" is available only for regular input and output grids')
+                raise NotImplementedError('Resampling method "' + resampling_method +
+                                          '" is available only for regular grids (use "nn", "gauss" or "idw")')
+            else:
+                logging.error(' ===> Resampling method "' + resampling_method + '" is not available')
+                raise NotImplementedError('Resampling method "' + resampling_method + '" not implemented yet')
+
+            if resampling_fill_value is None:
+                values_out_resampled = values_masked.data
+            else:
+                values_out_resampled = deepcopy(values_masked)
 
         # check if all values are nan(s)
         flag_all_nans = np.all(np.isnan(values_out_resampled))
@@ -135,6 +175,10 @@ def resample_data(
         if not flag_all_nans:
             # condition extend data
             if resampling_extend_data:
+                if geo_x_grid_in is None:
+                    geo_x_grid_in, geo_y_grid_in = np.meshgrid(geo_x_axis_in, geo_y_axis_in)
+                if geo_x_grid_out is None:
+                    geo_x_grid_out, geo_y_grid_out = get_grid_out()
                 values_arr_tmp = values_grid_in.ravel()
                 nan_idx_tmp = np.argwhere(np.isnan(values_arr_tmp))[:, 0]
                 geo_x_arr_tmp, geo_y_arr_tmp = geo_x_grid_in.ravel(), geo_y_grid_in.ravel()
@@ -192,7 +236,7 @@ def resample_data(
         # method to create data array
         if values_out_finite:
             var_da_out = create_darray_2d(
-                values_grid_out, geo_x_grid_out[0, :], geo_y_grid_out[:, 0], name=var_key,
+                values_grid_out, geo_x_axis_out, geo_y_axis_out, name=var_key,
                 coord_name_x=coord_name_x, coord_name_y=coord_name_y,
                 dim_name_x=dim_name_x, dim_name_y=dim_name_y)
         else:
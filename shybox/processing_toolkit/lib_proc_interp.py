@@ -14,11 +14,10 @@ import xarray as xr
 
 from copy import deepcopy
 
-from pyresample.geometry import GridDefinition
-from pyresample.kd_tree import resample_nearest, resample_gauss, resample_custom#
 from repurpose.resample import resample_to_grid
 
 from shybox.io_toolkit.lib_io_utils import create_darray
+from shybox.processing_toolkit.lib_proc_plan import get_resample_plan
 from shybox.orchestrator_toolkit.lib_orchestrator_utils import as_process
 # ----------------------------------------------------------------------------------------------------------------------
 
@@ -30,85 +29,74 @@ def interpolate_data(data: (xr.DataArray, xr.Dataset), ref: xr.DataArray,
                      method='nn', max_distance=18000, neighbours=8, fill_value=np.nan,
                      var_name_geo_x='longitude', var_name_geo_y='latitude',
                      coord_name_x='longitude', coord_name_y='latitude', dim_name_x='longitude', dim_name_y='latitude',
-                     **kwargs) -> (xr.Dataset, xr.DataArray):
+                     plan_dir=None, **kwargs) -> (xr.Dataset, xr.DataArray):
 
     # get geo data
     data_x_arr = data[var_name_geo_x].values
     data_y_arr = data[var_name_geo_y].values
-    data_x_grid, data_y_grid = np.meshgrid(data_x_arr, data_y_arr)
 
     # get geo reference
     ref_x_arr = ref[var_name_geo_x].values
     ref_y_arr = ref[var_name_geo_y].values
     ref_x_grid, ref_y_grid = np.meshgrid(ref_x_arr, ref_y_arr)
 
-    geo_grid_data = GridDefinition(lons=data_x_grid, lats=data_y_grid)
-    geo_grid_ref = GridDefinition(lons=ref_x_grid, lats=ref_y_grid)
+    # get the resampling plan (neighbours and weights are computed once for the grids and the method)
+    resample_plan = get_resample_plan(
+        data_x_arr, data_y_arr, ref_x_arr, ref_y_arr,
+        method=method, max_distance=max_distance, neighbours=neighbours, plan_dir=plan_dir)
 
-    var_dict_in = {}
     if isinstance(data, xr.Dataset):
-        var_list = list(data.data_vars)
-        var_dict_in = {}
-        for var_name in var_list:
-            var_dict_in[var_name] = data[var_name].values
+        var_dict_in = {var_name: data[var_name] for var_name in list(data.data_vars)}
     elif isinstance(data, xr.DataArray):
-        var_dict_in = {'variable': data.values}
+        var_dict_in = {'variable': data}
     else:
         logging.error(' ===> Data format in interpolation method not allowed')
         raise NotImplementedError('Data format not allowed')
 
-    var_dict_out = {}
-    for var_key, var_data_in in var_dict_in.items():
-
-        if method == 'nn':
-            var_data_tmp = resample_nearest(
-                geo_grid_data, var_data_in, geo_grid_ref,
-                radius_of_influence=max_distance,
-                fill_value=fill_value)
-
-        elif method == 'gauss':
-            var_data_tmp = resample_gauss(
-                geo_grid_data, var_data_in, geo_grid_ref,
-                radius_of_influence=max_distance,
-                neighbours=neighbours, sigmas=250000,
-                fill_value=fill_value)
-
-        elif method == 'idw':
-            weight_fx = lambda r: 1 / r ** 2
-            var_data_tmp = resample_custom(
-                geo_grid_data, var_data_in, geo_grid_ref,
-                radius_of_influence=max_distance, neighbours=neighbours,
-                weight_funcs=weight_fx,
-                fill_value=fill_value)
-        else:
-            logging.error(' ===> Interpolating method "' + method + '" is not available')
-            raise NotImplemented('Interpolation method "' + method + '" not implemented yet')
-
-        if fill_value is None:
-            var_data_out = var_data_tmp.data
-        else:
-            var_data_out = deepcopy(var_data_tmp)
-
-        var_dict_out[var_key] = var_data_out
+    # stack all the variables (and their time slices) as (ny, nx, nvar*nt) and resample them in a single call
+    dim_x_in, dim_y_in = data[var_name_geo_x].dims[-1], data[var_name_geo_y].dims[0]
+    var_stack, var_info = [], {}
+    for var_key, var_da_in in var_dict_in.items():
+        var_dims_other = [var_dim for var_dim in var_da_in.dims if var_dim not in [dim_y_in, dim_x_in]]
+        var_data_in = var_da_in.transpose(dim_y_in, dim_x_in, *var_dims_other).values
+        var_stack.append(var_data_in.reshape(var_data_in.shape[0], var_data_in.shape[1], -1))
+        var_info[var_key] = (var_dims_other, var_data_in.shape[2:], var_stack[-1].shape[2])
 
-    if isinstance(data, xr.Dataset):
-        output = xr.Dataset()
-        for var_key, var_data in var_dict_out.items():
-            var_da = create_darray(
-                var_data, ref_x_grid[0, :], ref_y_grid[:, 0], name=var_key,
-                coord_name_x=coord_name_x, coord_name_y=coord_name_y,
-                dim_name_x=dim_name_x, dim_name_y=dim_name_y)
-            output[var_key] = var_da
+    var_stack_out = resample_plan.apply(np.concatenate(var_stack, axis=2), fill_value=fill_value)
 
-    elif isinstance(data, xr.DataArray):
-        output = create_darray(
-            var_dict_out['variable'], ref_x_grid[0, :], ref_y_grid[:, 0], name='variable',
+    # unstack the variables with their names, dimensions and attributes
+    var_dict_out, var_idx = {}, 0
+    for var_key, (var_dims_other, var_shape_other, var_n) in var_info.items():
+
+        var_da_in = var_dict_in[var_key]
+        var_data_out = var_stack_out[:, :, var_idx:var_idx + var_n].reshape(
+            var_stack_out.shape[:2] + tuple(var_shape_other))
+        var_idx += var_n
+
+        var_da_out = create_darray(
+            var_data_out, ref_x_grid[0, :], ref_y_grid[:, 0], name=var_key,
             coord_name_x=coord_name_x, coord_name_y=coord_name_y,
-            dim_name_x=dim_name_x, dim_name_y=dim_name_y)
+            dim_name_x=dim_name_x, dim_name_y=dim_name_y,
+            dims_order=[dim_name_y, dim_name_x] + var_dims_other)
+
+        if len(var_dims_other) > 0:
+            var_coords_other = {var_coord: var_da_in[var_coord] for var_coord in var_da_in.coords
+                                if set(var_da_in[var_coord].dims).issubset(var_dims_other)}
+            var_da_out = var_da_out.assign_coords(var_coords_other)
+            var_dims_out = [{dim_y_in: dim_name_y, dim_x_in: dim_name_x}.get(var_dim, var_dim)
+                            for var_dim in var_da_in.dims]
+            var_da_out = var_da_out.transpose(*var_dims_out)
 
+        var_da_out.attrs = deepcopy(var_da_in.attrs)
+        var_dict_out[var_key] = var_da_out
+
+    if isinstance(data, xr.Dataset):
+        output = xr.Dataset()
+        for var_key, var_da in var_dict_out.items():
+            output[var_key] = var_da
+        output.attrs = deepcopy(data.attrs)
     else:
-        logging.error(' ===> Data format in interpolation method not allowed')
-        raise NotImplementedError('Data format not allowed')
+        output = var_dict_out['variable']
 
     return output
 
@@ -0,0 +1,388 @@
+"""
+Library Features:
+
+Name:          lib_proc_plan
+Author(s):     Fabio Delogu (fabio.delogu@cimafoundation.org)
+Date:          '20261018'
+Version:       '1.0.0'
+"""
+# ----------------------------------------------------------------------------------------------------------------------
+# libraries
+import logging
+import hashlib
+import tempfile
+import threading
+import os
+import numpy as np
+
+from collections import OrderedDict
+
+from pyresample.geometry import GridDefinition
+from pyresample.kd_tree import get_neighbour_info
+
+from shybox.generic_toolkit.lib_default_args import logger_name, logger_arrow
+
+# logging
+logger_stream = logging.getLogger(logger_name)
+
+# plans cached in memory (the least recently used are removed), shared by the threads
+PLANS = OrderedDict()
+PLANS_SIZE = 8
+PLANS_LOCK = threading.Lock()
+
+# methods available for the regular grids (index arithmetic)
+REGULAR_METHODS = ['nn', 'linear', 'bilinear']
+# mean earth radius (m)
+EARTH_RADIUS = 6371000.0
+# ----------------------------------------------------------------------------------------------------------------------
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# class to apply a resampling plan (neighbour indices and weights computed once)
+class ResamplePlan:
+
+    """
+    Resampling plan between two grids. For each valid output cell, the plan stores the indices of the neighbours
+    in the flattened input grid (-1 if not available) and their weights; the plan is applied to the fields with
+    numpy gathers.
+    """
+
+    def __init__(self, index_in: np.ndarray, weights: np.ndarray, index_out: np.ndarray,
+                 shape_in: tuple, shape_out: tuple, method: str = 'nn') -> None:
+
+        self.index_in = np.asarray(index_in, dtype=np.int64).reshape(index_out.shape[0], -1)
+        self.weights = np.asarray(weights, dtype=np.float64).reshape(index_out.shape[0], -1)
+        self.index_out = np.asarray(index_out, dtype=np.int64)
+        self.shape_in = tuple(int(n) for n in shape_in)
+        self.shape_out = tuple(int(n) for n in shape_out)
+        self.method = method
+
+    def __repr__(self):
+        return f'ResamplePlan({self.method}, {self.shape_in} -> {self.shape_out})'
+
+    @property
+    def neighbours(self) -> int:
+        return self.index_in.shape[1]
+
+    # method to build the plan with the pyresample neighbours search
+    @classmethod
+    def from_grids(cls, geo_x_in: np.ndarray, geo_y_in: np.ndarray, geo_x_out: np.ndarray, geo_y_out: np.ndarray,
+                   method: str = 'nn', max_distance: float = 18000, neighbours: int = 8,
+                   sigma: float = 250000) -> 'ResamplePlan':
+
+        geo_x_grid_in, geo_y_grid_in = make_grid(geo_x_in, geo_y_in)
+        geo_x_grid_out, geo_y_grid_out = make_grid(geo_x_out, geo_y_out)
+
+        geo_grid_in = GridDefinition(lons=geo_x_grid_in, lats=geo_y_grid_in)
+        geo_grid_out = GridDefinition(lons=geo_x_grid_out, lats=geo_y_grid_out)
+
+        if method == 'nn':
+            neighbours = 1
+        elif method not in ['gauss', 'idw']:
+            logger_stream.error(logger_arrow.error + 'Interpolating method "' + method + '" is not available')
+            raise NotImplementedError('Interpolation method "' + method + '" not implemented yet')
+
+        valid_input_index, valid_output_index, index_array, distance_array = get_neighbour_info(
+            geo_grid_in, geo_grid_out, radius_of_influence=max_distance, neighbours=neighbours)
+
+        index_array = np.asarray(index_array).reshape(-1, neighbours)
+        distance_array = np.asarray(distance_array, dtype=np.float64).reshape(-1, neighbours)
+
+        # map the indices of the valid inputs to the indices of the flattened input grid
+        index_valid_in = np.flatnonzero(valid_input_index)
+        index_mask = index_array < index_valid_in.shape[0]
+        index_in = np.where(index_mask, index_valid_in[np.where(index_mask, index_array, 0)], -1)
+
+        if method == 'nn':
+            weights = index_mask.astype(np.float64)
+        elif method == 'gauss':
+            weights = np.where(index_mask, np.exp(-distance_array ** 2 / sigma ** 2), 0.0)
+        else:
+            weights = np.where(index_mask, 1.0 / np.maximum(distance_array, 1e-6) ** 2, 0.0)
+
+        return cls(index_in, weights, np.flatnonzero(valid_output_index),
+                   geo_x_grid_in.shape, geo_x_grid_out.shape, method=method)
+
+    # method to apply the plan to a field (ny, nx) or to a stack of fields (ny, nx, n)
+    def apply(self, values: np.ndarray, fill_value: float = np.nan) -> np.ndarray:
+
+        values = np.asarray(values)
+        if values.shape[:2] != self.shape_in:
+            logger_stream.error(logger_arrow.error + 'Field shape ' + str(values.shape[:2]) +
+                                ' is not compatible with the plan shape ' + str(self.shape_in))
+            raise ValueError('Field shape not compatible with the resampling plan')
+
+        values_stack = values.reshape(self.shape_in[0] * self.shape_in[1], -1)
+        if fill_value is None:
+            fill_value = np.nan
+
+        values_dtype = np.result_type(values_stack.dtype, np.float32)
+        values_out = np.full((self.shape_out[0] * self.shape_out[1], values_stack.shape[1]),
+                             fill_value, dtype=values_dtype)
+
+        if self.index_out.shape[0] > 0:
+            if self.neighbours == 1:
+                index_valid = self.index_in[:, 0] >= 0
+                values_out[self.index_out[index_valid]] = values_stack[self.index_in[index_valid, 0]]
+            else:
+                # the missing neighbours refer to an extra row with zero value (and zero weight)
+                values_ext = np.concatenate([values_stack, np.zeros((1, values_stack.shape[1]),
+                                                                    dtype=values_stack.dtype)], axis=0)
+                values_nb = values_ext[self.index_in]
+                weights_sum = self.weights.sum(axis=1)
+                index_valid = weights_sum > 0
+                values_sum = np.einsum('vk,vkn->vn', self.weights[index_valid], values_nb[index_valid])
+                values_out[self.index_out[index_valid]] = values_sum / weights_sum[index_valid, np.newaxis]
+
+        values_out = values_out.reshape(self.shape_out + values.shape[2:])
+
+        return values_out
+
+    # method to save the plan
+    def save(self, file_name: str) -> None:
+        folder_name = os.path.dirname(file_name)
+        if folder_name != '':
+            os.makedirs(folder_name, exist_ok=True)
+        # temporary file of the writer (the same plan can be saved by several threads)
+        file_handle, file_tmp = tempfile.mkstemp(dir=folder_name or '.', suffix='.tmp.npz')
+        os.close(file_handle)
+        try:
+            np.savez(file_tmp, index_in=self.index_in, weights=self.weights, index_out=self.index_out,
+                     shape_in=np.array(self.shape_in), shape_out=np.array(self.shape_out),
+                     method=np.array(self.method))
+            os.replace(file_tmp, file_name)
+        finally:
+            if os.path.exists(file_tmp):
+                os.remove(file_tmp)
+
+    # method to load the plan
+    @classmethod
+    def load(cls, file_name: str) -> 'ResamplePlan':
+        with np.load(file_name) as file_data:
+            return cls(file_data['index_in'], file_data['weights'], file_data['index_out'],
+                       tuple(file_data['shape_in']), tuple(file_data['shape_out']), method=str(file_data['method']))
+# ----------------------------------------------------------------------------------------------------------------------
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# class to apply a resampling plan between regular grids (separable indices and weights)
+class RegularResamplePlan(ResamplePlan):
+
+    """
+    Resampling plan between regular lat/lon grids. Rows and columns are resampled separately, the plan stores
+    the input rows/columns of each output row/column (nearest neighbour) or the two rows/columns with their
+    weights (bilinear); no coordinate grids or trees are built.
+    """
+
+    def __init__(self, index_y: np.ndarray, index_x: np.ndarray, weights_y: np.ndarray, weights_x: np.ndarray,
+                 valid: np.ndarray, shape_in: tuple, method: str = 'nn') -> None:
+
+        self.index_y, self.index_x = np.asarray(index_y, dtype=np.int64), np.asarray(index_x, dtype=np.int64)
+        self.weights_y, self.weights_x = np.asarray(weights_y, dtype=np.float64), np.asarray(weights_x, dtype=np.float64)
+        self.valid = np.asarray(valid, dtype=bool)
+        self.shape_in = tuple(int(n) for n in shape_in)
+        self.shape_out = self.valid.shape
+        self.method = method
+
+    @property
+    def neighbours(self) -> int:
+        return self.index_y.shape[1] * self.index_x.shape[1]
+
+    # method to build the plan with the index arithmetic
+    @classmethod
+    def from_axes(cls, geo_x_in: np.ndarray, geo_y_in: np.ndarray, geo_x_out: np.ndarray, geo_y_out: np.ndarray,
+                  method: str = 'nn', max_distance: float = 18000) -> 'RegularResamplePlan':
+
+        # fractional position of the output coordinates in the input grid
+        n_x, n_y = geo_x_in.shape[0], geo_y_in.shape[0]
+        pos_x = (geo_x_out - geo_x_in[0]) / ((geo_x_in[-1] - geo_x_in[0]) / (n_x - 1))
+        pos_y = (geo_y_out - geo_y_in[0]) / ((geo_y_in[-1] - geo_y_in[0]) / (n_y - 1))
+
+        if method == 'nn':
+            index_x = np.clip(np.rint(pos_x), 0, n_x - 1).astype(np.int64)
+            index_y = np.clip(np.rint(pos_y), 0, n_y - 1).astype(np.int64)
+
+            # distance (m) between the output cells and the nearest input cells
+            dist_x = np.deg2rad(np.abs(geo_x_out - geo_x_in[index_x])) * EARTH_RADIUS
+            dist_y = np.deg2rad(np.abs(geo_y_out - geo_y_in[index_y])) * EARTH_RADIUS
+            cos_y = np.cos(np.deg2rad(geo_y_out))
+            valid = ((dist_x[np.newaxis, :] * cos_y[:, np.newaxis]) ** 2 + dist_y[:, np.newaxis] ** 2
+                     ) <= max_distance ** 2
+
+            return cls(index_y[:, np.newaxis], index_x[:, np.newaxis],
+                       np.ones((index_y.shape[0], 1)), np.ones((index_x.shape[0], 1)),
+                       valid, (n_y, n_x), method=method)
+
+        elif method in ['linear', 'bilinear']:
+            index_x, weights_x, valid_x = get_linear_weights(pos_x, n_x)
+            index_y, weights_y, valid_y = get_linear_weights(pos_y, n_y)
+            valid = valid_y[:, np.newaxis] & valid_x[np.newaxis, :]
+
+            return cls(index_y, index_x, weights_y, weights_x, valid, (n_y, n_x), method='linear')
+
+        else:
+            logger_stream.error(logger_arrow.error + 'Interpolating method "' + method +
+                                '" is not available for regular grids')
+            raise NotImplementedError('Interpolation method "' + method + '" not implemented yet')
+
+    # method to apply the plan to a field (ny, nx) or to a stack of fields (ny, nx, n)
+    def apply(self, values: np.ndarray, fill_value: float = np.nan) -> np.ndarray:
+
+        values = np.asarray(values)
+        if values.shape[:2] != self.shape_in:
+            logger_stream.error(logger_arrow.error + 'Field shape ' + str(values.shape[:2]) +
+                                ' is not compatible with the plan shape ' + str(self.shape_in))
+            raise ValueError('Field shape not compatible with the resampling plan')
+        if fill_value is None:
+            fill_value = np.nan
+
+        values_dtype = np.result_type(values.dtype, np.float32)
+        if self.method == 'nn':
+            values_out = values[self.index_y[:, 0]][:, self.index_x[:, 0]].astype(values_dtype)
+        else:
+            # separable weights: rows first, then columns
+            weights_y = self.weights_y.reshape(self.weights_y.shape + (1,) * (values.ndim - 1))
+            values_rows = (values[self.index_y[:, 0]] * weights_y[:, 0] +
+                           values[self.index_y[:, 1]] * weights_y[:, 1]).astype(values_dtype)
+            weights_x = self.weights_x.reshape((1,) + self.weights_x.shape + (1,) * (values.ndim - 2))
+            values_out = (values_rows[:, self.index_x[:, 0]] * weights_x[:, :, 0] +
+                          values_rows[:, self.index_x[:, 1]] * weights_x[:, :, 1])
+
+        values_out[~self.valid] = fill_value
+
+        return values_out
+
+    # the regular plans are cheap to compute and they are not saved
+    def save(self, file_name: str) -> None:
+        raise NotImplementedError('Regular plans are not saved')
+# ----------------------------------------------------------------------------------------------------------------------
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# method to get the indices and the weights of the linear interpolation along an axis
+def get_linear_weights(pos: np.ndarray, n: int) -> (np.ndarray, np.ndarray, np.ndarray):
+
+    # positions up to half a cell outside the grid take the values of the border cells
+    valid = (pos >= -0.5) & (pos <= n - 0.5)
+    pos = np.clip(pos, 0, n - 1)
+
+    index_0 = np.clip(np.floor(pos), 0, max(n - 2, 0)).astype(np.int64)
+    weight_1 = pos - index_0
+    index_1 = np.minimum(index_0 + 1, n - 1)
+
+    # neighbours with zero weight refer to the same cell (to avoid the propagation of nan values)
+    index_1 = np.where(weight_1 > 0, index_1, index_0)
+    index_0 = np.where(weight_1 < 1, index_0, index_1)
+
+    return (np.stack([index_0, index_1], axis=1), np.stack([1 - weight_1, weight_1], axis=1), valid)
+# ----------------------------------------------------------------------------------------------------------------------
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# method to get the 1d axis of a regular grid (None if the grid is not regular)
+def get_regular_axis(geo_arr: np.ndarray, axis: int, rtol: float = 1e-5) -> (np.ndarray, None):
+
+    geo_arr = np.asarray(geo_arr, dtype=np.float64)
+    if geo_arr.ndim == 2:
+        # the coordinates must be constant along the other axis
+        geo_1d = geo_arr[0, :] if axis == 1 else geo_arr[:, 0]
+        geo_2d = geo_1d[np.newaxis, :] if axis == 1 else geo_1d[:, np.newaxis]
+        if not np.allclose(geo_arr, geo_2d, rtol=0, atol=rtol * max(np.abs(geo_1d).max(), 1.0)):
+            return None
+        geo_arr = geo_1d
+    elif geo_arr.ndim != 1:
+        return None
+
+    if geo_arr.shape[0] < 2:
+        return None
+    geo_step = np.diff(geo_arr)
+    if geo_step[0] == 0 or not np.allclose(geo_step, geo_step[0], rtol=rtol, atol=0):
+        return None
+
+    return geo_arr
+# ----------------------------------------------------------------------------------------------------------------------
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# method to make the 2d grids of the coordinates
+def make_grid(geo_x: np.ndarray, geo_y: np.ndarray) -> (np.ndarray, np.ndarray):
+    geo_x, geo_y = np.asarray(geo_x), np.asarray(geo_y)
+    if (geo_x.ndim == 1) and (geo_y.ndim == 1):
+        geo_x_grid, geo_y_grid = np.meshgrid(geo_x, geo_y)
+    elif (geo_x.ndim == 2) and (geo_y.ndim == 2):
+        geo_x_grid, geo_y_grid = geo_x, geo_y
+    else:
+        logger_stream.error(logger_arrow.error + 'Geographical information format is not supported')
+        raise NotImplementedError('Case not implemented yet')
+    return geo_x_grid, geo_y_grid
+# ----------------------------------------------------------------------------------------------------------------------
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# method to get the signature of a plan
+def get_plan_key(geo_x_in: np.ndarray, geo_y_in: np.ndarray, geo_x_out: np.ndarray, geo_y_out: np.ndarray,
+                 method: str = 'nn', max_distance: float = 18000, neighbours: int = 8) -> str:
+
+    plan_hash = hashlib.sha256()
+    for geo_arr in [geo_x_in, geo_y_in, geo_x_out, geo_y_out]:
+        geo_arr = np.ascontiguousarray(geo_arr, dtype=np.float64)
+        plan_hash.update(str(geo_arr.shape).encode())
+        plan_hash.update(geo_arr.tobytes())
+    plan_hash.update(f'{method}|{max_distance}|{neighbours}'.encode())
+
+    return plan_hash.hexdigest()
+# ----------------------------------------------------------------------------------------------------------------------
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# method to get a plan (from memory, from disk or computed)
+def get_resample_plan(geo_x_in: np.ndarray, geo_y_in: np.ndarray, geo_x_out: np.ndarray, geo_y_out: np.ndarray,
+                      method: str = 'nn', max_distance: float = 18000, neighbours: int = 8,
+                      plan_dir: str = None) -> ResamplePlan:
+
+    plan_key = get_plan_key(geo_x_in, geo_y_in, geo_x_out, geo_y_out,
+                            method=method, max_distance=max_distance, neighbours=neighbours)
+
+    with PLANS_LOCK:
+        if plan_key in PLANS:
+            PLANS.move_to_end(plan_key)
+            return PLANS[plan_key]
+
+    # the plan is computed outside of the lock (the threads do not wait for the plans of the other grids)
+
+    # regular grids use the index arithmetic (no trees)
+    plan_obj, plan_file = None, None
+    if method in REGULAR_METHODS:
+        geo_axes = [get_regular_axis(geo_x_in, 1), get_regular_axis(geo_y_in, 0),
+                    get_regular_axis(geo_x_out, 1), get_regular_axis(geo_y_out, 0)]
+        if all([geo_axis is not None for geo_axis in geo_axes]):
+            plan_obj = RegularResamplePlan.from_axes(*geo_axes, method=method, max_distance=max_distance)
+        elif method != 'nn':
+            logger_stream.error(logger_arrow.error + 'Interpolating method "' + method +
+                                '" is available only for regular grids')
+            raise NotImplementedError('Interpolation method "' + method + '" not implemented yet')
+
+    if plan_obj is None and plan_dir is not None:
+        plan_file = os.path.join(plan_dir, 'plan_' + plan_key + '.npz')
+        if os.path.exists(plan_file):
+            try:
+                plan_obj = ResamplePlan.load(plan_file)
+            except Exception as exc:
+                logger_stream.warning(logger_arrow.warning + 'Plan file "' + plan_file +
+                                      '" not readable: ' + repr(exc))
+
+    if plan_obj is None:
+        plan_obj = ResamplePlan.from_grids(geo_x_in, geo_y_in, geo_x_out, geo_y_out,
+                                           method=method, max_distance=max_distance, neighbours=neighbours)
+        if plan_file is not None:
+            plan_obj.save(plan_file)
+
+    with PLANS_LOCK:
+        # the plan computed first by another thread is kept
+        plan_obj = PLANS.setdefault(plan_key, plan_obj)
+        PLANS.move_to_end(plan_key)
+        while len(PLANS) > PLANS_SIZE:
+            PLANS.popitem(last=False)
+
+    return plan_obj
+# ----------------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,89 @@
+import sys
+import threading
+
+from collections import OrderedDict
+from typing import Optional
+
+class DataCache:
+    """
+    Bounded LRU cache of the data read by the datasets, keyed by (path, tile, dataset token, file signature).
+    The least recently used entries are dropped when the size of the stored data exceeds max_bytes.
+    Lazy (dask) data are not stored.
+    """
+
+    def __init__(self, max_bytes: int = 2 ** 28):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"DataCache({len(self)} entries, {self.nbytes}/{self.max_bytes} bytes, {self.hits} hits, {self.misses} misses)"
+
+    def __getstate__(self):
+        # the entries and the lock are not shared with other processes
+        return {'max_bytes': self.max_bytes}
+
+    def __setstate__(self, state):
+        self.__init__(state['max_bytes'])
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key: tuple):
+        return key in self._entries
+
+    @staticmethod
+    def is_lazy(data) -> bool:
+        # chunks are None (DataArray) or empty (Dataset) for the data in memory
+        data_chunks = getattr(data, 'chunks', None)
+        return data_chunks is not None and len(data_chunks) > 0
+
+    @staticmethod
+    def get_nbytes(data) -> int:
+        if hasattr(data, 'nbytes'):
+            return int(data.nbytes)
+        return sys.getsizeof(data)
+
+    def get(self, key: tuple):
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key][0]
+
+    def set(self, key: tuple, data) -> None:
+        if self.is_lazy(data):
+            return
+        data_bytes = self.get_nbytes(data)
+        with self._lock:
+            if key in self._entries:
+                self.nbytes -= self._entries.pop(key)[1]
+            # data larger than the cache are not stored
+            if data_bytes > self.max_bytes:
+                return
+            self._entries[key] = (data, data_bytes)
+            self.nbytes += data_bytes
+            while self.nbytes > self.max_bytes:
+                _, (_, old_bytes) = self._entries.popitem(last=False)
+                self.nbytes -= old_bytes
+
+    def invalidate(self, path: Optional[str] = None) -> None:
+        """
+        Drop the entries of a path (all the entries if path is None).
+        """
+        with self._lock:
+            for key in [key for key in self._entries if path is None or key[0] == path]:
+                self.nbytes -= self._entries.pop(key)[1]
+
+    def get_stats(self) -> dict:
+        return {'entries': len(self), 'nbytes': self.nbytes, 'max_bytes': self.max_bytes,
+                'hits': self.hits, 'misses': self.misses}
+
+# default cache shared by the datasets
+data_cache = DataCache()
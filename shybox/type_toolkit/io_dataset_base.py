@@ -7,10 +7,16 @@ import xarray as xr
 from abc import ABC, ABCMeta, abstractmethod
 import os
 import re
+import threading
+import uuid
+
+from collections import OrderedDict
 
 from shybox.default.lib_default_geo import crs_wkt as default_crs_wkt
 
-from shybox.type_toolkit.parse_utils import substitute_string, extract_date_and_tags
+from shybox.type_toolkit.parse_utils import substitute_string, PathPattern
+from shybox.type_toolkit.io_inventory import FileInventory
+from shybox.type_toolkit.io_data_cache import DataCache, data_cache
 from shybox.type_toolkit.io_utils import (get_format_from_path, map_dims, flat_dims,
                                           straighten_data, set_type, check_data_format)
 
@@ -29,6 +35,16 @@ def with_cases(func):
             return func(*args, **kwargs)
     return wrapper
 
+# coordinates skeletons of the templates (shared by all the datasets, keyed by template signature)
+TEMPLATES = OrderedDict()
+TEMPLATES_SIZE = 32
+TEMPLATES_LOCK = threading.Lock()
+
+def time_in_range(time: dt.datetime, time_range) -> bool:
+    if isinstance(time_range, pd.DatetimeIndex):
+        return time_range.min() <= time <= time_range.max()
+    return time_range.contains(time)
+
 class DatasetMeta(ABCMeta):
     def __init__(cls, name, bases, attrs):
         super().__init__(name, bases, attrs)
@@ -79,7 +95,11 @@ class Dataset(ABC, metaclass=DatasetMeta):
         self.options = kwargs
         self.tags = {}
 
-        self.data_store = None
+        # lru cache of the data read (shared by the datasets, or of the dataset if data_cache_size is set in bytes,
+        # 0 to disable); the entries of the dataset are tagged by its token
+        data_cache_size = kwargs.get('data_cache_size', None)
+        self._data_cache = DataCache(data_cache_size) if data_cache_size is not None else None
+        self._data_cache_token = uuid.uuid4().hex
 
     def __repr__(self):
         return f"{self.__class__.__name__}({self.file_name}, {self.file_mode})"
@@ -160,6 +180,10 @@ class Dataset(ABC, metaclass=DatasetMeta):
     def file_mode(self, value):
         self._mode = value
 
+    @property
+    def data_cache(self) -> DataCache:
+        return self._data_cache if self._data_cache is not None else data_cache
+
     @property
     def has_version(self):
         return '{file_version}' in self.loc_pattern
@@ -207,29 +231,61 @@ class Dataset(ABC, metaclass=DatasetMeta):
     def available_keys(self):
         return self.get_available_keys()
     
-    def get_available_keys(self, time: (dt.datetime,xr.date_range) = None, **kwargs):
-        
+    def get_available_keys(self, time: (dt.datetime,pd.DatetimeIndex) = None, **kwargs):
+        return [key for key, _, _ in self.get_available_entries(time, **kwargs)]
+
+    def get_available_entries(self, time: (dt.datetime,pd.DatetimeIndex) = None, **kwargs) -> list[tuple]:
+        """
+        Get the (key, time, tags) of the available files; tags are None if not parsed yet.
+        """
         prefix = self.get_prefix(time, **kwargs)
         if not self._check_data(prefix):
             return []
         if isinstance(time, dt.datetime):
-            time = xr.date_range(time, time)
+            time = pd.DatetimeIndex([time])
 
         loc_pattern = self.get_key(time = None, **kwargs)
-        files = []
+
+        inventory = self.inventory
+        if inventory is not None:
+            inventory.refresh(loc_pattern, prefix, lambda key: self._parse_key(key, loc_pattern))
+            if time is not None and self.has_time:
+                return inventory.query(loc_pattern, prefix, start = time.min(), end = time.max())
+            return inventory.query(loc_pattern, prefix)
+
+        entries, loc_parser = [], PathPattern.get(loc_pattern)
         for file in self._walk(prefix):
             try:
-                this_time, _ = extract_date_and_tags(file, loc_pattern)
-                if time is None or (time is not None and time.contains(this_time)) or not self.has_time:
-                    files.append(file)
+                this_time, _ = loc_parser.parse(file)
+                if time is None or (time is not None and time_in_range(this_time, time)) or not self.has_time:
+                    entries.append((file, this_time, None))
             except ValueError:
                 pass
         
-        return files
+        return entries
+
+    def _parse_key(self, key: str, loc_pattern: str) -> tuple:
+        this_time, _ = PathPattern.get(loc_pattern).parse(key)
+        _, this_tags = self.path_pattern.parse(key)
+        return this_time, this_tags
 
     def _walk(self, prefix: str) -> Generator[str, None, None]:
         raise NotImplementedError
 
+    ## INVENTORY MANAGEMENT
+    @property
+    def inventory(self) -> Optional[FileInventory]:
+        """
+        Inventory of the available files (None if the dataset does not support it or it is disabled).
+        """
+        if not getattr(self, 'use_inventory', False):
+            return None
+
+        root = self.get_prefix()
+        if getattr(self, '_inventory', None) is None or self._inventory.root != os.path.abspath(root):
+            self._inventory = FileInventory(root, self.inventory_dir)
+        return self._inventory
+
     @property
     def is_static(self):
         return not '{' in self.loc_pattern and not self.has_time
@@ -242,12 +298,12 @@ class Dataset(ABC, metaclass=DatasetMeta):
     def available_tags(self):
         return self.get_available_tags()
 
-    def get_prefix(self, time: (dt.datetime, pd.date_range) = None, **kwargs):
-        if not isinstance(time, pd.date_range):
+    def get_prefix(self, time: (dt.datetime, pd.DatetimeIndex) = None, **kwargs):
+        if not isinstance(time, pd.DatetimeIndex):
             prefix = self.get_key(time = time, **kwargs)
         else:
-            start = time.start
-            end = time.end
+            start = time.min()
+            end = time.max()
             prefix = self.get_key(time = None, **kwargs)
             if start.year == end.year:
                 prefix = prefix.replace('%Y', str(start.year))
@@ -262,12 +318,13 @@ class Dataset(ABC, metaclass=DatasetMeta):
         
         return prefix
 
-    def get_available_tags(self, time: (dt.datetime, pd.date_range) = None, **kwargs):
-        all_keys = self.get_available_keys(time, **kwargs)
+    def get_available_tags(self, time: (dt.datetime, pd.DatetimeIndex) = None, **kwargs):
+        all_entries = self.get_available_entries(time, **kwargs)
         all_tags = {}
         all_dates = set()
-        for key in all_keys:
-            this_date, this_tags = extract_date_and_tags(key, self.loc_pattern)
+        for key, this_date, this_tags in all_entries:
+            if this_tags is None:
+                this_date, this_tags = self.path_pattern.parse(key)
             
             for tag in this_tags:
                 if tag not in all_tags:
@@ -280,24 +337,57 @@ class Dataset(ABC, metaclass=DatasetMeta):
 
         return all_tags
 
+    def get_sorted_times(self, start: dt.datetime = None, end: dt.datetime = None,
+                         n: int = None, rev: bool = False, **kwargs) -> list[dt.datetime]:
+        """
+        Get the sorted available times between start and end (the latest first if rev), at most n.
+        The times are taken from a single query of the inventory (or a single scan of the files).
+        """
+        inventory = self.inventory
+        if inventory is not None:
+            prefix = self.get_prefix(None, **kwargs)
+            if not self._check_data(prefix):
+                all_times = []
+            else:
+                loc_pattern = self.get_key(time = None, **kwargs)
+                inventory.refresh(loc_pattern, prefix, lambda key: self._parse_key(key, loc_pattern))
+                all_times = inventory.query_times(loc_pattern, prefix, start = start, end = end,
+                                                  n = n if not hasattr(self, 'parents') else None, rev = rev)
+        else:
+            all_times = {this_time for _, this_time, _ in self.get_available_entries(None, **kwargs)
+                         if (start is None or this_time >= start) and (end is None or this_time <= end)}
+            all_times = sorted(all_times, reverse = rev)
+
+        if hasattr(self, 'parents') and self.parents is not None:
+            parent_times = [set(parent.get_sorted_times(start, end, **kwargs)) for parent in self.parents.values()]
+            all_times = sorted(set(all_times).union(set.intersection(*parent_times)), reverse = rev)
+
+        return all_times[:n] if n is not None else all_times
+
+    def get_time_bounds(self, tag: str = None, **kwargs) -> (tuple, dict):
+        """
+        Get the (first, last) available times, or a dict {tag value: (first, last)} if tag is given.
+        """
+        if tag is None:
+            all_times = self.get_sorted_times(**kwargs)
+            return (all_times[0], all_times[-1]) if len(all_times) > 0 else (None, None)
+
+        time_bounds = {}
+        for key, this_time, this_tags in self.get_available_entries(None, **kwargs):
+            if this_tags is None:
+                _, this_tags = self.path_pattern.parse(key)
+            if tag not in this_tags:
+                continue
+            first, last = time_bounds.get(this_tags[tag], (this_time, this_time))
+            time_bounds[this_tags[tag]] = (min(first, this_time), max(last, this_time))
+        return time_bounds
+
     def get_last_date(self, now = None, n = 1, **kwargs) -> (dt.datetime, list[dt.datetime], None):
         if now is None:
             now = dt.datetime.now()
-        
-        # the most efficient way, I think is to search my month
-        this_month = Month(now.year, now.month)
-        last_date = []
-        while len(last_date) < n:
-            this_month_times = self.get_times(this_month, **kwargs)
-            if len(this_month_times) > 0:
-                valid_time = [t for t in this_month_times if t <= now]
-                valid_time.sort(reverse = True)
-                last_date.extend(valid_time)
-            elif this_month.start.year < 1900:
-                break
-
-            this_month = this_month - 1
-            
+
+        last_date = self.get_sorted_times(end = now, n = n, rev = True, **kwargs)
+
         if len(last_date) == 0:
             return None
         if n == 1:
@@ -329,39 +419,7 @@ class Dataset(ABC, metaclass=DatasetMeta):
         if start is None:
             start = dt.datetime(1900, 1, 1)
 
-        end = self.get_last_date(**kwargs)
-        if end is None:
-            return None
-        
-        start_month = Month(start.year, start.month)
-        end_month   = Month(end.year, end.month)
-
-        # first look for a suitable time to start the search
-        while True:
-            midpoint = start_month.start + (end_month.end - start_month.start) / 2
-            mid_month = Month(midpoint.year, midpoint.month)
-            mid_month_times = self.get_times(mid_month, **kwargs)
-            # if we do actually find some times in the month
-            if len(mid_month_times) > 0:
-
-                    # end goes to midpoint
-                    end_month = mid_month
-            # if we didn't find any times in the month 
-            else:
-                # we start from the midpoint this time
-                start_month = mid_month
-
-            if start_month + 1 == end_month:
-                break
-        
-        first_date = []
-        while len(first_date) < n and start_month.end <= end:
-            this_month_times = self.get_times(start_month, **kwargs)
-            valid_time = [t for t in this_month_times if t >= start]
-            valid_time.sort()
-            first_date.extend(valid_time)
-
-            start_month = start_month + 1
+        first_date = self.get_sorted_times(start = start, n = n, **kwargs)
 
         if len(first_date) == 0:
             return None
@@ -398,7 +456,7 @@ class Dataset(ABC, metaclass=DatasetMeta):
     def is_subdataset(self, other: 'Dataset') -> bool:
         key = self.get_key(time = dt.datetime(1900,1,1))
         try:
-            extract_date_and_tags(key, other.loc_pattern)
+            other.path_pattern.parse(key)
             return True
         except ValueError:
             return False
@@ -439,7 +497,7 @@ class Dataset(ABC, metaclass=DatasetMeta):
             length = timestep.get_length()
             self.previous_requested_time = time
 
-        key_without_tags = re.sub(r'\{[^}]*\}', '', self.key_pattern)
+        key_without_tags = re.sub(r'\{[^}]*\}', '', self.loc_pattern)
         hasyear = '%Y' in key_without_tags
 
         # change the date to 28th of February if it is the 29th of February,
@@ -486,28 +544,29 @@ class Dataset(ABC, metaclass=DatasetMeta):
 
                 return data
             
-        if self.check_data(time, **kwargs):
-
-            if self.data_store is None:
-
-                data = self._read_data(full_key)
+        # the times of the same file share the entry (the entry of a file changed by other processes is not used)
+        cache_key = (full_key, kwargs.get('tile'), self._data_cache_token, self.get_data_signature(full_key))
+        if not as_is:
+            data = self.data_cache.get(cache_key)
+            if data is not None:
+                return data.copy()
 
-                if as_is:
-                    return data
-
-                # map the data to the template
-                data = map_dims(data, **self.file_template)
-                # ensure that the data has descending latitudes
-                data = straighten_data(data)
-                # ensure that the data dimensions are flat
-                data = flat_dims(data)
+        if self.check_data(time, **kwargs):
 
-                # make sure the nodata value is set to np.nan for floats and to the max int for integers
-                data = set_type(data, self.nan_value)
+            data = self._read_data(full_key)
 
-                self.data_store = data
+            if as_is:
+                return data
 
+            # map the data to the template
+            data = map_dims(data, **self.file_template)
+            # ensure that the data has descending latitudes
+            data = straighten_data(data)
+            # ensure that the data dimensions are flat
+            data = flat_dims(data)
 
+            # make sure the nodata value is set to np.nan for floats and to the max int for integers
+            data = set_type(data, self.nan_value)
 
         else:
             raise ValueError(f'Could not resolve data from {full_key}.')
@@ -525,8 +584,22 @@ class Dataset(ABC, metaclass=DatasetMeta):
             data.attrs.update(attrs)
         
         data.attrs.update({'source_key': full_key})
+
+        # store a copy (the returned data can be modified by the caller), lazy data are not stored
+        if not DataCache.is_lazy(data):
+            self.data_cache.set(cache_key, data.copy())
         return data
     
+    @staticmethod
+    def get_data_signature(key: str) -> Optional[tuple]:
+        """
+        Get the modification time and size of a local file (None for the other keys).
+        """
+        if not os.path.isfile(key):
+            return None
+        file_stat = os.stat(key)
+        return file_stat.st_mtime_ns, file_stat.st_size
+
     @abstractmethod
     def _read_data(self, input_key:str):
         raise NotImplementedError
@@ -537,16 +610,17 @@ class Dataset(ABC, metaclass=DatasetMeta):
                    metadata = {},
                    **kwargs):
         
-        check_data_format(data, self.format)
+        check_data_format(data, self.file_format)
 
         output_file = self.get_key(time, **kwargs)
+        self.data_cache.invalidate(output_file)
 
-        if self.format in ['csv', 'json', 'txt', 'shp']:
+        if self.file_format in ['csv', 'json', 'txt', 'shp']:
             append = kwargs.pop('append', False)
             self._write_data(data, output_file, append = append)
             return
         
-        if self.format == 'file':
+        if self.file_format == 'file':
             self._write_data(data, output_file)
             return
         
@@ -582,8 +656,8 @@ class Dataset(ABC, metaclass=DatasetMeta):
         old_attrs.update(new_attrs)
         output.attrs = old_attrs
         
-        name = substitute_string(self.name, kwargs)
-        metadata['name'] = name
+        if getattr(self, 'name', None) is not None:
+            metadata['name'] = substitute_string(self.name, kwargs)
         output = self.set_metadata(output, time, time_format, **metadata)
         # write the data
         self._write_data(output, output_file)
@@ -592,14 +666,13 @@ class Dataset(ABC, metaclass=DatasetMeta):
     def copy_data(self, new_loc_pattern, time: Union[dt.datetime, pd.Timestamp] = None, **kwargs):
         data = self.get_data(time, **kwargs)
         timestamp = self.get_time_signature(time)
-        if timestamp is None:
-            new_key = substitute_string(new_loc_pattern, kwargs)
-        else:
-            new_key = timestamp.strftime(substitute_string(new_loc_pattern, kwargs))
+        new_key = PathPattern.get(new_loc_pattern).format(timestamp, **kwargs)
+        self.data_cache.invalidate(new_key)
         self._write_data(data, new_key)
 
     def rm_data(self, time: Union[dt.datetime, pd.Timestamp] = None, **kwargs):
         key = self.get_key(time, **kwargs)
+        self.data_cache.invalidate(key)
         self._rm_data(key)
 
     def move_data(self, new_loc_pattern, time: Union[dt.datetime, pd.Timestamp] = None, **kwargs):
@@ -624,11 +697,11 @@ class Dataset(ABC, metaclass=DatasetMeta):
         return data
 
     ## METHODS TO CHECK DATA AVAILABILITY
-    def _get_times(self, time_range: pd.date_range, **kwargs) -> Generator[dt.datetime, None, None]:
+    def _get_times(self, time_range: pd.DatetimeIndex, **kwargs) -> Generator[dt.datetime, None, None]:
         all_times = self.get_available_tags(time_range, **kwargs)['time']
         all_times.sort()
         for time in all_times:
-            if time_range.contains(time):
+            if time_in_range(time, time_range):
                 yield time
         
         if hasattr(self, 'parents') and self.parents is not None:
@@ -636,11 +709,11 @@ class Dataset(ABC, metaclass=DatasetMeta):
             # get the intersection of all times
             parent_times = set.intersection(*parent_times)
             for time in parent_times:
-                if time not in all_times and time_range.contains(time):
+                if time not in all_times and time_in_range(time, time_range):
                     yield time
 
     @with_cases
-    def get_times(self, time_range: pd.date_range, **kwargs) -> list[dt.datetime]:
+    def get_times(self, time_range: pd.DatetimeIndex, **kwargs) -> list[dt.datetime]:
         """
         Get a list of times between two dates.
         """
@@ -707,9 +780,23 @@ class Dataset(ABC, metaclass=DatasetMeta):
     def get_key(self, time: Union[pd.Timestamp, dt.datetime] = None, **kwargs):
         
         time = self.get_time_signature(time)
-        raw_key = substitute_string(self.loc_pattern, kwargs)
-        key = time.strftime(raw_key) if time is not None else raw_key
-        return key
+        return self.path_pattern.format(time, **kwargs)
+
+    @property
+    def path_pattern(self) -> PathPattern:
+        """
+        Compiled loc_pattern (compiled again only when the loc_pattern changes).
+        """
+        loc_pattern = self.loc_pattern
+        if getattr(self, '_path_pattern', None) is None or self._path_pattern.pattern != loc_pattern:
+            self._path_pattern = PathPattern.get(loc_pattern)
+        return self._path_pattern
+
+    def get_keys(self, times: pd.DatetimeIndex, **kwargs) -> list[str]:
+        """
+        Get the keys of all the times of a pd.DatetimeIndex (times are taken as they are).
+        """
+        return self.path_pattern.format_times(times, **kwargs)
 
     def set_parents(self, parents:dict[str:'Dataset'], fn:Callable):
         self.parents = parents
@@ -766,7 +853,7 @@ class Dataset(ABC, metaclass=DatasetMeta):
         self._template[tile] = {'crs': crs_wkt,
                                 '_FillValue' : template_array.attrs.get('_FillValue'),
                                 'dims_names' : template_array.dims,
-                                'spatial_dims' : (template_array.longitude, template_array.latitude),
+                                'spatial_dims' : ('longitude', 'latitude'),
                                 'dims_starts': {},
                                 'dims_ends': {},
                                 'dims_lengths': {}}
@@ -783,6 +870,45 @@ class Dataset(ABC, metaclass=DatasetMeta):
             self._template[tile]['dims_ends'][dim] = float(end)
             self._template[tile]['dims_lengths'][dim] = length
 
+    @staticmethod
+    def get_template_signature(template_dict: dict) -> tuple:
+        return (template_dict['crs'], repr(template_dict['_FillValue']),
+                tuple(template_dict['dims_names']), tuple(template_dict['spatial_dims']),
+                tuple((dim, template_dict['dims_starts'][dim], template_dict['dims_ends'][dim],
+                       template_dict['dims_lengths'][dim]) for dim in template_dict['dims_names']),
+                tuple(template_dict.get('variables', [])))
+
+    @staticmethod
+    def get_template_skeleton(template_dict: dict) -> xr.DataArray:
+        """
+        Get the coordinates skeleton of a template (built once per template signature, the data are not allocated).
+        """
+        signature = Dataset.get_template_signature(template_dict)
+        with TEMPLATES_LOCK:
+            skeleton = TEMPLATES.get(signature)
+            if skeleton is not None:
+                TEMPLATES.move_to_end(signature)
+                return skeleton
+
+        shape = [template_dict['dims_lengths'][dim] for dim in template_dict['dims_names']]
+        skeleton = xr.DataArray(np.broadcast_to(np.int8(0), shape), dims = template_dict['dims_names'])
+
+        for dim in template_dict['dims_names']:
+            start  = template_dict['dims_starts'][dim]
+            end    = template_dict['dims_ends'][dim]
+            length = template_dict['dims_lengths'][dim]
+            skeleton[dim] = np.linspace(start, end, length)
+
+        skeleton.attrs = {'crs': template_dict['crs'], '_FillValue': template_dict['_FillValue']}
+        skeleton = skeleton.rio.set_spatial_dims(*template_dict['spatial_dims']).rio.write_crs(template_dict['crs']).rio.write_coordinate_system()
+
+        with TEMPLATES_LOCK:
+            TEMPLATES[signature] = skeleton
+            while len(TEMPLATES) > TEMPLATES_SIZE:
+                TEMPLATES.popitem(last = False)
+
+        return skeleton
+
     @staticmethod
     def build_template_array(template_dict: dict, data = None) -> (xr.DataArray,xr.Dataset):
         """
@@ -794,19 +920,13 @@ class Dataset(ABC, metaclass=DatasetMeta):
             data = np.full(shape, template_dict['_FillValue'])
         else:
             data = data.reshape(shape)
-        template = xr.DataArray(data, dims = template_dict['dims_names'])
-        
-        for dim in template_dict['dims_names']:
-            start  = template_dict['dims_starts'][dim]
-            end    = template_dict['dims_ends'][dim]
-            length = template_dict['dims_lengths'][dim]
-            template[dim] = np.linspace(start, end, length)
 
-        template.attrs = {'crs': template_dict['crs'], '_FillValue': template_dict['_FillValue']}
-        template = template.rio.set_spatial_dims(*template_dict['spatial_dims']).rio.write_crs(template_dict['crs']).rio.write_coordinate_system()
+        # only the values are attached to the cached skeleton (coordinates are shared, attrs are copied)
+        template = Dataset.get_template_skeleton(template_dict).copy(deep = False, data = data)
 
         if 'variables' in template_dict:
-            template_ds = xr.Dataset({var: template.copy() for var in template_dict['variables']})
+            template_ds = xr.Dataset({var: template.copy(deep = False, data = data.copy())
+                                      for var in template_dict['variables']})
             return template_ds
         
         return template
@@ -821,8 +941,9 @@ class Dataset(ABC, metaclass=DatasetMeta):
         elif isinstance(data, np.ndarray):
             data = Dataset.build_template_array(template_dict, data)
         elif isinstance(data, xr.Dataset):
-            all_data = [Dataset.set_data_to_template(data[var], template_dict) for var in template_dict['variables']]
-            data = xr.merge(all_data)
+            template_var = {key: value for key, value in template_dict.items() if key != 'variables'}
+            data = xr.Dataset({var: Dataset.build_template_array(template_var, data[var].values)
+                               for var in template_dict['variables']})
         
         return data
 
@@ -844,13 +965,13 @@ class Dataset(ABC, metaclass=DatasetMeta):
             datatime = self.get_time_signature(time)
             metadata['time'] = datatime.strftime(time_format)
 
-        name = metadata.get('name', self.name)
+        name = metadata.get('name', getattr(self, 'name', None))
         if 'long_name' in metadata:
             metadata.pop('long_name')
 
         data.attrs.update(metadata)
 
-        if isinstance(data, xr.DataArray):
+        if isinstance(data, xr.DataArray) and name is not None:
             data.name = name
 
         return data
@@ -1,13 +1,43 @@
 import os
+import shutil
+import threading
+import datetime as dt
+import numpy as np
 import xarray as xr
 import pandas as pd
 
 from datetime import datetime
 
 from shybox.type_toolkit.io_dataset_base import Dataset
-from shybox.type_toolkit.io_utils import write_to_file, read_from_file, rm_file
+from shybox.type_toolkit.io_encoding import get_encoding
+from shybox.type_toolkit.io_handle_pool import handle_pool
+from shybox.type_toolkit.io_utils import (write_to_file, read_from_file, rm_file, crop_data,
+                                          straighten_data, set_type, check_data_format)
+from shybox.type_toolkit.parse_utils import PathPattern
 
-from typing import Optional
+import netCDF4
+
+from typing import Optional, Union
+
+try:
+    import zarr
+    # shards are available from zarr v3 (a file for several chunks)
+    zarr_shards = int(zarr.__version__.split('.')[0]) >= 3
+except ImportError:
+    zarr_shards = False
+
+# separator between the path of a store and the time of a slice in the keys of the DataSeries
+SERIES_TIME_SEPARATOR = '::'
+
+# locks of the stores (creation and appends) and of their time blocks (region writes), shared by the datasets
+SERIES_LOCKS = {}
+SERIES_LOCKS_LOCK = threading.Lock()
+
+def get_series_lock(*lock_key) -> threading.Lock:
+    with SERIES_LOCKS_LOCK:
+        if lock_key not in SERIES_LOCKS:
+            SERIES_LOCKS[lock_key] = threading.Lock()
+        return SERIES_LOCKS[lock_key]
 
 class DataObj(Dataset):
 
@@ -33,9 +63,25 @@ class DataObj(Dataset):
         else:
             self.file_name = None
 
+        # inventory of the available files (sqlite, refreshed by directory mtime), used if inventory_dir is defined
+        self.inventory_dir = kwargs.pop('inventory_dir', None)
+        self.use_inventory = kwargs.pop('inventory', self.inventory_dir is not None)
+        if self.use_inventory and self.inventory_dir is None:
+            raise ValueError('The folder of the inventory ("inventory_dir") must be defined to use the inventory.')
+
+        # read options (lazy and chunked reads, crop to a bounding box and selection of labels)
+        self.read_options = {'lazy': kwargs.pop('lazy', False), 'chunks': kwargs.pop('chunks', 'auto'),
+                             'bbox': kwargs.pop('bbox', None), 'sel': kwargs.pop('sel', None)}
+
+        # write options (encoding preset of the netcdf files, see io_encoding.ENCODING_PRESETS)
+        self.write_options = {'encoding': kwargs.pop('encoding', 'default')}
+
         self._creation_kwargs = {'type' : self.type, 'time_creation': datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
 
         super().__init__(**kwargs)
+        self.options.update({'inventory': self.use_inventory, 'inventory_dir': self.inventory_dir})
+        self.options.update(self.read_options)
+        self.options.update(self.write_options)
 
     @property
     def loc_pattern(self):
@@ -51,10 +97,10 @@ class DataObj(Dataset):
 
     ## INPUT/OUTPUT METHODS
     def _read_data(self, input_path) -> (xr.DataArray, xr.Dataset, pd.DataFrame):
-        return read_from_file(input_path, self.file_format, self.file_mode)
+        return read_from_file(input_path, self.file_format, self.file_mode, **self.read_options)
     
     def _write_data(self, output: (xr.DataArray, pd.DataFrame), output_path: str, **kwargs) -> None:
-        write_to_file(output, output_path, self.file_format, **kwargs)
+        write_to_file(output, output_path, self.file_format, **{**self.write_options, **kwargs})
 
     def _rm_data(self, path) -> None:
         rm_file(path)
@@ -66,4 +112,604 @@ class DataObj(Dataset):
     def _walk(self, prefix):
         for root, _, filenames in os.walk(prefix):
             for filename in filenames:
-                yield os.path.join(root, filename)
\ No newline at end of file
+                yield os.path.join(root, filename)
+
+class DataMem(DataObj):
+    """
+    Dataset of an in memory intermediate output. The data are passed directly to the downstream processes
+    (nothing is read or written): the object identifies the output of a process (e.g. to link it to an argument
+    of another process) and keeps the metadata of its input dataset.
+    """
+
+    type = 'memory_dataset'
+
+    def __init__(self, name: Optional[str] = None, in_obj: Optional[Dataset] = None, **kwargs):
+
+        self.name = name
+        super().__init__(path = '', file_name = '', file_format = 'memory', inventory = False, **kwargs)
+
+        if isinstance(in_obj, Dataset):
+            self._template = in_obj._template
+            self.time_signature = in_obj.time_signature
+            self.nan_value = in_obj.nan_value
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.name})"
+
+    @property
+    def is_static(self):
+        return False
+
+    ## INPUT/OUTPUT METHODS
+    def get_data(self, time: Optional[pd.Timestamp] = None, **kwargs):
+        raise ValueError(f'Data of the in memory output "{self.name}" are only passed to the downstream processes.')
+
+    def write_data(self, data, time: Optional[pd.Timestamp] = None, **kwargs) -> None:
+        pass
+
+    def _check_data(self, data_path) -> bool:
+        return False
+
+class DataSeries(DataObj):
+
+    """
+    Base of the datasets storing a whole time series in a single store (loc_pattern is the path of the store, it can
+    still contain tags or time directives to split the series in several stores, e.g. one per year).
+    The keys of the time slices are the path of the store and the time (store::time).
+    """
+
+    def __init__(self, path: Optional[str] = None, file_name: Optional[str] = None, **kwargs):
+
+        # name of the time dimension and of the variable of the DataArrays
+        self.time_dim = kwargs.pop('time_dim', 'time')
+        self.variable = kwargs.pop('variable', None)
+
+        kwargs['inventory'] = False
+        super().__init__(path, file_name, **kwargs)
+        self.options.update({'time_dim': self.time_dim, 'variable': self.variable})
+
+    ## KEYS OF THE TIME SLICES
+    @property
+    def has_time(self):
+        return True
+
+    def get_time_signature(self, timestep: (pd.Timestamp, dt.datetime)) -> (pd.Timestamp, None):
+        # the time is not truncated to the time directives of the path (the steps are stored in the time dimension)
+        if timestep is None:
+            return None
+        if isinstance(timestep, dt.datetime):
+            return pd.Timestamp(timestep)
+        if self.time_signature == 'start':
+            return pd.Timestamp(timestep.start)
+        elif self.time_signature == 'end+1':
+            return pd.Timestamp((timestep + 1).start)
+        return pd.Timestamp(timestep.end)
+
+    def get_key(self, time: Union[pd.Timestamp, dt.datetime] = None, **kwargs):
+        time = self.get_time_signature(time)
+        store = self.path_pattern.format(time, **kwargs)
+        return self.join_key(store, time)
+
+    def get_keys(self, times: pd.DatetimeIndex, **kwargs) -> list[str]:
+        return [self.get_key(time, **kwargs) for time in pd.DatetimeIndex(times)]
+
+    @staticmethod
+    def join_key(store: str, time: Optional[pd.Timestamp] = None) -> str:
+        if time is None:
+            return store
+        return f'{store}{SERIES_TIME_SEPARATOR}{time.isoformat()}'
+
+    @staticmethod
+    def split_key(key: str) -> tuple:
+        if SERIES_TIME_SEPARATOR not in key:
+            return key, None
+        store, time = key.rsplit(SERIES_TIME_SEPARATOR, 1)
+        return store, pd.Timestamp(time)
+
+    def get_data_signature(self, key: str) -> Optional[tuple]:
+        # the signature of the store (file stores only, the directories do not change with their chunks)
+        return super().get_data_signature(self.split_key(key)[0])
+
+    ## STORE MANAGEMENT
+    def get_store_times(self, store: str) -> pd.DatetimeIndex:
+        raise NotImplementedError
+
+    def get_store_index(self, store: str, time: pd.Timestamp) -> (int, None):
+        store_times = self.get_store_times(store)
+        if time not in store_times:
+            return None
+        return store_times.get_loc(time)
+
+    def check_store_time(self, store: str, time: pd.Timestamp) -> None:
+        # new times can only be appended at the end of the store
+        store_times = self.get_store_times(store)
+        if len(store_times) > 0 and time < store_times.max():
+            raise ValueError(f'Cannot write {time} to {store}: the time is before the end of the store '
+                             f'and it is not in its time dimension.')
+
+    def get_store_names(self, store: str) -> list[str]:
+        raise NotImplementedError
+
+    def to_store(self, data: (xr.DataArray, xr.Dataset), store: Optional[str] = None) -> xr.Dataset:
+        if isinstance(data, xr.DataArray):
+            # name of the variable: variable option, single variable of the store, name of the template or of the data
+            store_names = self.get_store_names(store) if store is not None else []
+            if self.variable is not None:
+                name = self.variable
+            elif len(store_names) == 1:
+                name = store_names[0]
+            else:
+                name = data.name or 'data'
+            data = data.to_dataset(name = name)
+        return data.drop_vars([coord for coord in data.coords if coord not in data.dims])
+
+    ## TEMPLATE
+    def set_template(self, template_array: (xr.DataArray, xr.Dataset), **kwargs):
+        # the name of the variable is kept to name the arrays written through the template
+        super().set_template(template_array, **kwargs)
+        if isinstance(template_array, xr.DataArray) and template_array.name is not None:
+            self._template[kwargs.get('tile', '__tile__')]['variable'] = template_array.name
+
+    @staticmethod
+    def set_data_to_template(data: (np.ndarray, xr.DataArray, xr.Dataset),
+                             template_dict: dict) -> (xr.DataArray, xr.Dataset):
+        output = DataObj.set_data_to_template(data, template_dict)
+        if isinstance(output, xr.DataArray):
+            output.name = template_dict.get('variable')
+        return output
+
+    ## METHODS TO CHECK DATA AVAILABILITY
+    def _check_data(self, data_key) -> bool:
+        store, time = self.split_key(data_key)
+        if time is None:
+            return os.path.exists(store)
+        return self.get_store_index(store, time) is not None
+
+    def _walk(self, prefix):
+        # the stores are the files or the folders matching the loc_pattern (the content of the folders is not walked)
+        store_parser = PathPattern.get(self.loc_pattern)
+        for root, dirnames, filenames in os.walk(prefix):
+            for dirname in list(dirnames):
+                store = os.path.join(root, dirname)
+                try:
+                    store_parser.parse(store)
+                except ValueError:
+                    continue
+                dirnames.remove(dirname)
+                yield store
+            for filename in filenames:
+                store = os.path.join(root, filename)
+                try:
+                    store_parser.parse(store)
+                except ValueError:
+                    continue
+                yield store
+
+    def get_available_entries(self, time: (dt.datetime, pd.DatetimeIndex) = None, **kwargs) -> list[tuple]:
+        prefix = self.get_prefix(time, **kwargs)
+        if not os.path.exists(prefix or '.'):
+            return []
+        if isinstance(time, dt.datetime):
+            time = pd.DatetimeIndex([time])
+
+        store_parser = PathPattern.get(self.split_key(self.get_key(time = None, **kwargs))[0])
+        entries = []
+        for store in self._walk(prefix or '.'):
+            try:
+                store_parser.parse(store)
+            except ValueError:
+                continue
+            _, store_tags = self.path_pattern.parse(store)
+            store_times = self.get_store_times(store)
+            if time is not None:
+                store_times = store_times[(store_times >= time.min()) & (store_times <= time.max())]
+            entries.extend([(self.join_key(store, store_time), store_time, store_tags)
+                            for store_time in store_times])
+
+        return entries
+
+class DataZarr(DataSeries):
+
+    """
+    Dataset storing a whole time series in a zarr store.
+    The steps are written as slices of the time dimension, chunked by time_chunk steps and grouped in files of
+    time_shard steps (zarr v3 shards, None to write a file per chunk): new times are appended at the end of the
+    store, existing times (e.g. allocated with allocate) are written in place and writes of steps in different
+    shards can run concurrently. Concurrent writes of new times are not supported: the times must be appended in
+    order, so the store of a concurrent run is created first with allocate. A time slice is read through the time
+    index of the store, only its chunk is decoded.
+    """
+
+    type = 'zarr_dataset'
+
+    def __init__(self, path: Optional[str] = None, file_name: Optional[str] = None, **kwargs):
+
+        # chunks and shards along time
+        self.time_chunk = kwargs.pop('time_chunk', 1)
+        self.time_shard = kwargs.pop('time_shard', 24)
+
+        kwargs['file_format'] = 'zarr'
+        super().__init__(path, file_name, **kwargs)
+        self.options.update({'time_chunk': self.time_chunk, 'time_shard': self.time_shard})
+
+        # opened stores, refreshed when the time dimension of the store changes
+        self._stores = {}
+
+    ## STORE MANAGEMENT
+    @property
+    def time_block(self) -> int:
+        # steps written in the same file (the writes of a block are serialized)
+        if self.time_shard is not None and zarr_shards:
+            return self.time_shard
+        return self.time_chunk
+
+    def get_store_signature(self, store: str) -> (float, None):
+        # the metadata of the time dimension changes at each append (zarr v3 and v2 layouts)
+        for meta_name in ['zarr.json', '.zarray']:
+            meta_file = os.path.join(store, self.time_dim, meta_name)
+            if os.path.exists(meta_file):
+                return os.stat(meta_file).st_mtime_ns
+        return None
+
+    def open_store(self, store: str) -> (xr.Dataset, None):
+        """
+        Open a zarr store (None if not available), the opened stores are kept until their time dimension changes.
+        """
+        signature = self.get_store_signature(store)
+        if signature is None:
+            self._stores.pop(store, None)
+            return None
+
+        store_cached = self._stores.get(store)
+        if store_cached is not None and store_cached[0] == signature:
+            return store_cached[1]
+
+        if self.read_options['lazy']:
+            data = xr.open_zarr(store, consolidated = False, chunks = self.read_options['chunks'])
+        else:
+            data = xr.open_dataset(store, engine = 'zarr', consolidated = False, chunks = None, cache = False)
+        self._stores[store] = (signature, data)
+        return data
+
+    def get_store_times(self, store: str) -> pd.DatetimeIndex:
+        data = self.open_store(store)
+        if data is None or self.time_dim not in data.indexes:
+            return pd.DatetimeIndex([])
+        return data.indexes[self.time_dim]
+
+    def get_store_names(self, store: str) -> list[str]:
+        data = self.open_store(store)
+        return list(data.data_vars) if data is not None else []
+
+    def get_store_encoding(self, data: xr.Dataset) -> dict:
+        encoding = {self.time_dim: {'units': 'seconds since 1970-01-01', 'dtype': 'int64', 'chunks': (1024,)}}
+        for var_name, var_data in data.data_vars.items():
+            var_chunks = tuple(self.time_chunk if dim == self.time_dim else size
+                               for dim, size in zip(var_data.dims, var_data.shape))
+            encoding[var_name] = {'chunks': var_chunks}
+            if self.time_block != self.time_chunk:
+                encoding[var_name]['shards'] = tuple(self.time_block if dim == self.time_dim else size
+                                                     for dim, size in zip(var_data.dims, var_data.shape))
+            if '_FillValue' in var_data.attrs:
+                encoding[var_name]['_FillValue'] = var_data.attrs.pop('_FillValue')
+        return encoding
+
+    def allocate(self, times: pd.DatetimeIndex, data: (xr.DataArray, xr.Dataset), **kwargs) -> str:
+        """
+        Create the store with all the times (only the metadata are written, the steps are empty), so that
+        the steps can be written in place and concurrently (one writer per time block).
+        """
+        import dask.array as da
+
+        times = pd.DatetimeIndex(times)
+        store = self.split_key(self.get_key(times[0], **kwargs))[0]
+        data = self.to_store(data.copy())
+
+        store_data = xr.Dataset(coords = {self.time_dim: times, **{dim: data[dim] for dim in data.dims}})
+        for var_name, var_data in data.data_vars.items():
+            var_fill = var_data.attrs.get('_FillValue', np.nan if var_data.dtype.kind == 'f' else 0)
+            store_data[var_name] = ((self.time_dim, *var_data.dims),
+                                    da.full((len(times), *var_data.shape), var_fill, dtype = var_data.dtype,
+                                            chunks = (self.time_block, *var_data.shape)), var_data.attrs)
+
+        with get_series_lock(store):
+            store_data.to_zarr(store, mode = 'w', compute = False, consolidated = False,
+                               encoding = self.get_store_encoding(store_data))
+        return store
+
+    ## INPUT/OUTPUT METHODS
+    def _read_data(self, input_key) -> (xr.DataArray, xr.Dataset):
+        store, time = self.split_key(input_key)
+
+        data = self.open_store(store)
+        if data is None:
+            raise ValueError(f'Could not resolve data from {input_key}.')
+        if time is not None:
+            data = data.isel({self.time_dim: self.get_store_index(store, time)})
+
+        data = crop_data(data, self.read_options['bbox'], self.read_options['sel'])
+        if not self.read_options['lazy']:
+            data = data.load()
+
+        # check if there is a single variable in the store
+        if len(data.data_vars) == 1:
+            data = data[list(data.data_vars)[0]]
+        return data
+
+    def _write_data(self, output: (xr.DataArray, xr.Dataset), output_key: str, **kwargs) -> None:
+        store, time = self.split_key(output_key)
+        if time is None:
+            raise ValueError(f'Cannot write data to {store} without a time.')
+
+        output = self.to_store(output, store)
+        if self.time_dim not in output.dims:
+            output = output.expand_dims({self.time_dim: [time]})
+
+        # write in place if the time is in the store (one lock per time block)
+        index = self.get_store_index(store, time)
+        if index is not None:
+            self.write_region(output, store, index)
+            return
+
+        # otherwise create the store or append the time (one writer per store)
+        with get_series_lock(store):
+            index = self.get_store_index(store, time)
+            if index is None:
+                if self.get_store_signature(store) is None:
+                    os.makedirs(os.path.dirname(store) or '.', exist_ok = True)
+                    output.to_zarr(store, mode = 'w-', consolidated = False,
+                                   encoding = self.get_store_encoding(output))
+                    return
+
+                self.check_store_time(store, time)
+                for var_data in output.data_vars.values():
+                    var_data.attrs.pop('_FillValue', None)
+                # the append can write to the last shard of the store (written in place by write_region)
+                with get_series_lock(store, len(self.get_store_times(store)) // self.time_block):
+                    output.to_zarr(store, append_dim = self.time_dim, consolidated = False)
+                return
+
+        self.write_region(output, store, index)
+
+    def write_region(self, output: xr.Dataset, store: str, index: int) -> None:
+        output = output.drop_vars([dim for dim in output.dims if dim != self.time_dim and dim in output.coords])
+        for var_data in output.data_vars.values():
+            var_data.attrs = {}
+        output.attrs = {}
+        with get_series_lock(store, index // self.time_block):
+            output.to_zarr(store, region = {self.time_dim: slice(index, index + 1)}, mode = 'r+',
+                           consolidated = False)
+
+    def _rm_data(self, key) -> None:
+        store, time = self.split_key(key)
+        if time is None:
+            shutil.rmtree(store, ignore_errors = True)
+            self._stores.pop(store, None)
+            return
+
+        # the slice is set to the fill value (the time dimension is not changed)
+        index = self.get_store_index(store, time)
+        if index is None:
+            return
+        data = self.open_store(store).isel({self.time_dim: [index]})
+        output = xr.Dataset({var_name: (var_data.dims, np.full(var_data.shape, self.get_fill_value(var_data),
+                                                               dtype = var_data.dtype))
+                             for var_name, var_data in data.data_vars.items()})
+        self.write_region(output, store, index)
+
+    @staticmethod
+    def get_fill_value(var_data: xr.DataArray):
+        """
+        Get the fill value of a variable of the store: the _FillValue of the encoding, nan for the floats or
+        the netcdf default fill value of the dtype (nan can not be cast to the integers).
+        """
+        if '_FillValue' in var_data.encoding:
+            return var_data.encoding['_FillValue']
+        if var_data.dtype.kind == 'f':
+            return np.nan
+        dtype_code = var_data.dtype.str[1:]
+        if dtype_code not in netCDF4.default_fillvals:
+            raise ValueError(f'No fill value defined for the variable {var_data.name} of type {var_data.dtype}.')
+        return netCDF4.default_fillvals[dtype_code]
+
+class DataNetcdf(DataSeries):
+
+    """
+    Dataset storing a whole time series in a netcdf file with an unlimited time dimension.
+    The steps are appended to the file (or written in place if the time is already in the file) and a time slice is
+    read as a hyperslab of the variables through the time index of the file. The files are kept open in a pool of
+    handles (handle_pool), so the steps do not reopen the file; the handles of the writes are closed after each
+    write (see HandlePool.keep_write), so that the other processes can read the file.
+    """
+
+    type = 'netcdf_dataset'
+
+    # units of the time written in the files
+    time_units = 'seconds since 1970-01-01 00:00:00'
+
+    def __init__(self, path: Optional[str] = None, file_name: Optional[str] = None, **kwargs):
+
+        # pool of the open files (the pool shared by the datasets if None)
+        self._handle_pool = kwargs.pop('handle_pool', None)
+
+        kwargs['file_format'] = 'netcdf'
+        super().__init__(path, file_name, **kwargs)
+
+    @property
+    def handle_pool(self):
+        return self._handle_pool if self._handle_pool is not None else handle_pool
+
+    ## STORE MANAGEMENT
+    def get_store_info(self, store: str, write: bool = False) -> (dict, None):
+        """
+        Get the handle and the time index of a file (None if not available), the caller holds the pool lock.
+        """
+        entry = self.handle_pool.get(store, write = write)
+        if entry is None:
+            return None
+
+        info = entry['info']
+        if 'times' not in info:
+            time_var = entry['handle'].variables.get(self.time_dim)
+            if time_var is None or time_var.size == 0:
+                info['times'] = pd.DatetimeIndex([])
+            else:
+                info['times'] = pd.DatetimeIndex(netCDF4.num2date(
+                    time_var[:], time_var.units, getattr(time_var, 'calendar', 'standard'),
+                    only_use_cftime_datetimes = False, only_use_python_datetimes = True))
+        info['handle'] = entry['handle']
+        return info
+
+    def get_store_times(self, store: str) -> pd.DatetimeIndex:
+        with self.handle_pool.lock:
+            info = self.get_store_info(store)
+        return info['times'] if info is not None else pd.DatetimeIndex([])
+
+    def get_store_names(self, store: str) -> list[str]:
+        with self.handle_pool.lock:
+            info = self.get_store_info(store)
+            return self.get_store_variables(info['handle']) if info is not None else []
+
+    def get_store_variables(self, handle: netCDF4.Dataset) -> list[str]:
+        return [var_name for var_name, var in handle.variables.items()
+                if var.dimensions[:1] == (self.time_dim,) and var_name not in handle.dimensions]
+
+    def get_store_window(self, handle: netCDF4.Dataset, dims: tuple) -> dict:
+        # window of the bounding box on the spatial dimensions (the whole dimensions if no bbox)
+        window = {dim: slice(None) for dim in dims}
+        if self.read_options['bbox'] is not None:
+            index = xr.Dataset({f'index_{dim}': (dim, np.arange(len(handle.dimensions[dim]))) for dim in dims},
+                               coords = {dim: np.asarray(handle.variables[dim][:])
+                                         for dim in dims if dim in handle.variables})
+            index = crop_data(index, self.read_options['bbox'])
+            for dim in dims:
+                dim_index = index[f'index_{dim}'].values
+                if dim_index.size > 0:
+                    window[dim] = slice(int(dim_index.min()), int(dim_index.max()) + 1)
+                else:
+                    window[dim] = slice(0, 0)
+        return window
+
+    def create_store(self, store: str, output: xr.Dataset) -> netCDF4.Dataset:
+        """
+        Create the file: unlimited time, spatial coordinates and variables encoded by the encoding preset.
+        """
+        os.makedirs(os.path.dirname(store) or '.', exist_ok = True)
+        handle = netCDF4.Dataset(store, 'w', format = 'NETCDF4')
+
+        handle.createDimension(self.time_dim, None)
+        time_var = handle.createVariable(self.time_dim, 'i8', (self.time_dim,))
+        time_var.setncatts({'units': self.time_units, 'calendar': 'standard', 'standard_name': 'time'})
+
+        for dim in output.dims:
+            handle.createDimension(dim, output.sizes[dim])
+            if dim in output.coords:
+                dim_var = handle.createVariable(dim, output[dim].dtype, (dim,))
+                dim_var[:] = output[dim].values
+                dim_var.setncatts({key: value for key, value in output[dim].attrs.items() if value is not None})
+
+        # the scale/offset packing needs the range of the whole series: packed presets are written as float32
+        encoding = get_encoding(output.expand_dims({self.time_dim: 1}), self.write_options['encoding'],
+                                time_dim = self.time_dim)
+        for var_name, var_data in output.data_vars.items():
+            var_encoding = encoding.get(var_name, {})
+            if 'scale_factor' in var_encoding:
+                var_encoding.update({'dtype': 'float32', '_FillValue': np.nan})
+            var_dtype = np.dtype(var_encoding.get('dtype', var_data.dtype))
+            var_fill = var_encoding.get('_FillValue', var_data.attrs.get('_FillValue'))
+            var = handle.createVariable(
+                var_name, var_dtype, (self.time_dim, *var_data.dims),
+                zlib = var_encoding.get('zlib', False), complevel = var_encoding.get('complevel', 4),
+                shuffle = var_encoding.get('shuffle', True), chunksizes = var_encoding.get('chunksizes'),
+                fill_value = var_dtype.type(var_fill) if var_fill is not None else None)
+            var.setncatts({key: value if isinstance(value, (str, int, float, np.number)) else str(value)
+                           for key, value in var_data.attrs.items()
+                           if value is not None and key not in ['_FillValue', 'scale_factor', 'add_offset']})
+
+        return handle
+
+    ## INPUT/OUTPUT METHODS
+    def _read_data(self, input_key) -> (xr.DataArray, xr.Dataset):
+        store, time = self.split_key(input_key)
+
+        with self.handle_pool.lock:
+            info = self.get_store_info(store)
+            if info is None:
+                raise ValueError(f'Could not resolve data from {input_key}.')
+            handle = info['handle']
+            index = slice(None) if time is None else self.get_store_index(store, time)
+
+            data = xr.Dataset()
+            for var_name in self.get_store_variables(handle):
+                var = handle.variables[var_name]
+                window = self.get_store_window(handle, var.dimensions[1:])
+                values = var[(index, *window.values())]
+                var_attrs = {key: var.getncattr(key) for key in var.ncattrs()}
+                if values.dtype.kind == 'f':
+                    values = np.ma.filled(values, np.nan)
+                else:
+                    values = np.ma.filled(values, var_attrs.get('_FillValue', 0))
+                data[var_name] = xr.DataArray(values, dims = var.dimensions[1:] if time is not None else var.dimensions,
+                                              attrs = var_attrs)
+                for dim, dim_window in window.items():
+                    if dim in handle.variables and dim not in data.coords:
+                        data.coords[dim] = np.asarray(handle.variables[dim][dim_window])
+            data.coords[self.time_dim] = time if time is not None else info['times']
+
+        data = crop_data(data, None, self.read_options['sel'])
+
+        # check if there is a single variable in the file
+        if len(data.data_vars) == 1:
+            data = data[list(data.data_vars)[0]]
+        return data
+
+    def _write_data(self, output: (xr.DataArray, xr.Dataset), output_key: str, **kwargs) -> None:
+        store, time = self.split_key(output_key)
+        if time is None:
+            raise ValueError(f'Cannot write data to {store} without a time.')
+
+        output = self.to_store(output, store)
+        if self.time_dim in output.dims:
+            output = output.isel({self.time_dim: 0})
+
+        with self.handle_pool.lock:
+            info = self.get_store_info(store, write = True)
+            if info is None:
+                self.handle_pool.add(store, self.create_store(store, output), 'a')
+                info = self.get_store_info(store, write = True)
+            handle = info['handle']
+
+            # append the time at the end of the file or write in place
+            index = self.get_store_index(store, time)
+            if index is None:
+                self.check_store_time(store, time)
+                index = len(info['times'])
+                handle.variables[self.time_dim][index] = netCDF4.date2num(
+                    time.to_pydatetime(), self.time_units, 'standard')
+                info['times'] = info['times'].append(pd.DatetimeIndex([time]))
+
+            for var_name, var_data in output.data_vars.items():
+                if var_name not in handle.variables:
+                    raise ValueError(f'Cannot write {var_name} to {store}: the variable is not in the file.')
+                values = var_data.values
+                handle.variables[var_name][index] = np.ma.masked_invalid(values) if values.dtype.kind == 'f' else values
+
+            self.handle_pool.sync(store)
+
+    def _rm_data(self, key) -> None:
+        store, time = self.split_key(key)
+        if time is None:
+            self.handle_pool.close(store)
+            rm_file(store)
+            return
+
+        # the slice is set to the fill value (the time dimension is not changed)
+        with self.handle_pool.lock:
+            index = self.get_store_index(store, time)
+            if index is None:
+                return
+            handle = self.get_store_info(store, write = True)['handle']
+            for var_name in self.get_store_variables(handle):
+                var = handle.variables[var_name]
+                var[index] = np.ma.masked_all(var.shape[1:], dtype = var.dtype)
+            self.handle_pool.sync(store)
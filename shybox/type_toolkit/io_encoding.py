@@ -0,0 +1,223 @@
+import numpy as np
+import xarray as xr
+
+from copy import deepcopy
+from typing import Optional
+
+# PRESETS OF THE NETCDF ENCODING
+# dtype: dtype of the float variables on disk (None to keep the dtype of the data)
+# packing: 'auto' to pack the float variables in the integer dtype with scale_factor/add_offset from the data range
+# chunks: 'space' (one time step per chunk, maps), 'time' (all the steps of a spatial tile, time series),
+#         None (contiguous) or a dict {dim: size}
+ENCODING_PRESETS = {
+    'none':    None,
+    'default': {'dtype': 'float32', 'packing': None, 'zlib': True, 'complevel': 4, 'shuffle': True,
+                'chunks': 'space', 'fill_value': np.nan},
+    'fast':    {'dtype': 'float32', 'packing': None, 'zlib': False, 'complevel': 0, 'shuffle': False,
+                'chunks': None, 'fill_value': np.nan},
+    'compact': {'dtype': 'int16', 'packing': 'auto', 'zlib': True, 'complevel': 5, 'shuffle': True,
+                'chunks': 'space', 'fill_value': -32768},
+    'archive': {'dtype': 'float32', 'packing': None, 'zlib': True, 'complevel': 9, 'shuffle': True,
+                'chunks': 'time', 'fill_value': np.nan},
+}
+
+# PRESETS OF THE GEOTIFF LAYOUT
+# driver: 'GTiff' or 'COG' (cloud optimized geotiff, tiled with the overviews after the data)
+# tiled: True, False (strips) or 'auto' (tiled if the grid is larger than TILED_SIZE)
+# blocksize: size of the tiles; compress: codec (None for no compression); level: level of the codec
+# predictor: 'auto' (2 for integer, 3 for float data), None or the predictor code
+# overviews: None, 'auto' (levels down to the size of a tile) or a list of decimation factors
+GEOTIFF_PRESETS = {
+    'none':    {'driver': 'GTiff', 'tiled': False, 'blocksize': None, 'compress': 'LZW', 'level': None,
+                'predictor': None, 'overviews': None, 'resampling': 'average'},
+    'default': {'driver': 'GTiff', 'tiled': 'auto', 'blocksize': 256, 'compress': 'DEFLATE', 'level': 6,
+                'predictor': 'auto', 'overviews': None, 'resampling': 'average'},
+    'fast':    {'driver': 'GTiff', 'tiled': 'auto', 'blocksize': 256, 'compress': None, 'level': None,
+                'predictor': None, 'overviews': None, 'resampling': 'average'},
+    'compact': {'driver': 'GTiff', 'tiled': 'auto', 'blocksize': 256, 'compress': 'ZSTD', 'level': 15,
+                'predictor': 'auto', 'overviews': None, 'resampling': 'average'},
+    'archive': {'driver': 'GTiff', 'tiled': 'auto', 'blocksize': 256, 'compress': 'DEFLATE', 'level': 9,
+                'predictor': 'auto', 'overviews': None, 'resampling': 'average'},
+    'cog':     {'driver': 'COG', 'tiled': True, 'blocksize': 512, 'compress': 'DEFLATE', 'level': 6,
+                'predictor': 'auto', 'overviews': 'auto', 'resampling': 'average'},
+}
+
+# size of the spatial tiles of the 'time' chunks and maximum size of the spatial dims of the 'space' chunks
+TILE_SIZE = 64
+SPACE_SIZE = 2048
+# minimum size of the grids written as tiled geotiff (with tiled = 'auto')
+TILED_SIZE = 512
+
+def get_preset(preset: (str, dict, None) = 'default', presets: dict = ENCODING_PRESETS, **overrides) -> (dict, None):
+    """
+    Get the settings of a preset (a name of presets or a dict), updated by the overrides.
+    """
+    if preset is None:
+        return None
+    if isinstance(preset, str):
+        if preset not in presets:
+            raise ValueError(f'Encoding preset {preset} not supported.')
+        preset = presets[preset]
+        if preset is None:
+            return None
+
+    settings = deepcopy(presets['default'])
+    settings.update(preset)
+    settings.update({key: value for key, value in overrides.items() if value is not None})
+    return settings
+
+def get_chunks(data: xr.DataArray, chunks: (str, dict, None), time_dim: str = 'time') -> (tuple, None):
+    """
+    Get the chunk shape of a variable aligned to the access pattern (time or space).
+    """
+    if chunks is None or data.ndim == 0:
+        return None
+
+    if isinstance(chunks, dict):
+        return tuple(min(int(chunks.get(dim, size)), size) for dim, size in zip(data.dims, data.shape))
+
+    chunk_shape = []
+    for dim, size in zip(data.dims, data.shape):
+        if dim == time_dim:
+            chunk_shape.append(1 if chunks == 'space' else size)
+        elif chunks == 'space':
+            chunk_shape.append(min(size, SPACE_SIZE))
+        elif chunks == 'time':
+            chunk_shape.append(min(size, TILE_SIZE))
+        else:
+            raise ValueError(f'Chunks {chunks} not supported.')
+
+    return tuple(max(chunk_size, 1) for chunk_size in chunk_shape)
+
+def get_packing(data: xr.DataArray, dtype: str) -> dict:
+    """
+    Get the scale_factor/add_offset to pack the data range in an integer dtype (the minimum value is the fill value).
+    """
+    dtype_info = np.iinfo(np.dtype(dtype))
+    data_min, data_max = float(data.min(skipna=True)), float(data.max(skipna=True))
+    if not np.isfinite(data_min) or not np.isfinite(data_max):
+        return {'scale_factor': 1.0, 'add_offset': 0.0}
+
+    # the levels between min+1 and max of the dtype are used for the data
+    levels = float(dtype_info.max) - float(dtype_info.min) - 1
+    scale_factor = (data_max - data_min) / levels if data_max > data_min else 1.0
+    add_offset = data_min - (float(dtype_info.min) + 1) * scale_factor
+    return {'scale_factor': scale_factor, 'add_offset': add_offset}
+
+def get_encoding(data: (xr.Dataset, xr.DataArray), preset: (str, dict, None) = 'default',
+                 variables: Optional[dict] = None, time_dim: str = 'time', **overrides) -> dict:
+    """
+    Get the netcdf encoding of the variables of a dataset from a preset.
+    The overrides (dtype, packing, zlib, complevel, shuffle, chunks, fill_value) update the preset for all the
+    variables and variables = {var_name: {setting: value}} updates the settings of single variables.
+    """
+    if isinstance(data, xr.DataArray):
+        data = data.to_dataset(name=data.name if data.name is not None else '__xarray_dataarray_variable__')
+
+    settings = get_preset(preset, **overrides)
+    if settings is None:
+        return {}
+
+    encoding = {}
+    for var_name, var_data in data.data_vars.items():
+        var_settings = deepcopy(settings)
+        if variables is not None and var_name in variables:
+            var_settings.update(variables[var_name])
+
+        var_encoding = {}
+        if var_settings['zlib']:
+            var_encoding.update({'zlib': True, 'complevel': int(var_settings['complevel']),
+                                 'shuffle': bool(var_settings['shuffle'])})
+        else:
+            var_encoding['zlib'] = False
+
+        var_chunks = get_chunks(var_data, var_settings['chunks'], time_dim=time_dim)
+        if var_chunks is not None:
+            var_encoding['chunksizes'] = var_chunks
+        else:
+            var_encoding['contiguous'] = not var_encoding['zlib']
+
+        # dtype, packing and fill value only for the float variables
+        if var_data.dtype.kind == 'f':
+            var_dtype = var_settings['dtype']
+            if var_dtype is not None:
+                var_encoding['dtype'] = var_dtype
+                if np.dtype(var_dtype).kind in 'iu':
+                    var_packing = var_settings['packing']
+                    if var_packing == 'auto':
+                        var_encoding.update(get_packing(var_data, var_dtype))
+                    elif isinstance(var_packing, dict):
+                        var_encoding.update(var_packing)
+            if var_settings['fill_value'] is not None:
+                var_encoding['_FillValue'] = var_settings['fill_value']
+
+        # the attributes already defined in the data are kept (xarray does not allow them also in the encoding)
+        for attr_name in ['_FillValue', 'scale_factor', 'add_offset']:
+            if attr_name in var_data.attrs:
+                var_encoding.pop(attr_name, None)
+
+        encoding[var_name] = var_encoding
+
+    return encoding
+
+def get_overviews(height: int, width: int, blocksize: int) -> list:
+    """
+    Get the decimation factors of the overviews down to the size of a tile.
+    """
+    factors, factor = [], 2
+    while max(height, width) / factor >= blocksize / 2 and min(height, width) // factor > 0:
+        factors.append(factor)
+        factor *= 2
+    return factors
+
+def get_geotiff_options(data: xr.DataArray, preset: (str, dict, None) = 'default', **overrides) -> dict:
+    """
+    Get the options of a geotiff write (creation options of rasterio/gdal) from a preset.
+    The internal overviews of the GTiff driver are in the 'overview_factors' and 'overview_resampling' keys
+    (built after the write, the COG driver builds them with the data).
+    """
+    settings = get_preset(preset, presets=GEOTIFF_PRESETS, **overrides)
+    if settings is None:
+        settings = deepcopy(GEOTIFF_PRESETS['none'])
+
+    height, width = data.shape[-2:]
+    driver = settings['driver'].upper()
+    tiled = settings['tiled']
+    if tiled == 'auto':
+        tiled = max(height, width) >= TILED_SIZE
+    blocksize = int(settings['blocksize']) if settings['blocksize'] is not None else 256
+
+    options = {'driver': 'COG' if driver == 'COG' else 'GTiff'}
+    if driver == 'COG':
+        options['blocksize'] = blocksize
+    elif tiled:
+        options.update({'tiled': True, 'blockxsize': blocksize, 'blockysize': blocksize})
+
+    compress = settings['compress']
+    if compress is not None:
+        compress = compress.upper()
+        options['compress'] = compress
+        if settings['level'] is not None and compress in ['DEFLATE', 'ZSTD', 'LZMA']:
+            if driver == 'COG':
+                options['level'] = int(settings['level'])
+            else:
+                options[{'DEFLATE': 'zlevel', 'ZSTD': 'zstd_level', 'LZMA': 'lzma_preset'}[compress]] = \
+                    int(settings['level'])
+        predictor = settings['predictor']
+        if predictor == 'auto':
+            predictor = 3 if data.dtype.kind == 'f' else 2 if data.dtype.kind in 'iu' else None
+        if predictor is not None and compress in ['DEFLATE', 'ZSTD', 'LZW', 'LZMA']:
+            options['predictor'] = int(predictor)
+    else:
+        options['compress'] = 'NONE'
+
+    overviews = settings['overviews']
+    if overviews == 'auto':
+        overviews = get_overviews(height, width, blocksize)
+    if driver == 'COG':
+        options['overviews'] = 'AUTO' if overviews else 'NONE'
+    else:
+        options['overview_factors'] = list(overviews) if overviews else None
+    options['overview_resampling'] = settings['resampling']
+
+    return options
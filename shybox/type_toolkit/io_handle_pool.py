@@ -0,0 +1,121 @@
+import os
+import threading
+
+from collections import OrderedDict
+from typing import Optional
+
+import netCDF4
+
+class HandlePool:
+    """
+    Bounded LRU pool of the open netcdf files (netCDF4 handles), keyed by path.
+    A handle opened for reading is reopened in append mode by the first write and the handles of the files changed
+    by other processes are reopened (size and modification time are checked at each access). The netcdf calls are
+    not thread safe: the users of the handles hold the lock of the pool.
+    HDF5 locks the open files (shared for reading, exclusive for writing): a handle in append mode blocks the
+    other processes, also the readers, so the write handles are closed by sync (the next access reopens the file
+    for reading). With keep_write the write handles are kept open until they are closed or evicted, for the files
+    that are not accessed by other processes while they are written.
+    """
+
+    def __init__(self, max_handles: int = 16, keep_write: bool = False):
+        self.max_handles = max_handles
+        self.keep_write = keep_write
+        self.hits = 0
+        self.misses = 0
+
+        self._entries = OrderedDict()
+        self.lock = threading.RLock()
+
+    def __repr__(self):
+        return f"HandlePool({len(self)}/{self.max_handles} handles, {self.hits} hits, {self.misses} misses)"
+
+    def __getstate__(self):
+        # the handles and the lock are not shared with other processes
+        return {'max_handles': self.max_handles, 'keep_write': self.keep_write}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, path: str):
+        return os.path.abspath(path) in self._entries
+
+    @staticmethod
+    def get_stat(path: str) -> Optional[tuple]:
+        try:
+            file_stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return file_stat.st_size, file_stat.st_mtime_ns
+
+    def get(self, path: str, write: bool = False) -> Optional[dict]:
+        """
+        Get the entry {'handle', 'mode', 'stat', 'info'} of a file (None if the file is not available).
+        The 'info' dict is used by the callers to store what they read from the handle (dropped with the handle).
+        """
+        path = os.path.abspath(path)
+        with self.lock:
+            entry = self._entries.get(path)
+            stat = self.get_stat(path)
+            if entry is not None and (entry['stat'] != stat or (write and entry['mode'] == 'r')):
+                self.close(path)
+                entry = None
+
+            if entry is not None:
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return entry
+
+            self.misses += 1
+            if stat is None:
+                return None
+            return self.add(path, netCDF4.Dataset(path, 'a' if write else 'r'), 'a' if write else 'r')
+
+    def add(self, path: str, handle: netCDF4.Dataset, mode: str) -> dict:
+        path = os.path.abspath(path)
+        with self.lock:
+            if path in self._entries:
+                self.close(path)
+            entry = {'handle': handle, 'mode': mode, 'stat': self.get_stat(path), 'info': {}}
+            self._entries[path] = entry
+            while len(self._entries) > self.max_handles:
+                old_path = next(iter(self._entries))
+                self.close(old_path)
+            return entry
+
+    def sync(self, path: str) -> None:
+        """
+        Flush the writes of a handle to the file (the new size and modification time are not seen as changes).
+        The handles in append mode are closed to release the lock of the file, unless keep_write is set.
+        """
+        path = os.path.abspath(path)
+        with self.lock:
+            entry = self._entries.get(path)
+            if entry is None:
+                return
+            if entry['mode'] == 'a' and not self.keep_write:
+                self.close(path)
+                return
+            entry['handle'].sync()
+            entry['stat'] = self.get_stat(path)
+
+    def close(self, path: Optional[str] = None) -> None:
+        """
+        Close the handle of a path (all the handles if path is None).
+        """
+        with self.lock:
+            paths = list(self._entries) if path is None else [os.path.abspath(path)]
+            for path in paths:
+                entry = self._entries.pop(path, None)
+                if entry is not None and entry['handle'].isopen():
+                    entry['handle'].close()
+
+    def get_stats(self) -> dict:
+        return {'handles': len(self), 'max_handles': self.max_handles, 'keep_write': self.keep_write,
+                'hits': self.hits, 'misses': self.misses}
+
+# default pool shared by the datasets
+handle_pool = HandlePool()
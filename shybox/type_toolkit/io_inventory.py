@@ -0,0 +1,157 @@
+import datetime as dt
+import hashlib
+import json
+import os
+import sqlite3
+
+from contextlib import closing
+from typing import Callable, Optional
+
+class FileInventory:
+    """
+    Inventory of the files of a dataset root, stored in a sqlite database of the inventory_dir folder.
+    For each location pattern the inventory keeps (path, time, tags) of the matching files and the modification time
+    of the directories. The tree is walked once; then the stored directories are checked by their modification time
+    and only the changed ones (and the new subdirectories found in them) are listed again.
+    """
+
+    # version of the database schema (part of the file name)
+    version = 2
+
+    def __init__(self, root: str, inventory_dir: str):
+
+        self.root = os.path.abspath(root)
+        os.makedirs(inventory_dir, exist_ok=True)
+
+        root_hash = hashlib.sha256(self.root.encode()).hexdigest()[:16]
+        self.db_file = os.path.join(inventory_dir, f'{root_hash}_v{self.version}.sqlite')
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute('CREATE TABLE IF NOT EXISTS dirs '
+                         '(pattern TEXT, dir TEXT, mtime INTEGER, PRIMARY KEY (pattern, dir))')
+            conn.execute('CREATE TABLE IF NOT EXISTS files '
+                         '(pattern TEXT, dir TEXT, path TEXT, time TEXT, tags TEXT, PRIMARY KEY (pattern, path))')
+            conn.execute('CREATE INDEX IF NOT EXISTS files_dir ON files (pattern, dir)')
+            conn.execute('CREATE INDEX IF NOT EXISTS files_time ON files (pattern, time)')
+
+    def __repr__(self):
+        return f"FileInventory({self.root}, {self.db_file})"
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_file, timeout=60)
+
+    @staticmethod
+    def _get_mtime(this_dir: str) -> Optional[int]:
+        try:
+            return os.stat(this_dir).st_mtime_ns
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            return None
+
+    @staticmethod
+    def _scan_dir(this_dir: str, parser: Callable) -> tuple[list[tuple], list[str]]:
+        rows, subdirs = [], []
+        try:
+            with os.scandir(this_dir) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=True):
+                        subdirs.append(entry.path)
+                        continue
+                    if not entry.is_file(follow_symlinks=True):
+                        continue
+                    try:
+                        this_time, this_tags = parser(entry.path)
+                    except ValueError:
+                        continue
+                    rows.append((entry.path, this_time.isoformat() if this_time is not None else None,
+                                 json.dumps(this_tags)))
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            pass
+        return rows, subdirs
+
+    @staticmethod
+    def _under(this_dir: str, prefix: str) -> bool:
+        return this_dir == prefix or this_dir.startswith(prefix.rstrip(os.sep) + os.sep)
+
+    def refresh(self, pattern: str, prefix: str, parser: Callable) -> None:
+        """
+        Update the files of a pattern under a prefix (parser returns (time, tags) or raises ValueError).
+        """
+        with closing(self._connect()) as conn, conn:
+            dirs_old = {this_dir: this_mtime for this_dir, this_mtime in
+                        conn.execute('SELECT dir, mtime FROM dirs WHERE pattern = ?', (pattern,))
+                        if self._under(this_dir, prefix)}
+
+            # the prefix is walked if it is not in the inventory yet, else only the stored directories are checked
+            dirs_scan = [prefix] if prefix not in dirs_old else []
+            for this_dir, this_mtime in dirs_old.items():
+                mtime_now = self._get_mtime(this_dir)
+                if mtime_now is None:
+                    conn.execute('DELETE FROM files WHERE pattern = ? AND dir = ?', (pattern, this_dir))
+                    conn.execute('DELETE FROM dirs WHERE pattern = ? AND dir = ?', (pattern, this_dir))
+                elif mtime_now != this_mtime:
+                    dirs_scan.append(this_dir)
+
+            # the changed directories are listed again (and the subdirectories not in the inventory are walked)
+            while dirs_scan:
+                this_dir = dirs_scan.pop()
+                mtime_now = self._get_mtime(this_dir)
+                if mtime_now is None:
+                    continue
+                rows, subdirs = self._scan_dir(this_dir, parser)
+                conn.execute('DELETE FROM files WHERE pattern = ? AND dir = ?', (pattern, this_dir))
+                conn.executemany('INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)',
+                                 [(pattern, this_dir) + row for row in rows])
+                conn.execute('INSERT OR REPLACE INTO dirs VALUES (?, ?, ?)', (pattern, this_dir, mtime_now))
+                dirs_scan.extend(subdir for subdir in subdirs if subdir not in dirs_old)
+
+    def query(self, pattern: str, prefix: str,
+              start: Optional[dt.datetime] = None, end: Optional[dt.datetime] = None) -> list[tuple]:
+        """
+        Get the (path, time, tags) of the files of a pattern under a prefix, optionally between start and end.
+        """
+        prefix_dir = prefix.rstrip(os.sep) + os.sep
+        sql = 'SELECT path, time, tags FROM files WHERE pattern = ? AND (dir = ? OR substr(dir, 1, ?) = ?)'
+        args = [pattern, prefix, len(prefix_dir), prefix_dir]
+        if start is not None:
+            sql += ' AND time >= ?'
+            args.append(start.isoformat())
+        if end is not None:
+            sql += ' AND time <= ?'
+            args.append(end.isoformat())
+
+        with closing(self._connect()) as conn:
+            rows = conn.execute(sql + ' ORDER BY path', args).fetchall()
+
+        return [(path, dt.datetime.fromisoformat(time) if time is not None else None, json.loads(tags))
+                for path, time, tags in rows]
+
+    def query_times(self, pattern: str, prefix: str,
+                    start: Optional[dt.datetime] = None, end: Optional[dt.datetime] = None,
+                    n: Optional[int] = None, rev: bool = False) -> list[dt.datetime]:
+        """
+        Get the sorted distinct times of a pattern under a prefix (the latest first if rev), at most n.
+        """
+        prefix_dir = prefix.rstrip(os.sep) + os.sep
+        sql = ('SELECT DISTINCT time FROM files WHERE pattern = ? AND time IS NOT NULL '
+               'AND (dir = ? OR substr(dir, 1, ?) = ?)')
+        args = [pattern, prefix, len(prefix_dir), prefix_dir]
+        if start is not None:
+            sql += ' AND time >= ?'
+            args.append(start.isoformat())
+        if end is not None:
+            sql += ' AND time <= ?'
+            args.append(end.isoformat())
+        sql += ' ORDER BY time DESC' if rev else ' ORDER BY time'
+        if n is not None:
+            sql += ' LIMIT ?'
+            args.append(int(n))
+
+        with closing(self._connect()) as conn:
+            rows = conn.execute(sql, args).fetchall()
+
+        return [dt.datetime.fromisoformat(time) for time, in rows]
+
+    def clear(self) -> None:
+        with closing(self._connect()) as conn, conn:
+            conn.execute('DELETE FROM files')
+            conn.execute('DELETE FROM dirs')
@@ -20,6 +20,7 @@ except ImportError:
 from typing import Optional
 
 from shybox.generic_toolkit.lib_utils_time import is_date
+from shybox.type_toolkit.io_encoding import get_encoding, get_geotiff_options
 
 def check_data_format(data, file_format: str) -> None:
     """"
@@ -27,11 +28,11 @@ def check_data_format(data, file_format: str) -> None:
     """
     # add possibility to write a geopandas dataframe to a geojson or a shapefile
     if isinstance(data, np.ndarray) or isinstance(data, xr.DataArray):
-        if not file_format in ['geotiff', 'netcdf']:
+        if not file_format in ['geotiff', 'netcdf', 'zarr']:
             raise ValueError(f'Cannot write matrix data to a {file_format} file.')
 
     elif isinstance(data, xr.Dataset):
-        if file_format not in ['netcdf']:
+        if file_format not in ['netcdf', 'zarr']:
             raise ValueError(f'Cannot write a dataset to a {file_format} file.')
         
     elif isinstance(data, str):
@@ -93,9 +94,44 @@ def get_format_from_path(path: str) -> str:
 
     raise ValueError(f'File format not supported: {extension}')
 
+# names of the spatial dimensions (used to crop the data to a bounding box)
+dims_geo_x = ['longitude', 'lon', 'x', 'west_east']
+dims_geo_y = ['latitude', 'lat', 'y', 'south_north']
+
+def crop_data(data: (xr.DataArray, xr.Dataset), bbox: Optional[tuple] = None,
+              sel: Optional[dict] = None) -> (xr.DataArray, xr.Dataset):
+    """
+    Crop the data to a bounding box (xmin, ymin, xmax, ymax) and select the labels in sel (e.g. a time).
+    The selection is done on the lazy arrays, so only the needed blocks are read.
+    """
+    if sel is not None:
+        data = data.sel({dim: value for dim, value in sel.items() if dim in data.dims})
+
+    if bbox is not None:
+        xmin, ymin, xmax, ymax = bbox
+        crop = {}
+        for dims_geo, dim_min, dim_max in [(dims_geo_x, xmin, xmax), (dims_geo_y, ymin, ymax)]:
+            dim = next((dim for dim in dims_geo if dim in data.dims), None)
+            if dim is None:
+                raise ValueError(f'Cannot crop the data: no dimension in {dims_geo}.')
+            values = data[dim].values
+            # coordinates can be ascending or descending (e.g. latitudes)
+            crop[dim] = slice(dim_min, dim_max) if values[0] <= values[-1] else slice(dim_max, dim_min)
+        data = data.sel(crop)
+
+    return data
+
 def read_from_file(
-        path, file_format: Optional[str] = None, file_mode: Optional[str] = None) \
+        path, file_format: Optional[str] = None, file_mode: Optional[str] = None,
+        lazy: bool = False, chunks: (dict, str, None) = 'auto',
+        bbox: Optional[tuple] = None, sel: Optional[dict] = None) \
         -> (xr.DataArray, xr.Dataset, pd.DataFrame):
+    """
+    Read the data from a file.
+    Gridded data (geotiff, netcdf, txt grids) are cropped to bbox (xmin, ymin, xmax, ymax) and to the labels in sel
+    before reading. If lazy, the data are returned as dask arrays with the given chunks (the file is closed by
+    data.close() or when the data are released); otherwise only the cropped data are loaded and the file is closed.
+    """
 
     if file_format is None:
         file_format = get_format_from_path(path)
@@ -115,7 +151,7 @@ def read_from_file(
     # read the data from a txt file
     elif file_format == 'txt':
         if file_mode == 'grid':
-            data = rxr.open_rasterio(path)
+            data = open_grid(path, rxr.open_rasterio, lazy, chunks, bbox, sel)
 
             squeeze_dims = [dim for dim in data.dims if data[dim].size == 1]
             if len(squeeze_dims) > 0:
@@ -134,11 +170,11 @@ def read_from_file(
 
     # read the data from a geotiff
     elif file_format == 'geotiff':
-        data = rxr.open_rasterio(path)
+        data = open_grid(path, rxr.open_rasterio, lazy, chunks, bbox, sel)
 
     # read the data from a netcdf
     elif file_format == 'netcdf':
-        data = xr.open_dataset(path)
+        data = open_grid(path, xr.open_dataset, lazy, chunks, bbox, sel)
         # check if there is a single variable in the dataset
         if len(data.data_vars) == 1:
             data = data[list(data.data_vars)[0]]
@@ -152,7 +188,43 @@ def read_from_file(
 
     return data
 
-def write_to_file(data, path, file_format: Optional[str] = None, append = False) -> None:
+def open_grid(path: str, open_fx, lazy: bool = False, chunks: (dict, str, None) = 'auto',
+              bbox: Optional[tuple] = None, sel: Optional[dict] = None) -> (xr.DataArray, xr.Dataset):
+    """
+    Open a gridded file (lazy and chunked, or cropped, loaded and closed).
+    """
+    if lazy:
+        data = open_fx(path, chunks = chunks)
+        return crop_data(data, bbox, sel)
+
+    with open_fx(path) as data_handle:
+        data = crop_data(data_handle, bbox, sel).load()
+    return data
+
+def write_geotiff(data: xr.DataArray, path: str, encoding: (str, dict, None) = 'default', **kwargs) -> None:
+    """
+    Write the data to a geotiff with the layout of a preset of io_encoding.GEOTIFF_PRESETS (tiled, compressed,
+    cloud optimized with the 'cog' preset), kwargs update the preset. The internal overviews of the GTiff
+    driver are built after the data are written.
+    """
+    options = get_geotiff_options(data, encoding, **kwargs)
+    overview_factors = options.pop('overview_factors', None)
+    if options['driver'] == 'GTiff':
+        overview_resampling = options.pop('overview_resampling')
+
+    data.rio.to_raster(path, **options)
+
+    if overview_factors:
+        with rio.open(path, 'r+') as dst:
+            dst.build_overviews(overview_factors, rio.enums.Resampling[overview_resampling])
+            dst.update_tags(ns = 'rio_overview', resampling = overview_resampling)
+
+def write_to_file(data, path, file_format: Optional[str] = None, append = False,
+                  encoding: (str, dict, None) = 'default', **kwargs) -> None:
+    """
+    Write the data to a file. For netcdf and geotiff files, encoding is a preset of io_encoding.ENCODING_PRESETS
+    and io_encoding.GEOTIFF_PRESETS (or a dict of settings, None for the previous defaults) and kwargs update it.
+    """
 
     if file_format is None:
         file_format = get_format_from_path(path)
@@ -205,11 +277,11 @@ def write_to_file(data, path, file_format: Optional[str] = None, append = False)
 
     # write the data to a geotiff
     elif file_format == 'geotiff':
-        data.rio.to_raster(path, compress = 'LZW')
+        write_geotiff(data, path, encoding, **kwargs)
 
     # write the data to a netcdf
     elif file_format == 'netcdf':
-        data.to_netcdf(path)
+        data.to_netcdf(path, encoding = get_encoding(data, encoding, **kwargs))
 
     # write the data to a png or pdf (i.e. move the file)
     elif file_format == 'file':
@@ -1,6 +1,11 @@
 import datetime as dt
 import re
 
+import numpy as np
+import pandas as pd
+
+from functools import lru_cache
+
 #from ..timestepping.time_utils import get_date_from_str
 
 def substitute_values(structure, tag_dict, **kwargs):
@@ -163,6 +168,13 @@ def get_unique_values(values):
     return [transform_back(value) if isinstance(value, tuple) else value for value in unique_values]
 
 def extract_date_and_tags(string: str, string_pattern:str):
+    return PathPattern.get(string_pattern).parse(string)
+
+@lru_cache(maxsize=256)
+def compile_date_pattern(string_pattern:str) -> tuple:
+    """
+    Compile the regex used to extract the date and the tags from a string (once per pattern).
+    """
     pattern = string_pattern
     pattern = re.sub(r'\{(\w+)\}', r'(?P<\1>[^/]+)', pattern)
     pattern = pattern.replace('%Y', '(?P<year>\\d{4})')
@@ -182,49 +194,168 @@ def extract_date_and_tags(string: str, string_pattern:str):
             for i in range(count-1):
                 pattern = pattern.replace(f'(?P<{name}>', f'(?P<{name}{i}>', 1)
 
-    # Match the string with the pattern
-    match = re.match(pattern, string)
-    if not match:
-        raise ValueError("The string does not match the pattern")
-    
-    # Extract the date components
-    if 'year' in substituted_names:
-        year = int(match.group('year'))
-    else:
-        year = 1900
-    
-    if 'month' in substituted_names:
-        month = int(match.group('month'))
-    else:
-        month = 1
-    
-    if 'day' in substituted_names:
-        day = int(match.group('day'))
-    else:
-        day = 1
+    return re.compile(pattern), frozenset(substituted_names)
 
-    if 'hour' in substituted_names:
-        hour = int(match.group('hour'))
-    else:
-        hour = 0
-    
-    if 'minute' in substituted_names:
-        minute = int(match.group('minute'))
-    else:
-        minute = 0
-    
-    if 'second' in substituted_names:
-        second = int(match.group('second'))
-    else:
-        second = 0
-
-    date = dt.datetime(year, month, day, hour, minute, second)
-    
-    # Extract the other key-value pairs
-    all_tags = match.groupdict()
-    tags = {key: value for key, value in all_tags.items() if key in substituted_names and key not in ['year', 'month', 'day', 'hour', 'minute', 'second']}
-    
-    return date, tags
+class PathPattern:
+    """
+    Compiled location pattern: the template is split once into literal, {tag} and %time segments,
+    so that paths can be formatted (also for a whole pd.DatetimeIndex) and parsed without rebuilding it.
+    """
+
+    _segment_pattern = re.compile(r'{([\w.]+)(?::(.*?))?}|%[a-zA-Z%]')
+    _time_fields = {'Y': ('year', 4), 'm': ('month', 2), 'd': ('day', 2),
+                    'H': ('hour', 2), 'M': ('minute', 2), 'S': ('second', 2), 'j': ('dayofyear', 3)}
+    _date_fields = ['year', 'month', 'day', 'hour', 'minute', 'second']
+
+    def __init__(self, pattern: str):
+        self.pattern = pattern
+
+        # segments: ('literal', text), ('tag', name, fmt, text) or ('time', directive)
+        self.segments = []
+        position = 0
+        for match in self._segment_pattern.finditer(pattern):
+            if match.start() > position:
+                self.segments.append(('literal', pattern[position:match.start()]))
+            if match.group(0).startswith('%'):
+                self.segments.append(('time', match.group(0)))
+            else:
+                self.segments.append(('tag', match.group(1), match.group(2), match.group(0)))
+            position = match.end()
+        if position < len(pattern):
+            self.segments.append(('literal', pattern[position:]))
+
+        self.tag_names = [segment[1] for segment in self.segments if segment[0] == 'tag']
+        self.has_time = any(segment[0] == 'time' for segment in self.segments)
+
+        # str.format templates: {0} is the time, {1}, {2}, ... are the formatted tags
+        template_time, template_none, tag_id = [], [], 1
+        for segment in self.segments:
+            if segment[0] == 'literal':
+                text = segment[1].replace('{', '{{').replace('}', '}}')
+                template_time.append(text)
+                template_none.append(text)
+            elif segment[0] == 'tag':
+                template_time.append(f'{{{tag_id}}}')
+                template_none.append(f'{{{tag_id}}}')
+                tag_id += 1
+            else:
+                field = self._time_fields.get(segment[1][1])
+                if field is None or field[0] == 'dayofyear':
+                    template_time.append(f'{{0:{segment[1]}}}')
+                else:
+                    template_time.append(f'{{0.{field[0]}:0{field[1]}d}}')
+                template_none.append(segment[1])
+        self._template_time, self._template_none = ''.join(template_time), ''.join(template_none)
+        self._tag_segments = [segment[1:] for segment in self.segments if segment[0] == 'tag']
+
+        self._regex, self._regex_names = None, None
+
+    def __repr__(self):
+        return f"PathPattern({self.pattern})"
+
+    @classmethod
+    @lru_cache(maxsize=256)
+    def get(cls, pattern: str) -> 'PathPattern':
+        return cls(pattern)
+
+    @staticmethod
+    def _format_tag(value, fmt):
+        if isinstance(value, str) and fmt:
+            try:
+                value = dt.datetime.fromisoformat(value)
+            except ValueError:
+                pass
+        if isinstance(value, dt.datetime) and fmt:
+            return value.strftime(fmt)
+        elif fmt:
+            return format(value, fmt)
+        else:
+            return str(value)
+
+    def format(self, time: dt.datetime = None, **tags):
+        """
+        Format the pattern with a time and the tags (the tags not given are kept as placeholders).
+        Tags given as lists are expanded into (nested) lists of paths, as substitute_string does.
+        """
+        tag_values = []
+        for name, fmt, text in self._tag_segments:
+            value = tags.get(name)
+            if isinstance(value, list):
+                return [self.format(time, **{**tags, name: item}) for item in value]
+            tag_values.append(text if value is None else self._format_tag(value, fmt))
+
+        if time is None:
+            return self._template_none.format(None, *tag_values)
+        return self._template_time.format(time, *tag_values)
+
+    def format_times(self, times: pd.DatetimeIndex, **tags) -> list[str]:
+        """
+        Format the pattern for all the times of a pd.DatetimeIndex (the tags must be scalars).
+        Numeric time fields are written digit by digit in a character matrix, the other directives use strftime.
+        """
+        times = pd.DatetimeIndex(times)
+        parts = []
+        for segment in self.segments:
+            if segment[0] == 'literal':
+                parts.append(segment[1])
+            elif segment[0] == 'tag':
+                value = tags.get(segment[1])
+                parts.append(segment[3] if value is None else self._format_tag(value, segment[2]))
+            else:
+                field = self._time_fields.get(segment[1][1])
+                if field is None:
+                    parts.append(np.asarray(times.strftime(segment[1]), dtype=object))
+                else:
+                    parts.append((np.asarray(getattr(times, field[0]), dtype=np.int64), field[1]))
+
+        # variable width fields: concatenate the strings
+        if any(isinstance(part, np.ndarray) for part in parts):
+            paths = np.full(len(times), '', dtype=object)
+            for part in parts:
+                if isinstance(part, tuple):
+                    part = np.char.zfill(part[0].astype(str), part[1]).astype(object)
+                paths = paths + part
+            return paths.tolist()
+
+        # fixed width fields: fill a (n, width) character matrix
+        parts = [part.encode() if isinstance(part, str) else part for part in parts]
+        width = sum([len(part) if isinstance(part, bytes) else part[1] for part in parts])
+        chars = np.empty((len(times), width), dtype=np.uint8)
+        column = 0
+        for part in parts:
+            if isinstance(part, bytes):
+                chars[:, column:column + len(part)] = np.frombuffer(part, dtype=np.uint8)
+                column += len(part)
+            else:
+                values, digits = part
+                for digit in range(digits):
+                    chars[:, column + digits - 1 - digit] = 48 + (values // 10 ** digit) % 10
+                column += digits
+
+        paths = chars.view(f'S{width}').ravel() if width > 0 else np.full(len(times), b'')
+        return np.char.decode(paths, 'utf-8').tolist()
+
+    def parse(self, string: str) -> tuple:
+        """
+        Extract the date and the tags from a string (ValueError if the string does not match the pattern).
+        """
+        if self._regex is None:
+            self._regex, self._regex_names = compile_date_pattern(self.pattern)
+
+        match = self._regex.match(string)
+        if not match:
+            raise ValueError("The string does not match the pattern")
+
+        # Extract the date components
+        date_values = [int(match.group(name)) if name in self._regex_names else default
+                       for name, default in zip(self._date_fields, [1900, 1, 1, 0, 0, 0])]
+        date = dt.datetime(*date_values)
+
+        # Extract the other key-value pairs
+        tags = {key: value for key, value in match.groupdict().items()
+                if key in self._regex_names and key not in self._date_fields}
+
+        return date, tags
 
 def format_dict(dict):
     str_list = []
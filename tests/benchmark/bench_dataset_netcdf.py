@@ -0,0 +1,70 @@
+"""
+Benchmark of a forecast (n_steps x n_vars grids) in a single netcdf file: steps written and read through
+read_from_file/to_netcdf (the file is reopened at each step) vs DataNetcdf (appends and hyperslab reads on a
+pooled handle).
+
+usage: python bench_dataset_netcdf.py [n_steps] [n_vars] [rows] [cols] [root]
+"""
+
+import sys
+import time
+import tempfile
+import os
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+from shybox.type_toolkit.io_dataset_grid import DataNetcdf
+from shybox.type_toolkit.io_handle_pool import HandlePool
+from shybox.type_toolkit.io_utils import write_to_file, read_from_file
+
+
+def get_step(step: int, n_vars: int, rows: int, cols: int) -> xr.Dataset:
+    rng = np.random.default_rng(step)
+    coords = {'latitude': np.linspace(47.0, 36.0, rows), 'longitude': np.linspace(6.0, 19.0, cols)}
+    return xr.Dataset({f'var_{var_id}': (('latitude', 'longitude'), rng.random((rows, cols), dtype=np.float32))
+                       for var_id in range(n_vars)}, coords=coords)
+
+
+def timed(fx, *args, **kwargs):
+    time_start = time.perf_counter()
+    fx_out = fx(*args, **kwargs)
+    return fx_out, time.perf_counter() - time_start
+
+
+def run_benchmark(n_steps: int = 72, n_vars: int = 10, rows: int = 300, cols: int = 400, root: str = None) -> None:
+
+    times = pd.date_range('2025-01-01', periods=n_steps, freq='h')
+    steps = [get_step(step, n_vars, rows, cols) for step in range(n_steps)]
+    print(f'{n_steps} steps x {n_vars} variables {rows}x{cols}')
+    print(f'{"storage":<12}{"write [s]":>12}{"first [s]":>12}{"last [s]":>12}{"all [s]":>12}')
+
+    with tempfile.TemporaryDirectory(dir=root) as tmp_dir:
+
+        # reference: the file is written at the end and reopened for each step
+        file_nc = os.path.join(tmp_dir, 'forecast_reference.nc')
+        _, time_write = timed(lambda: write_to_file(
+            xr.concat([step.expand_dims(time=[time]) for step, time in zip(steps, times)], dim='time'),
+            file_nc, 'netcdf'))
+        _, time_first = timed(read_from_file, file_nc, 'netcdf', sel={'time': times[0]})
+        _, time_last = timed(read_from_file, file_nc, 'netcdf', sel={'time': times[-1]})
+        _, time_all = timed(lambda: [read_from_file(file_nc, 'netcdf', sel={'time': time}) for time in times])
+        print(f'{"reopen":<12}{time_write:>12.3f}{time_first:>12.3f}{time_last:>12.3f}{time_all:>12.3f}')
+
+        # appends and hyperslab reads on a pooled handle
+        pool = HandlePool()
+        data_nc = DataNetcdf(loc_pattern=os.path.join(tmp_dir, 'forecast.nc'), handle_pool=pool)
+        _, time_write = timed(lambda: [data_nc._write_data(step, data_nc.get_key(time))
+                                       for step, time in zip(steps, times)])
+        _, time_first = timed(data_nc._read_data, data_nc.get_key(times[0]))
+        _, time_last = timed(data_nc._read_data, data_nc.get_key(times[-1]))
+        _, time_all = timed(lambda: [data_nc._read_data(data_nc.get_key(time)) for time in times])
+        print(f'{"pooled":<12}{time_write:>12.3f}{time_first:>12.3f}{time_last:>12.3f}{time_all:>12.3f}')
+        print(pool)
+        pool.close()
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    run_benchmark(*[int(arg) for arg in args[:4]], *args[4:5])
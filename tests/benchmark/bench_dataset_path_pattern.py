@@ -0,0 +1,46 @@
+"""
+Micro-benchmark of the path formatting of a location pattern
+(substitute_string + strftime vs compiled PathPattern vs vectorized format over a pd.DatetimeIndex).
+
+usage: python bench_dataset_path_pattern.py [n_paths]
+"""
+
+import sys
+import time
+
+import pandas as pd
+
+from shybox.type_toolkit.parse_utils import PathPattern, substitute_string
+
+LOC_PATTERN = '/data/ens{member:02d}/%Y/%m/%d/rain_{member:02d}_%Y%m%d%H%M.tif'
+
+
+def timed(fx, *args, **kwargs):
+    time_start = time.perf_counter()
+    fx_out = fx(*args, **kwargs)
+    return fx_out, time.perf_counter() - time_start
+
+
+def run_benchmark(n_paths: int = 1_000_000) -> None:
+
+    times = pd.date_range('2000-01-01 00:00', periods=n_paths, freq='h')
+    times_list = times.to_pydatetime().tolist()
+    tags = {'member': 3}
+
+    paths_string, time_string = timed(
+        lambda: [t.strftime(substitute_string(LOC_PATTERN, tags)) for t in times_list])
+
+    path_pattern = PathPattern(LOC_PATTERN)
+    paths_pattern, time_pattern = timed(lambda: [path_pattern.format(t, **tags) for t in times_list])
+    paths_vector, time_vector = timed(path_pattern.format_times, times, **tags)
+
+    assert paths_string == paths_pattern == paths_vector
+    print(f'{n_paths} paths, e.g. {paths_vector[-1]}')
+    print(f'substitute_string + strftime: {time_string:8.3f} s')
+    print(f'PathPattern.format:           {time_pattern:8.3f} s (x{time_string / time_pattern:.1f})')
+    print(f'PathPattern.format_times:     {time_vector:8.3f} s (x{time_string / time_vector:.1f})')
+
+
+if __name__ == '__main__':
+    args = [int(arg) for arg in sys.argv[1:]]
+    run_benchmark(*args)
@@ -0,0 +1,99 @@
+"""
+Benchmark of the first/last date lookup of a Dataset on a synthetic hourly tree
+(month by month probing vs single scan vs inventory query).
+
+usage: python bench_dataset_time_bounds.py [n_years] [root]
+"""
+
+import sys
+import time
+import tempfile
+import os
+
+import pandas as pd
+
+from shybox.type_toolkit.io_dataset_grid import DataObj
+
+LOC_PATTERN = os.path.join('%Y', '%m', '%d', 'rain_%Y%m%d%H.tif')
+
+
+def make_tree(root: str, n_years: int) -> int:
+    file_times = pd.date_range('2015-01-01 00:00', periods=n_years * 365 * 24, freq='h')
+    for file_time in file_times:
+        file_path = os.path.join(root, file_time.strftime(LOC_PATTERN))
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        open(file_path, 'w').close()
+    return len(file_times)
+
+
+def probe_last_date(dataset: DataObj, now: pd.Timestamp):
+    # reference: walk backwards month by month (one directory scan per probe)
+    month = now.to_period('M')
+    while month.year >= 1900:
+        month_times = dataset.get_times(pd.date_range(month.start_time, month.end_time.floor('h'), freq='h'))
+        month_times = [t for t in month_times if t <= now]
+        if len(month_times) > 0:
+            return max(month_times)
+        month -= 1
+    return None
+
+
+def probe_first_date(dataset: DataObj, start: pd.Timestamp, end: pd.Timestamp):
+    # reference: binary search over the months up to the last date, then forward scan
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    start_month, end_month = start.to_period('M'), end.to_period('M')
+    while start_month + 1 < end_month:
+        mid_month = start_month + (end_month - start_month).n // 2
+        if len(dataset.get_times(pd.date_range(mid_month.start_time, mid_month.end_time.floor('h'), freq='h'))) > 0:
+            end_month = mid_month
+        else:
+            start_month = mid_month
+    while start_month <= end.to_period('M'):
+        month_times = dataset.get_times(pd.date_range(start_month.start_time, start_month.end_time.floor('h'), freq='h'))
+        if len(month_times) > 0:
+            return min(month_times)
+        start_month += 1
+    return None
+
+
+def timed(fx, *args, **kwargs):
+    time_start = time.perf_counter()
+    fx_out = fx(*args, **kwargs)
+    return fx_out, time.perf_counter() - time_start
+
+
+def run_benchmark(n_years: int = 10, root: str = None) -> None:
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        root = root if root is not None else os.path.join(tmp_dir, 'data')
+        if not os.path.exists(root):
+            n_files, time_tree = timed(make_tree, root, n_years)
+            print(f'tree: {n_files} files created in {time_tree:.1f} s')
+
+        loc_pattern = os.path.join(root, LOC_PATTERN)
+        data_walk = DataObj(loc_pattern=loc_pattern, inventory=False)
+        data_inventory = DataObj(loc_pattern=loc_pattern, inventory_dir=os.path.join(tmp_dir, 'inventory'))
+
+        now = pd.Timestamp('2100-01-01')
+        last_probe, time_probe_last = timed(probe_last_date, data_walk, now)
+        first_probe, time_probe_first = timed(probe_first_date, data_walk, pd.Timestamp('1990-01-01'), last_probe)
+        time_probe = time_probe_last + time_probe_first
+        (last_scan, first_scan), time_scan = timed(
+            lambda: (data_walk.get_last_date(now=now), data_walk.get_first_date()))
+        (last_cold, first_cold), time_cold = timed(
+            lambda: (data_inventory.get_last_date(now=now), data_inventory.get_first_date()))
+        (last_warm, first_warm), time_warm = timed(
+            lambda: (data_inventory.get_last_date(now=now), data_inventory.get_first_date()))
+
+        assert first_probe == first_scan == first_cold == first_warm
+        assert last_probe == last_scan == last_cold == last_warm
+        print(f'first {first_warm}, last {last_warm}')
+        print(f'month probing:     {time_probe:8.3f} s')
+        print(f'single scan:       {time_scan:8.3f} s')
+        print(f'inventory (cold):  {time_cold:8.3f} s')
+        print(f'inventory (warm):  {time_warm:8.3f} s')
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    run_benchmark(int(args[0]) if len(args) > 0 else 10, args[1] if len(args) > 1 else None)
@@ -0,0 +1,74 @@
+"""
+Benchmark of a forecast (n_steps x n_vars grids) stored as one netcdf file per step vs a zarr store (DataZarr,
+with and without shards of time_shard steps):
+number of files, write time, time slice reads (first and last step) and the read of all the steps.
+
+usage: python bench_dataset_zarr.py [n_steps] [n_vars] [rows] [cols] [time_shard] [root]
+"""
+
+import sys
+import time
+import tempfile
+import os
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+from shybox.type_toolkit.io_dataset_grid import DataZarr
+from shybox.type_toolkit.io_utils import write_to_file, read_from_file
+
+
+def get_step(step: int, n_vars: int, rows: int, cols: int) -> xr.Dataset:
+    rng = np.random.default_rng(step)
+    coords = {'latitude': np.linspace(47.0, 36.0, rows), 'longitude': np.linspace(6.0, 19.0, cols)}
+    return xr.Dataset({f'var_{var_id}': (('latitude', 'longitude'), rng.random((rows, cols), dtype=np.float32))
+                       for var_id in range(n_vars)}, coords=coords)
+
+
+def timed(fx, *args, **kwargs):
+    time_start = time.perf_counter()
+    fx_out = fx(*args, **kwargs)
+    return fx_out, time.perf_counter() - time_start
+
+
+def count_files(folder: str) -> int:
+    return sum([len(file_names) for _, _, file_names in os.walk(folder)])
+
+
+def run_benchmark(n_steps: int = 72, n_vars: int = 10, rows: int = 300, cols: int = 400, time_shard: int = 24,
+                  root: str = None) -> None:
+
+    times = pd.date_range('2025-01-01', periods=n_steps, freq='h')
+    steps = [get_step(step, n_vars, rows, cols) for step in range(n_steps)]
+    print(f'{n_steps} steps x {n_vars} variables {rows}x{cols}')
+    print(f'{"storage":<10}{"files":>8}{"write [s]":>12}{"first [s]":>12}{"last [s]":>12}{"all [s]":>12}')
+
+    with tempfile.TemporaryDirectory(dir=root) as tmp_dir:
+
+        # one netcdf file per step
+        folder_nc = os.path.join(tmp_dir, 'netcdf')
+        files_nc = [os.path.join(folder_nc, time.strftime('forecast_%Y%m%d%H%M.nc')) for time in times]
+        _, time_write = timed(lambda: [write_to_file(step, file_nc, 'netcdf') for step, file_nc in zip(steps, files_nc)])
+        _, time_first = timed(read_from_file, files_nc[0], 'netcdf')
+        _, time_last = timed(read_from_file, files_nc[-1], 'netcdf')
+        _, time_all = timed(lambda: [read_from_file(file_nc, 'netcdf') for file_nc in files_nc])
+        print(f'{"netcdf":<10}{count_files(folder_nc):>8}{time_write:>12.3f}{time_first:>12.3f}'
+              f'{time_last:>12.3f}{time_all:>12.3f}')
+
+        # zarr stores (appends, one step per chunk, files of a chunk or of time_shard steps)
+        for storage, storage_shard in [('zarr', None), ('zarr+shard', time_shard)]:
+            folder_zarr = os.path.join(tmp_dir, storage)
+            data_zarr = DataZarr(loc_pattern=os.path.join(folder_zarr, 'forecast.zarr'), time_shard=storage_shard)
+            _, time_write = timed(lambda: [data_zarr._write_data(step, data_zarr.get_key(time))
+                                           for step, time in zip(steps, times)])
+            data_zarr = DataZarr(loc_pattern=os.path.join(folder_zarr, 'forecast.zarr'), time_shard=storage_shard)
+            _, time_first = timed(data_zarr._read_data, data_zarr.get_key(times[0]))
+            _, time_last = timed(data_zarr._read_data, data_zarr.get_key(times[-1]))
+            _, time_all = timed(lambda: [data_zarr._read_data(data_zarr.get_key(time)) for time in times])
+            print(f'{storage:<10}{count_files(folder_zarr):>8}{time_write:>12.3f}{time_first:>12.3f}'
+                  f'{time_last:>12.3f}{time_all:>12.3f}')
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    run_benchmark(*[int(arg) for arg in args[:5]], *args[5:6])
@@ -0,0 +1,86 @@
+"""
+Benchmark of the continuum binary reader (struct unpack vs memory map) on a synthetic file.
+
+usage: python bench_io_binary.py [n_steps] [rows] [cols] [root]
+"""
+
+import sys
+import time
+import tempfile
+import struct
+import os
+
+import numpy as np
+import pandas as pd
+
+from shybox.io_toolkit.lib_io_binary import open_data_binary, read_data_binary, write_data_binary
+
+# the struct reference builds a python tuple of the whole file (about 30 bytes per value)
+MAX_VALUES_REFERENCE = 5 * 10 ** 7
+
+
+def read_struct(file_name: str, rows: int, cols: int, var_format: str = 'i', var_scale_factor: int = 10):
+    # reference: the struct based decoding used before the memory map
+    with open(file_name, 'rb') as file_handle:
+        data_stream = file_handle.read(-1)
+    var_n = len(data_stream) // struct.calcsize(var_format)
+    var_data_1d = np.asarray(struct.unpack(var_format * var_n, data_stream), dtype=np.float32)
+    var_data_1d = np.float32(var_data_1d / var_scale_factor)
+    var_data_3d = np.reshape(var_data_1d, (rows, cols, var_n // (rows * cols)), order='F')
+    var_data = np.zeros(shape=var_data_3d.shape)
+    var_data[:, :, :] = np.nan
+    for step in np.arange(0, var_data_3d.shape[2], 1):
+        var_data[:, :, step] = var_data_3d[:, :, step]
+    return var_data
+
+
+def timed(fx, *args, **kwargs):
+    time_start = time.perf_counter()
+    fx_out = fx(*args, **kwargs)
+    return fx_out, time.perf_counter() - time_start
+
+
+def run_benchmark(n_steps: int = 500, rows: int = 1000, cols: int = 1000, root: str = None) -> None:
+
+    with tempfile.TemporaryDirectory(dir=root) as tmp_dir:
+        file_name = os.path.join(tmp_dir, 'forcing.bin')
+
+        # synthetic file written step by step through a memory map (scaled integers in fortran order)
+        rng = np.random.default_rng(0)
+        var_data = np.memmap(file_name, dtype='=i', mode='w+', shape=(rows, cols, n_steps), order='F')
+        for step in range(n_steps):
+            var_data[:, :, step] = rng.integers(0, 1000, (rows, cols), dtype=np.int32)
+        var_data.flush()
+        del var_data
+        print(f'{n_steps} steps {rows}x{cols}: {os.path.getsize(file_name) / 2 ** 20:.0f} MB')
+
+        # vectorized writer on a block of steps
+        block = rng.random((rows, cols, min(n_steps, 24)), dtype=np.float32) * 100
+        _, time_write = timed(write_data_binary, os.path.join(tmp_dir, 'block.bin'), block)
+
+        geo_x, geo_y = np.linspace(6.0, 19.0, cols), np.linspace(47.0, 36.0, rows)
+
+        var_data, time_open = timed(open_data_binary, file_name, rows, cols)
+        _, time_step = timed(lambda: np.asarray(var_data[:, :, n_steps // 2], dtype=np.float32) / 10)
+        var_da, time_eager = timed(read_data_binary, file_name, geo_x, geo_y, var_time_steps_expected=n_steps,
+                                   var_time=pd.Timestamp('2025-01-01'))
+        del var_da
+        var_da, time_lazy = timed(read_data_binary, file_name, geo_x, geo_y, var_time_steps_expected=n_steps,
+                                  var_time=pd.Timestamp('2025-01-01'), var_lazy=True)
+        _, time_lazy_step = timed(lambda: var_da.isel(time=n_steps // 2).values)
+        del var_da
+
+        if n_steps * rows * cols <= MAX_VALUES_REFERENCE:
+            _, time_struct = timed(read_struct, file_name, rows, cols)
+            print(f'struct unpack:        {time_struct:8.3f} s')
+        else:
+            print(f'struct unpack:        skipped (more than {MAX_VALUES_REFERENCE} values)')
+        print(f'memmap (eager):       {time_eager:8.3f} s')
+        print(f'memmap (open + step): {time_open + time_step:8.3f} s')
+        print(f'lazy (open + step):   {time_lazy + time_lazy_step:8.3f} s')
+        print(f'writer ({block.shape[2]} steps):    {time_write:8.3f} s')
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    run_benchmark(*[int(arg) for arg in args[:3]], *args[3:4])
@@ -0,0 +1,68 @@
+"""
+Benchmark of the netcdf encoding presets (file size, write time, map and time series read time) on a synthetic cube.
+
+usage: python bench_io_encoding.py [n_steps] [rows] [cols] [root]
+"""
+
+import sys
+import time
+import tempfile
+import os
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+from shybox.type_toolkit.io_encoding import ENCODING_PRESETS
+from shybox.type_toolkit.io_utils import write_to_file
+
+
+def get_cube(n_steps: int, rows: int, cols: int) -> xr.Dataset:
+    # smooth fields with noise and a no data area (compressible as the real forcing data)
+    rng = np.random.default_rng(0)
+    geo_y, geo_x = np.meshgrid(np.linspace(0, 4 * np.pi, rows), np.linspace(0, 4 * np.pi, cols), indexing='ij')
+    values = np.empty((n_steps, rows, cols), dtype=np.float64)
+    for step in range(n_steps):
+        values[step] = 10 + 5 * np.sin(geo_y + step / 6) * np.cos(geo_x) + rng.normal(0, 0.5, (rows, cols))
+    values[:, :rows // 10, :cols // 10] = np.nan
+    return xr.Dataset(
+        {'air_temperature': (('time', 'latitude', 'longitude'), values)},
+        coords={'time': pd.date_range('2025-01-01', periods=n_steps, freq='h'),
+                'latitude': np.linspace(47.0, 36.0, rows), 'longitude': np.linspace(6.0, 19.0, cols)})
+
+
+def timed(fx, *args, **kwargs):
+    time_start = time.perf_counter()
+    fx_out = fx(*args, **kwargs)
+    return fx_out, time.perf_counter() - time_start
+
+
+def read_map(file_name: str, step: int) -> np.ndarray:
+    with xr.open_dataset(file_name) as data:
+        return data['air_temperature'].isel(time=step).values
+
+
+def read_series(file_name: str, row: int, col: int) -> np.ndarray:
+    with xr.open_dataset(file_name) as data:
+        return data['air_temperature'].isel(latitude=row, longitude=col).values
+
+
+def run_benchmark(n_steps: int = 48, rows: int = 500, cols: int = 500, root: str = None) -> None:
+
+    data = get_cube(n_steps, rows, cols)
+    print(f'{n_steps} steps {rows}x{cols}: {data.nbytes / 2 ** 20:.0f} MB in memory')
+    print(f'{"preset":<10}{"size [MB]":>12}{"write [s]":>12}{"map [s]":>12}{"series [s]":>12}')
+
+    with tempfile.TemporaryDirectory(dir=root) as tmp_dir:
+        for preset in ENCODING_PRESETS:
+            file_name = os.path.join(tmp_dir, f'cube_{preset}.nc')
+            _, time_write = timed(write_to_file, data, file_name, 'netcdf', encoding=preset)
+            _, time_map = timed(read_map, file_name, n_steps // 2)
+            _, time_series = timed(read_series, file_name, rows // 2, cols // 2)
+            print(f'{preset:<10}{os.path.getsize(file_name) / 2 ** 20:>12.1f}'
+                  f'{time_write:>12.3f}{time_map:>12.3f}{time_series:>12.3f}')
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    run_benchmark(*[int(arg) for arg in args[:3]], *args[3:4])
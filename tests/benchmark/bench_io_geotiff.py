@@ -0,0 +1,68 @@
+"""
+Benchmark of the geotiff layout presets (stripped vs tiled vs cloud optimized) on a synthetic grid:
+file size, write time, windowed read of a tile and quick-look read of a decimated grid.
+
+usage: python bench_io_geotiff.py [rows] [cols] [n_reads] [root]
+"""
+
+import sys
+import time
+import tempfile
+import os
+
+import numpy as np
+import xarray as xr
+import rasterio as rio
+import rioxarray  # noqa: F401 (rio accessor)
+
+from shybox.type_toolkit.io_utils import write_to_file
+
+
+def get_grid(rows: int, cols: int) -> xr.DataArray:
+    rng = np.random.default_rng(0)
+    geo_y, geo_x = np.meshgrid(np.linspace(0, 8 * np.pi, rows), np.linspace(0, 8 * np.pi, cols), indexing='ij')
+    values = (100 + 50 * np.sin(geo_y) * np.cos(geo_x) + rng.normal(0, 1, (rows, cols))).astype('float32')
+    grid = xr.DataArray(values, dims=['y', 'x'],
+                        coords={'y': np.linspace(47.0, 36.0, rows), 'x': np.linspace(6.0, 19.0, cols)})
+    return grid.rio.write_crs('EPSG:4326')
+
+
+def timed(fx, *args, **kwargs):
+    time_start = time.perf_counter()
+    fx_out = fx(*args, **kwargs)
+    return fx_out, time.perf_counter() - time_start
+
+
+def read_windows(file_name: str, n_reads: int, size: int = 256) -> None:
+    rng = np.random.default_rng(1)
+    with rio.open(file_name) as src:
+        for _ in range(n_reads):
+            row, col = rng.integers(0, src.height - size), rng.integers(0, src.width - size)
+            src.read(1, window=rio.windows.Window(col, row, size, size))
+
+
+def read_quicklook(file_name: str, size: int = 512) -> np.ndarray:
+    with rio.open(file_name) as src:
+        scale = max(src.height, src.width) / size
+        return src.read(1, out_shape=(int(src.height / scale), int(src.width / scale)))
+
+
+def run_benchmark(rows: int = 4000, cols: int = 5000, n_reads: int = 50, root: str = None) -> None:
+
+    grid = get_grid(rows, cols)
+    print(f'{rows}x{cols}: {grid.nbytes / 2 ** 20:.0f} MB in memory, {n_reads} windows of 256x256')
+    print(f'{"preset":<10}{"size [MB]":>12}{"write [s]":>12}{"windows [s]":>13}{"quicklook [s]":>15}')
+
+    with tempfile.TemporaryDirectory(dir=root) as tmp_dir:
+        for preset in ['none', 'default', 'fast', 'compact', 'cog']:
+            file_name = os.path.join(tmp_dir, f'grid_{preset}.tif')
+            _, time_write = timed(write_to_file, grid, file_name, 'geotiff', encoding=preset)
+            _, time_windows = timed(read_windows, file_name, n_reads)
+            _, time_quicklook = timed(read_quicklook, file_name)
+            print(f'{preset:<10}{os.path.getsize(file_name) / 2 ** 20:>12.1f}'
+                  f'{time_write:>12.3f}{time_windows:>13.3f}{time_quicklook:>15.3f}')
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    run_benchmark(*[int(arg) for arg in args[:3]], *args[3:4])
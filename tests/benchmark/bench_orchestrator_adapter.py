@@ -0,0 +1,56 @@
+"""
+Benchmark of the as_process adapters (in memory vs temporary files).
+
+usage: python bench_orchestrator_adapter.py [rows] [cols] [repeats]
+"""
+
+import sys
+import time
+
+import numpy as np
+import xarray as xr
+import rioxarray
+
+from osgeo import gdal
+
+from shybox.orchestrator_toolkit.lib_orchestrator_utils import as_process
+
+
+def make_raster(rows: int, cols: int) -> xr.DataArray:
+    data_values = np.random.default_rng(0).random((1, rows, cols), dtype=np.float32)
+    data_array = xr.DataArray(
+        data_values, dims=['band', 'y', 'x'],
+        coords={'band': [1], 'y': 45.0 - (np.arange(rows) + 0.5) * 0.01, 'x': 8.0 + (np.arange(cols) + 0.5) * 0.01})
+    return data_array.rio.write_crs('EPSG:4326')
+
+
+def make_processes(adapter: str) -> dict:
+
+    @as_process(input_type='gdal', output_type='gdal', adapter=adapter)
+    def copy_gdal(data):
+        return gdal.Translate('', data, format='MEM')
+
+    @as_process(input_type='file', output_type='gdal', adapter=adapter)
+    def warp_file(data):
+        return gdal.Warp('', [data], format='MEM')
+
+    return {'gdal': copy_gdal, 'file': warp_file}
+
+
+def run_benchmark(rows: int = 2000, cols: int = 2000, repeats: int = 5) -> None:
+
+    data_array = make_raster(rows, cols)
+    print(f'raster {rows}x{cols} float32, {repeats} repeats')
+
+    for adapter in ['tmp', 'mem']:
+        for process_type, process_fx in make_processes(adapter).items():
+            time_start = time.perf_counter()
+            for _ in range(repeats):
+                process_fx(data_array)
+            time_elapsed = (time.perf_counter() - time_start) / repeats
+            print(f'adapter {adapter:>3} - input {process_type:>4}: {time_elapsed * 1000:9.1f} ms/call')
+
+
+if __name__ == '__main__':
+    args = [int(arg) for arg in sys.argv[1:]]
+    run_benchmark(*args)
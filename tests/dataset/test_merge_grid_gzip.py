@@ -0,0 +1,112 @@
+import unittest
+import tempfile
+import threading
+import gzip
+import os
+
+from unittest import mock
+
+from shybox.dataset_toolkit.merge_grid import lib_utils_gzip
+from shybox.dataset_toolkit.merge_grid.lib_utils_gzip import ZipPool, zip_filename
+
+
+class TestZipPool(unittest.TestCase):
+
+    """
+    Tests for zip pool of merge_grid outputs.
+    """
+
+    def setUp(self):
+        """
+        Setup test.
+        """
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.file_names = []
+        for file_id in range(5):
+            file_name = os.path.join(self.tmp_dir.name, f'rain_{file_id:02d}.nc')
+            with open(file_name, 'wb') as file_handle:
+                file_handle.write(bytes([file_id]) * 10000)
+            self.file_names.append(file_name)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def check_zip(self, file_name):
+        with gzip.open(file_name + '.gz', 'rb') as file_handle:
+            assert file_handle.read() == bytes([self.file_names.index(file_name)]) * 10000
+
+    def test_zip_sync(self):
+
+        # a single worker zips the files in the caller thread
+        with ZipPool(zip_workers=1) as zip_pool:
+            assert zip_pool.executor is None
+            assert zip_pool.submit(self.file_names[0], self.file_names[0] + '.gz') == self.file_names[0] + '.gz'
+            assert not os.path.exists(self.file_names[0])
+        self.check_zip(self.file_names[0])
+
+    def test_zip_pool(self):
+
+        with ZipPool(zip_workers=3, zip_remove_unzip=False) as zip_pool:
+            for file_name in self.file_names:
+                zip_pool.submit(file_name, file_name + '.gz')
+            assert zip_pool.wait() == [file_name + '.gz' for file_name in self.file_names]
+
+        for file_name in self.file_names:
+            self.check_zip(file_name)
+            assert os.path.exists(file_name)
+        assert not [file_name for file_name in os.listdir(self.tmp_dir.name) if file_name.endswith('.part')]
+
+    def test_zip_part(self):
+
+        # the zipped file is replaced only when complete (the partial file is removed)
+        file_name_zip = self.file_names[0] + '.gz'
+        with open(file_name_zip, 'wb') as file_handle:
+            file_handle.write(b'previous')
+
+        with mock.patch.object(lib_utils_gzip.shutil, 'copyfileobj', side_effect=OSError('disk full')):
+            with self.assertRaises(OSError):
+                zip_filename(self.file_names[0], file_name_zip)
+
+        with open(file_name_zip, 'rb') as file_handle:
+            assert file_handle.read() == b'previous'
+        assert not os.path.exists(file_name_zip + '.part')
+
+    def test_zip_error(self):
+
+        # the errors of the workers are raised by wait (and by the exit of the pool)
+        zip_pool = ZipPool(zip_workers=2)
+        zip_pool.submit(os.path.join(self.tmp_dir.name, 'missing.nc'), os.path.join(self.tmp_dir.name, 'missing.nc.gz'))
+        with self.assertRaises(FileNotFoundError):
+            zip_pool.wait()
+        zip_pool.close()
+
+        with self.assertRaises(FileNotFoundError):
+            with ZipPool(zip_workers=2) as zip_pool:
+                zip_pool.submit(os.path.join(self.tmp_dir.name, 'missing.nc'),
+                                os.path.join(self.tmp_dir.name, 'missing.nc.gz'))
+
+    def test_zip_exit_error(self):
+
+        # the error of the body is raised, the zip errors are logged and the pending files are cancelled
+        zip_event, zip_calls = threading.Event(), []
+
+        def zip_file(file_name_unzip, file_name_zip):
+            zip_calls.append(file_name_unzip)
+            zip_event.wait()
+            raise OSError('zip failed')
+
+        with self.assertLogs(lib_utils_gzip.log_stream, 'ERROR'):
+            with self.assertRaises(ValueError):
+                with ZipPool(zip_workers=2) as zip_pool:
+                    zip_pool.zip_file = zip_file
+                    for file_name in self.file_names:
+                        zip_pool.submit(file_name, file_name + '.gz')
+                    threading.Timer(0.2, zip_event.set).start()
+                    raise ValueError('body failed')
+
+        assert len(zip_calls) == 2
+        assert zip_pool.executor is None
+
+
+if __name__ == '__main__':
+    unittest.main()
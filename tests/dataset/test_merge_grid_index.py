@@ -0,0 +1,118 @@
+import unittest
+import tempfile
+import os
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+from shybox.dataset_toolkit.merge_grid.lib_utils_geo import create_idx_partial2global
+from shybox.dataset_toolkit.merge_grid.lib_utils_io import (
+    define_idx_map_file, compute_idx_map_signature, read_idx_map, write_idx_map)
+from shybox.dataset_toolkit.merge_grid.lib_utils_method_interpolate import apply_var_sample
+
+
+def idx_partial2global_loop(grid_lon_partial, grid_lat_partial,
+                            rows_ref, cols_ref, xllcorner_ref, yllcorner_ref, cellsize_ref, no_data=-9999):
+    # reference: the cell by cell loop used before the vectorized indexes
+    shape = grid_lon_partial.shape
+    idx_i_ref, idx_j_ref = np.full(shape, no_data), np.full(shape, no_data)
+    idx_i_dom, idx_j_dom = np.full(shape, no_data), np.full(shape, no_data)
+    for i in range(0, shape[0]):
+        for j in range(0, shape[1]):
+            i_cols = round((grid_lon_partial[i, j] - xllcorner_ref) / cellsize_ref)
+            j_rows = rows_ref - round((grid_lat_partial[i, j] - yllcorner_ref) / cellsize_ref)
+            if 0 <= j_rows < rows_ref and 0 <= i_cols < cols_ref:
+                idx_i_ref[i, j], idx_j_ref[i, j] = i_cols, j_rows
+                idx_i_dom[i, j], idx_j_dom[i, j] = i, j
+    return idx_i_ref, idx_j_ref, idx_i_dom, idx_j_dom
+
+
+class TestMergeGridIndex(unittest.TestCase):
+
+    """
+    Tests for index maps of merge_grid sample method.
+    """
+
+    def setUp(self):
+        """
+        Setup test.
+        """
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+        # reference grid 20x30 (0.1 deg) and a domain partially outside of it
+        self.rows_ref, self.cols_ref = 20, 30
+        self.xllcorner_ref, self.yllcorner_ref, self.cellsize_ref = 8.0, 44.0, 0.1
+        self.geo_x_dom, self.geo_y_dom = np.linspace(7.83, 9.47, 12), np.linspace(46.17, 44.61, 9)
+        self.grid_x_dom, self.grid_y_dom = np.meshgrid(self.geo_x_dom, self.geo_y_dom)
+
+        self.file_name_idx = define_idx_map_file(os.path.join(self.tmp_dir.name, 'domain.dem.txt'))
+        self.signature = compute_idx_map_signature(
+            self.geo_x_dom, self.geo_y_dom, [self.xllcorner_ref, self.yllcorner_ref, self.cellsize_ref])
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def get_idx(self):
+        return create_idx_partial2global(
+            self.grid_x_dom, self.grid_y_dom, self.rows_ref, self.cols_ref,
+            self.xllcorner_ref, self.yllcorner_ref, self.cellsize_ref)
+
+    def test_idx_vectorized(self):
+
+        idx_vector = self.get_idx()
+        idx_loop = idx_partial2global_loop(
+            self.grid_x_dom, self.grid_y_dom, self.rows_ref, self.cols_ref,
+            self.xllcorner_ref, self.yllcorner_ref, self.cellsize_ref)
+
+        for idx_obj_vector, idx_obj_loop in zip(idx_vector, idx_loop):
+            np.testing.assert_array_equal(idx_obj_vector, idx_obj_loop)
+
+        # the domain has cells inside and outside of the reference grid
+        assert (idx_vector[0] == -9999).any() and (idx_vector[0] != -9999).any()
+
+    def test_idx_map_round_trip(self):
+
+        idx_i_ref, idx_j_ref, idx_i_dom, _ = self.get_idx()
+        idx_mask_dom = idx_i_dom != -9999
+        idx_flat_dom = np.flatnonzero(idx_mask_dom)
+        idx_flat_ref = np.ravel_multi_index(
+            (idx_j_ref[idx_mask_dom], idx_i_ref[idx_mask_dom]), (self.rows_ref, self.cols_ref))
+
+        write_idx_map(self.file_name_idx, idx_flat_dom, idx_flat_ref, idx_mask_dom,
+                      shape_ref=(self.rows_ref, self.cols_ref), idx_signature=self.signature)
+        assert sorted(os.listdir(self.file_name_idx)) == [
+            'idx_flat_dom.npy', 'idx_flat_ref.npy', 'idx_mask_dom.npy', 'shape_ref.npy', 'signature.npy']
+
+        idx_map = read_idx_map(self.file_name_idx, idx_signature=self.signature)
+        assert isinstance(idx_map['idx_flat_dom'], np.memmap)
+        np.testing.assert_array_equal(idx_map['idx_flat_dom'], idx_flat_dom)
+        np.testing.assert_array_equal(idx_map['idx_flat_ref'], idx_flat_ref)
+        np.testing.assert_array_equal(idx_map['idx_mask_dom'], idx_mask_dom)
+        np.testing.assert_array_equal(idx_map['shape_ref'], [self.rows_ref, self.cols_ref])
+
+        # the map is not used if the grids are changed
+        signature_other = compute_idx_map_signature(
+            self.geo_x_dom + 0.1, self.geo_y_dom, [self.xllcorner_ref, self.yllcorner_ref, self.cellsize_ref])
+        assert read_idx_map(self.file_name_idx, idx_signature=signature_other) is None
+
+    def test_idx_map_missing(self):
+
+        assert read_idx_map(self.file_name_idx) is None
+
+        var_dset_in = xr.Dataset(
+            {'rain': (['latitude', 'longitude'], np.ones((9, 12)))},
+            coords={'latitude': self.geo_y_dom, 'longitude': self.geo_x_dom,
+                    'time': ('time', pd.DatetimeIndex(['2025-01-09 00:00']))})
+        geo_da_out = xr.DataArray(
+            np.zeros((self.rows_ref, self.cols_ref)), dims=['latitude', 'longitude'],
+            coords={'latitude': np.linspace(45.95, 44.05, self.rows_ref),
+                    'longitude': np.linspace(8.05, 10.95, self.cols_ref)})
+
+        # no index map and no terrain indexes
+        with self.assertRaises(RuntimeError):
+            apply_var_sample(var_dset_in, geo_da_out, None, None, None, None, sample_index=None)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+from shybox.dataset_toolkit.merge_grid.lib_utils_method_interpolate import apply_var_sample, compute_sample_index
+
+
+def sample_loop(var_values_in, shape_ref, i_cols_ref, j_rows_ref, i_cols_dom, j_rows_dom):
+    # reference: the cell by cell copy used before the vectorized scatter (the negative reference
+    # indexes are skipped, the loop wrapped them to the last rows/cols of the reference grid)
+    var_values_out = np.full(shape_ref, np.nan)
+    for i_dom, j_dom in zip(i_cols_dom.flatten(), j_rows_dom.flatten()):
+        if i_dom >= 0 and j_dom >= 0:
+            i_ref, j_ref = i_cols_ref[i_dom, j_dom], j_rows_ref[i_dom, j_dom]
+            if i_ref >= 0 and j_ref >= 0:
+                var_values_out[j_ref, i_ref] = var_values_in[i_dom, j_dom]
+    return var_values_out
+
+
+class TestMergeGridSample(unittest.TestCase):
+
+    """
+    Tests for sample method of merge_grid.
+    """
+
+    def setUp(self):
+        """
+        Setup test.
+        """
+        rng = np.random.default_rng(0)
+        self.shape_dom, self.shape_ref = (6, 8), (10, 12)
+
+        # domain cell (i, j) -> reference cell (3 + i, 2 + j)
+        rows, cols = np.meshgrid(np.arange(6), np.arange(8), indexing='ij')
+        self.i_cols_dom, self.j_rows_dom = rows.copy(), cols.copy()
+        self.i_cols_ref, self.j_rows_ref = 2 + cols, 3 + rows
+
+        # undefined domain cells (first row) and undefined reference cell
+        self.i_cols_dom[0, :] = -1
+        self.j_rows_ref[5, 7] = -1
+
+        self.values = {var_name: rng.random(self.shape_dom) for var_name in ['rain', 'snow', 'temp']}
+        time = pd.DatetimeIndex(['2025-01-09 00:00'])
+        self.var_dset_in = xr.Dataset(
+            {'rain': (['latitude', 'longitude', 'time'], self.values['rain'][:, :, np.newaxis]),
+             'snow': (['time', 'latitude', 'longitude'], self.values['snow'][np.newaxis]),
+             'temp': (['latitude', 'longitude'], self.values['temp'])},
+            coords={'latitude': np.linspace(45.5, 45.0, 6), 'longitude': np.linspace(8.0, 8.7, 8),
+                    'time': ('time', time)})
+
+        self.geo_da_out = xr.DataArray(
+            np.zeros(self.shape_ref), dims=['latitude', 'longitude'],
+            coords={'latitude': np.linspace(46.0, 45.1, 10), 'longitude': np.linspace(7.8, 8.9, 12)})
+
+    def test_sample_variables(self):
+
+        var_dset_out = apply_var_sample(self.var_dset_in, self.geo_da_out,
+                                        self.i_cols_ref, self.j_rows_ref, self.i_cols_dom, self.j_rows_dom)
+
+        for var_name, var_values in self.values.items():
+            var_out = var_dset_out[var_name]
+            assert var_out.dims == ('latitude', 'longitude', 'time')
+            assert var_out.shape == self.shape_ref + (1,)
+            np.testing.assert_array_equal(
+                var_out.values[:, :, 0],
+                sample_loop(var_values, self.shape_ref,
+                            self.i_cols_ref, self.j_rows_ref, self.i_cols_dom, self.j_rows_dom))
+
+        # the undefined cells are not written (the reference cell -1 is not wrapped to the last row)
+        rain_out = var_dset_out['rain'].values[:, :, 0]
+        assert np.isnan(rain_out[3, :]).all()
+        assert np.isnan(rain_out[-1, :]).all()
+        assert np.isfinite(rain_out).sum() == 5 * 8 - 1
+
+    def test_sample_index(self):
+
+        idx_flat_dom, idx_flat_ref = compute_sample_index(
+            self.i_cols_ref, self.j_rows_ref, self.i_cols_dom, self.j_rows_dom,
+            shape_dom=self.shape_dom, shape_ref=self.shape_ref)
+
+        # the flat indexes are in (row, col) order of the domain and of the reference grids
+        assert idx_flat_dom[0] == np.ravel_multi_index((1, 0), self.shape_dom)
+        assert idx_flat_ref[0] == np.ravel_multi_index((4, 2), self.shape_ref)
+        assert np.ravel_multi_index((5, 7), self.shape_dom) not in idx_flat_dom
+
+        # the precomputed indexes give the same values of the terrain indexes
+        var_dset_index = apply_var_sample(self.var_dset_in, self.geo_da_out, None, None, None, None,
+                                          sample_index=(idx_flat_dom, idx_flat_ref))
+        var_dset_terrain = apply_var_sample(self.var_dset_in, self.geo_da_out,
+                                            self.i_cols_ref, self.j_rows_ref, self.i_cols_dom, self.j_rows_dom)
+        xr.testing.assert_identical(var_dset_index, var_dset_terrain)
+
+
+if __name__ == '__main__':
+    unittest.main()
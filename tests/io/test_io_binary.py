@@ -0,0 +1,53 @@
+import unittest
+import tempfile
+import struct
+import os
+
+import numpy as np
+import pandas as pd
+
+from shybox.io_toolkit.lib_io_binary import open_data_binary, read_data_binary, write_data_binary
+
+
+class TestDataBinary(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.rows, self.cols, self.steps = 7, 5, 4
+        self.geo_x, self.geo_y = np.linspace(6.0, 7.0, self.cols), np.linspace(46.0, 45.0, self.rows)
+        self.values = np.round(np.random.default_rng(0).random((self.rows, self.cols, self.steps)) * 100, 1)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_write_read(self):
+        file_name = os.path.join(self.tmp_dir.name, 'rain.bin')
+        write_data_binary(file_name, self.values, var_format='i', var_scale_factor=10)
+
+        # layout of the continuum binaries: scaled integers in fortran order
+        with open(file_name, 'rb') as file_handle:
+            values_raw = struct.unpack('i' * self.values.size, file_handle.read())
+        np.testing.assert_array_equal(
+            np.reshape(values_raw, self.values.shape, order='F'), np.rint(self.values * 10))
+
+        var_time = pd.date_range('2025-01-01 00:00', periods=self.steps, freq='h')
+        for var_lazy in [False, True]:
+            var_da = read_data_binary(file_name, self.geo_x, self.geo_y, var_time=var_time,
+                                      var_time_steps_expected=self.steps, var_lazy=var_lazy)
+            self.assertEqual(var_da.shape, self.values.shape)
+            np.testing.assert_allclose(var_da.values, self.values, atol=1e-5)
+
+    def test_step_access(self):
+        file_name = os.path.join(self.tmp_dir.name, 'rain.bin')
+        write_data_binary(file_name, self.values, var_format='f', var_scale_factor=1, var_byte_order='>')
+
+        var_data = open_data_binary(file_name, self.rows, self.cols, var_format='f', var_byte_order='>')
+        self.assertEqual(var_data.shape, self.values.shape)
+        np.testing.assert_allclose(var_data[:, :, 2], self.values[:, :, 2], rtol=1e-6)
+
+        with self.assertRaises(IOError):
+            open_data_binary(file_name, self.rows + 1, self.cols, var_format='f')
+
+
+if __name__ == '__main__':
+    unittest.main()
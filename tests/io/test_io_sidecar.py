@@ -0,0 +1,137 @@
+import unittest
+import tempfile
+import gzip
+import os
+
+import numpy as np
+
+from shybox.io_toolkit.lib_io_ascii_point import get_file_point_section, get_file_point_lake
+from shybox.io_toolkit.lib_io_ascii_grid import get_file_grid
+from shybox.io_toolkit.lib_io_sidecar import get_sidecar_file, get_sidecar_source
+from shybox.io_toolkit.zip_handler_base import ZipHandler
+from shybox.io_toolkit.io_handler_base import IOHandler
+
+
+class TestPointSidecar(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+        self.file_section = os.path.join(self.tmp_dir.name, 'marche.info_section.txt')
+        with open(self.file_section, 'w') as file_handle:
+            file_handle.write('10 20 Esino Moie 101 1200.5 1.0 2.0\n'
+                              '15 25 Potenza Recanati 102 560.0 0.5 1.5\n')
+
+        self.file_lake = os.path.join(self.tmp_dir.name, 'marche.info_lake.txt')
+        with open(self.file_lake, 'w') as file_handle:
+            file_handle.write('1 # number of lakes\n'
+                              '### lake 1 ###\n'
+                              'Fiastrone # name\n'
+                              '12 34 # idx ji\n'
+                              '7 # cell code\n'
+                              '100.0 # volume min\n'
+                              '250.5 # volume init\n'
+                              '0.01 # constant draining\n')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_section(self):
+        dframe_text, dims_text = get_file_point_section(self.file_section, file_sidecar=False)
+        self.assertFalse(os.path.exists(get_sidecar_file(self.file_section)))
+
+        dframe_parse, _ = get_file_point_section(self.file_section)
+        self.assertTrue(os.path.exists(get_sidecar_file(self.file_section)))
+        dframe_cache, dims_cache = get_file_point_section(self.file_section)
+
+        self.assertEqual(dims_cache, dims_text)
+        self.assertTrue(dframe_cache.equals(dframe_text))
+        self.assertTrue(dframe_parse.equals(dframe_text))
+
+    def test_lake(self):
+        dframe_text, dims_text = get_file_point_lake(self.file_lake, file_sidecar=False)
+        get_file_point_lake(self.file_lake)
+        dframe_cache, dims_cache = get_file_point_lake(self.file_lake)
+
+        self.assertEqual(dims_cache, dims_text)
+        self.assertEqual(dframe_cache.index.tolist(), ['Fiastrone'])
+        self.assertEqual(dframe_cache.loc['Fiastrone', 'lake_idx_ji'], [12, 34])
+        self.assertTrue(dframe_cache.equals(dframe_text))
+
+    def test_invalidation(self):
+        get_file_point_lake(self.file_lake)
+
+        # the sidecar is not used when the source file changes
+        with open(self.file_lake, 'r') as file_handle:
+            file_text = file_handle.read().replace('250.5', '300.0')
+        with open(self.file_lake, 'w') as file_handle:
+            file_handle.write(file_text)
+        os.utime(self.file_lake, ns=(0, 0))
+
+        dframe_cache, _ = get_file_point_lake(self.file_lake)
+        np.testing.assert_equal(dframe_cache.loc['Fiastrone', 'lake_volume_init'], 300.0)
+
+
+class TestGridSidecar(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+        self.file_grid = os.path.join(self.tmp_dir.name, 'marche.dem.txt')
+        with open(self.file_grid, 'w') as file_handle:
+            file_handle.write('ncols 6\nnrows 5\nxllcorner 12.0\nyllcorner 43.0\ncellsize 0.5\nNODATA_value -9999\n')
+            for row in range(5):
+                file_handle.write(' '.join(str(row * 6 + col) for col in range(6)) + '\n')
+
+        self.file_gzip = self.file_grid.replace('.txt', '.asc.gz')
+        with open(self.file_grid, 'rb') as file_in, gzip.open(self.file_gzip, 'wb') as file_out:
+            file_out.write(file_in.read())
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_grid(self):
+        grid_text = get_file_grid(self.file_grid, file_sidecar=False)
+        get_file_grid(self.file_grid, file_sidecar=True)
+        self.assertTrue(os.path.exists(get_sidecar_file(self.file_grid, 'values')))
+
+        grid_cache = get_file_grid(self.file_grid, file_sidecar=True)
+        np.testing.assert_array_equal(grid_cache.values, grid_text.values)
+        self.assertEqual(grid_cache.attrs['transform'], grid_text.attrs['transform'])
+
+        # the window is selected from the mapped values
+        grid_window = get_file_grid(self.file_grid, row_start=1, row_end=3, col_start=2, file_sidecar=True)
+        np.testing.assert_array_equal(grid_window.values, grid_text.values[1:3, 2:])
+        self.assertIsInstance(grid_window.values, np.ndarray)
+        self.assertNotIsInstance(grid_window.values, np.memmap)
+
+    def test_grid_window_miss(self):
+        # a window read does not parse the full grid (and does not write the sidecar)
+        grid_window = get_file_grid(self.file_grid, row_start=1, row_end=3, col_start=2, file_sidecar=True)
+        self.assertEqual(grid_window.shape, (2, 4))
+        self.assertFalse(os.path.exists(get_sidecar_file(self.file_grid)))
+
+    def test_grid_handler(self):
+        # the grids read through the handler (e.g. the forcings) have no sidecar unless it is requested
+        IOHandler(file_name=self.file_grid, file_type='raster').get_data()
+        self.assertFalse(os.path.exists(get_sidecar_file(self.file_grid)))
+        self.assertFalse(os.path.exists(get_sidecar_file(self.file_grid, 'values')))
+
+        grid_handler = IOHandler(file_name=self.file_grid, file_type='raster', file_sidecar=True).get_data()
+        self.assertTrue(os.path.exists(get_sidecar_file(self.file_grid)))
+        np.testing.assert_array_equal(grid_handler.values, get_file_grid(self.file_grid).values)
+
+    def test_grid_gzip(self):
+        file_vsi = ZipHandler(self.file_gzip).get_vsi_file_name()
+        self.assertEqual(get_sidecar_source(file_vsi), os.path.abspath(self.file_gzip))
+        self.assertIsNone(get_sidecar_source('/vsicurl/https://data.example.org/dem.asc'))
+
+        grid_text = get_file_grid(self.file_grid, file_sidecar=False)
+        grid_gzip = get_file_grid(file_vsi, file_sidecar=True)
+        self.assertTrue(os.path.exists(get_sidecar_file(os.path.abspath(self.file_gzip))))
+        np.testing.assert_array_equal(get_file_grid(file_vsi, file_sidecar=True).values, grid_text.values)
+        np.testing.assert_array_equal(grid_gzip.values, grid_text.values)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+import tempfile
+import os
+
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+import rasterio as rio
+
+from shybox.io_toolkit import lib_io_ascii_grid
+from shybox.io_toolkit.lib_io_ascii_grid import get_file_window
+from shybox.io_toolkit.io_handler_base import IOHandler
+
+
+class TestFileWindow(unittest.TestCase):
+
+    def test_window(self):
+        window = get_file_window(20, 30, 5, 12, 3, 20)
+        self.assertEqual((window.row_off, window.col_off, window.height, window.width), (5, 3, 7, 17))
+
+    def test_window_slice_bounds(self):
+        # rows and cols follow the python slice rules (open and negative bounds, clip to the grid)
+        window = get_file_window(20, 30, None, 50, -5, None)
+        self.assertEqual((window.row_off, window.col_off, window.height, window.width), (0, 25, 20, 5))
+
+        window = get_file_window(20, 30, 15, 10, 0, 30)
+        self.assertEqual(window.height, 0)
+
+
+class TestWindowRead(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.values = np.arange(10 * 20, dtype='float32').reshape(10, 20)
+
+        self.file_ascii = os.path.join(self.tmp_dir.name, 'dem.txt')
+        with open(self.file_ascii, 'w') as file_handle:
+            file_handle.write('ncols 20\nnrows 10\nxllcorner 8.0\nyllcorner 43.0\ncellsize 0.1\nNODATA_value -9999\n')
+            for row in self.values:
+                file_handle.write(' '.join(str(int(value)) for value in row) + '\n')
+
+        self.file_nc = os.path.join(self.tmp_dir.name, 'rain.nc')
+        xr.Dataset({'rain': (('time', 'latitude', 'longitude'), self.values[np.newaxis])},
+                   coords={'time': pd.date_range('2025-01-01', periods=1),
+                           'latitude': np.linspace(43.95, 43.05, 10),
+                           'longitude': np.linspace(8.05, 9.95, 20)}).to_netcdf(self.file_nc)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_window_ascii(self):
+        io_handler = IOHandler(file_name=self.file_ascii, file_type='raster')
+        with mock.patch.object(lib_io_ascii_grid, 'read_file_grid', wraps=lib_io_ascii_grid.read_file_grid) as reader:
+            data = io_handler.get_data(row_start=2, row_end=5, col_start=4, col_end=10)
+
+        # the window is passed to the rasterio reader (not cropped after a full read)
+        self.assertEqual(reader.call_count, 1)
+        self.assertEqual({arg: reader.call_args.kwargs[arg] for arg in ['row_start', 'row_end', 'col_start', 'col_end']},
+                         {'row_start': 2, 'row_end': 5, 'col_start': 4, 'col_end': 10})
+
+        self.assertEqual(data.shape, (3, 6))
+        np.testing.assert_array_equal(data.values, self.values[2:5, 4:10])
+        np.testing.assert_allclose(data['longitude'].values, 8.45 + 0.1 * np.arange(6))
+        np.testing.assert_allclose(data['latitude'].values, [43.75, 43.65, 43.55])
+        self.assertTrue(data.attrs['transform'].almost_equals(rio.transform.from_origin(8.4, 43.8, 0.1, 0.1)))
+        self.assertEqual((data.attrs['high'], data.attrs['wide']), (3, 6))
+
+    def test_window_netcdf(self):
+        io_handler = IOHandler(file_name=self.file_nc, file_type='raster')
+        data = io_handler.get_data(row_start=2, row_end=5, col_start=4, col_end=10).data
+
+        self.assertEqual(data['rain'].shape, (1, 3, 6))
+        np.testing.assert_array_equal(data['rain'].values[0], self.values[2:5, 4:10])
+        np.testing.assert_allclose(data['longitude'].values, 8.45 + 0.1 * np.arange(6))
+        np.testing.assert_allclose(data['latitude'].values, [43.75, 43.65, 43.55])
+        self.assertTrue(data.attrs['transform'].almost_equals(
+            rio.transform.from_bounds(8.45, 43.55, 8.95, 43.75, 6, 3)))
+        self.assertEqual((data.attrs['high'], data.attrs['wide']), (3, 6))
+
+
+if __name__ == '__main__':
+    unittest.main()
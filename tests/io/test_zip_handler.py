@@ -0,0 +1,62 @@
+import unittest
+import tempfile
+import gzip
+import os
+
+from shybox.io_toolkit.zip_handler_base import ZipHandler, get_zip_extension
+from shybox.io_toolkit.lib_io_zip_cache import ZipCache
+
+
+class TestZipHandler(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.file_data = os.urandom(2 ** 16) * 4
+        self.file_name = os.path.join(self.tmp_dir.name, 'rain.tif.gz')
+        with gzip.open(self.file_name, 'wb') as file_handle:
+            file_handle.write(self.file_data)
+        self.zip_cache = ZipCache(os.path.join(self.tmp_dir.name, 'cache'))
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_zip_extension(self):
+        self.assertEqual(get_zip_extension(self.file_name), '.gz')
+        self.assertEqual(get_zip_extension('rain.nc.zst'), '.zst')
+        self.assertEqual(get_zip_extension('rain.nc.lz4'), '.lz4')
+        self.assertEqual(ZipHandler('rain.nc.zst', zip_extension='.zst').zip_format, 'zstd')
+
+    def test_stream(self):
+        zip_handler = ZipHandler(self.file_name, zip_cache=self.zip_cache)
+        self.assertEqual(zip_handler.get_vsi_file_name(), '/vsigzip/' + os.path.abspath(self.file_name))
+        with zip_handler.open_file_name() as file_handle:
+            self.assertEqual(file_handle.read(), self.file_data)
+        # nothing is uncompressed on disk
+        self.assertFalse(os.path.exists(zip_handler.file_name_uncompress))
+        self.assertFalse(os.path.exists(self.zip_cache.cache_dir))
+
+    def test_cache(self):
+        zip_handler = ZipHandler(self.file_name, zip_cache=self.zip_cache)
+        file_name = zip_handler.cache_file_name()
+        with open(file_name, 'rb') as file_handle:
+            self.assertEqual(file_handle.read(), self.file_data)
+        self.assertEqual(zip_handler.cache_file_name(), file_name)
+
+        # a modified file is uncompressed again
+        with gzip.open(self.file_name, 'wb') as file_handle:
+            file_handle.write(self.file_data[::-1])
+        os.utime(self.file_name, ns=(0, 0))
+        self.assertNotEqual(zip_handler.cache_file_name(), file_name)
+
+    def test_cache_eviction(self):
+        zip_cache = ZipCache(os.path.join(self.tmp_dir.name, 'cache_small'), cache_size=len(self.file_data))
+        for file_id in range(3):
+            file_name = os.path.join(self.tmp_dir.name, f'rain_{file_id}.nc.gz')
+            with gzip.open(file_name, 'wb') as file_handle:
+                file_handle.write(self.file_data)
+            file_cache = ZipHandler(file_name, zip_cache=zip_cache).cache_file_name()
+        self.assertEqual(os.listdir(zip_cache.cache_dir), [os.path.basename(file_cache)])
+
+
+if __name__ == '__main__':
+    unittest.main()
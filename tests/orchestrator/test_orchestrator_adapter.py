@@ -0,0 +1,80 @@
+import unittest
+
+import numpy as np
+import xarray as xr
+import rioxarray
+
+from shybox.orchestrator_toolkit.lib_orchestrator_utils import (
+    as_process,
+    xarray_to_mem, mem_to_xarray, xarray_to_vsimem, vsimem_to_xarray,
+    xarray_to_gdal, gdal_to_xarray, xarray_to_file, file_to_xarray)
+
+
+def make_raster(rows: int = 6, cols: int = 8) -> xr.DataArray:
+    data_values = np.arange(rows * cols, dtype=np.float32).reshape(1, rows, cols)
+    data_array = xr.DataArray(
+        data_values, dims=['band', 'y', 'x'],
+        coords={'band': [1], 'y': 45.0 - (np.arange(rows) + 0.5) * 0.01, 'x': 8.0 + (np.arange(cols) + 0.5) * 0.01})
+    data_array = data_array.rio.write_crs('EPSG:4326')
+    return data_array.rio.write_nodata(-9999.0)
+
+
+class TestOrchestratorAdapter(unittest.TestCase):
+
+    """
+    Tests for the in memory adapters of as_process.
+    """
+
+    def setUp(self):
+        """
+        Setup test.
+        """
+        self.data_array = make_raster()
+
+    def check_same(self, data_mem: xr.DataArray, data_tmp: xr.DataArray):
+        np.testing.assert_array_equal(data_mem.values, data_tmp.values)
+        np.testing.assert_array_equal(data_mem.values, self.data_array.values)
+        assert data_mem.rio.transform().almost_equals(data_tmp.rio.transform())
+        assert data_mem.rio.crs == data_tmp.rio.crs
+        assert data_mem.rio.nodata == data_tmp.rio.nodata
+
+    def test_adapter_gdal(self):
+
+        data_mem = mem_to_xarray(xarray_to_mem(self.data_array))
+        data_tmp = gdal_to_xarray(xarray_to_gdal(self.data_array))
+        self.check_same(data_mem, data_tmp)
+
+    def test_adapter_file(self):
+
+        data_mem = vsimem_to_xarray(xarray_to_vsimem(self.data_array))
+        data_tmp = file_to_xarray(xarray_to_file(self.data_array))
+        self.check_same(data_mem, data_tmp)
+
+    def test_adapter_copy(self):
+
+        # a process writing into its input dataset does not change the source data
+        gdal_dataset = xarray_to_mem(self.data_array)
+        gdal_dataset.GetRasterBand(1).WriteArray(np.zeros((6, 8), dtype=np.float32))
+        gdal_dataset.FlushCache()
+        assert self.data_array.values.sum() == np.arange(48).sum()
+
+    def test_adapter_default(self):
+
+        @as_process(input_type='file', output_type='xarray')
+        def read_file(data):
+            with open(data, 'rb') as file_handle:
+                assert len(file_handle.read()) > 0
+            return file_to_xarray(data).load()
+
+        # the temporary files are the default, the 'file' inputs are plain paths
+        assert read_file.adapter == 'tmp'
+        np.testing.assert_array_equal(read_file(self.data_array).values, self.data_array.values)
+
+    def test_adapter_unknown(self):
+
+        with self.assertRaises(ValueError):
+            as_process(adapter='none')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import unittest
+import tempfile
+import os
+
+import pandas as pd
+
+from shybox.orchestrator_toolkit.lib_orchestrator_utils import as_process
+from shybox.orchestrator_toolkit.orchestrator_handler_base import OrchestratorHandler
+from shybox.orchestrator_toolkit.lib_orchestrator_cache import ProcessorCache, hash_object
+from shybox.type_toolkit.io_dataset_grid import DataObj
+
+
+class SourceData(DataObj):
+
+    """
+    Source returning the hour of the time step.
+    """
+
+    def get_data(self, time=None, time_step=None, **kwargs):
+        return time_step.hour
+
+
+class OutputData(DataObj):
+
+    """
+    Output collecting the written values.
+    """
+
+    def write_data(self, data, time=None, metadata=None, **kwargs):
+        self.written.append((time, data))
+
+
+N_CALLS = {'scale': 0}
+
+
+@as_process(input_type='xarray', output_type='xarray')
+def scale_data(data, factor=1):
+    N_CALLS['scale'] += 1
+    return data * factor
+
+
+@as_process(input_type='xarray', output_type='xarray')
+def apply_data(data, fx=None):
+    N_CALLS['scale'] += 1
+    return fx(data)
+
+
+class TestOrchestratorCache(unittest.TestCase):
+
+    """
+    Tests for orchestrator process cache.
+    """
+
+    def setUp(self):
+        """
+        Setup test.
+        """
+        self.tmp_path = tempfile.mkdtemp()
+        self.cache_path = tempfile.mkdtemp()
+        self.time_steps = pd.date_range('2025-01-09 00:00', '2025-01-09 03:00', freq='h')
+        for ts in self.time_steps:
+            open(os.path.join(self.tmp_path, ts.strftime('in_%Y%m%d%H%M.nc')), 'w').close()
+
+    def test_cache_eviction(self):
+
+        cache = ProcessorCache(os.path.join(self.cache_path, 'small'), cache_size=4000)
+        for key_id in range(6):
+            cache.set(f'{key_id:02d}' * 32, b'x' * 1000)
+            os.utime(cache.get_file(f'{key_id:02d}' * 32), (key_id, key_id))
+
+        # the least recently used entries are removed down to evict_ratio * cache_size
+        assert cache.cache_bytes <= cache.cache_size
+        assert cache.get('00' * 32) is None
+        assert cache.get('05' * 32) is not None
+        assert ProcessorCache(cache.cache_dir, cache_size=4000).cache_bytes == cache.cache_bytes
+
+    def test_cache_unhashable(self):
+
+        # objects that can not be pickled are not hashed (no unstable keys from their repr)
+        assert hash_object({'factor': 2}) == hash_object({'factor': 2})
+        assert hash_object({'fx': lambda value: value}) is None
+
+        N_CALLS['scale'] = 0
+        for _ in range(2):
+            data_in = SourceData(path=self.tmp_path, file_name='in_%Y%m%d%H%M.nc')
+            orc_process = OrchestratorHandler(data_in=data_in, options={'cache_dir': self.cache_path})
+            orc_process.add_process(apply_data, fx=lambda value: value * 2)
+            orc_process.run(time=self.time_steps)
+        assert N_CALLS['scale'] == 2 * len(self.time_steps)
+
+    def run_orchestrator(self, factor=2):
+        data_in = SourceData(path=self.tmp_path, file_name='in_%Y%m%d%H%M.nc')
+        data_out = OutputData(path=self.tmp_path, file_name='out_%Y%m%d%H%M.nc')
+        data_out.written = []
+
+        orc_process = OrchestratorHandler(data_in=data_in, data_out=data_out, options={'cache_dir': self.cache_path})
+        orc_process.add_process(scale_data, data_out, factor=factor)
+        orc_process.run(time=self.time_steps)
+        return data_out.written
+
+    def test_cache_hit(self):
+
+        N_CALLS['scale'] = 0
+        written_first = self.run_orchestrator()
+        assert N_CALLS['scale'] == len(self.time_steps)
+
+        # same sources and arguments: all the outputs come from the cache
+        written_second = self.run_orchestrator()
+        assert N_CALLS['scale'] == len(self.time_steps)
+        assert written_second == written_first
+
+        # a modified source and different arguments are computed again
+        file_touched = os.path.join(self.tmp_path, self.time_steps[0].strftime('in_%Y%m%d%H%M.nc'))
+        os.utime(file_touched, (0, 0))
+        self.run_orchestrator()
+        assert N_CALLS['scale'] == len(self.time_steps) + 1
+        self.run_orchestrator(factor=3)
+        assert N_CALLS['scale'] == 2 * len(self.time_steps) + 1
+
+
+if __name__ == '__main__':
+    unittest.main()
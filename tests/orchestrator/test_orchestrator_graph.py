@@ -0,0 +1,160 @@
+import unittest
+import tempfile
+import os
+
+import numpy as np
+import pandas as pd
+
+from shybox.orchestrator_toolkit.lib_orchestrator_utils import as_process
+from shybox.orchestrator_toolkit.orchestrator_handler_base import OrchestratorHandler
+from shybox.orchestrator_toolkit.lib_orchestrator_stats import dump_stats, measure_phase, reset_rss_peak
+from shybox.type_toolkit.io_dataset_grid import DataObj, DataMem
+
+
+class SourceData(DataObj):
+
+    """
+    Source returning the hour of the time step and counting the reads.
+    """
+
+    def get_data(self, time=None, time_step=None, **kwargs):
+        self.n_reads += 1
+        return time_step.hour
+
+
+class OutputData(DataObj):
+
+    """
+    Output collecting the written values.
+    """
+
+    def write_data(self, data, time=None, metadata=None, **kwargs):
+        self.written.append((time, data))
+
+
+N_CALLS = {'shift': 0}
+
+
+@as_process(input_type='xarray', output_type='xarray')
+def shift_data(data, offset=0):
+    N_CALLS['shift'] += 1
+    return data + offset
+
+
+@as_process(input_type='xarray', output_type='xarray')
+def scale_data(data, factor=1):
+    return data * factor
+
+
+@as_process(input_type='xarray', output_type='xarray')
+def combine_data(data, other=0):
+    return data + other
+
+
+class TestOrchestratorGraph(unittest.TestCase):
+
+    """
+    Tests for orchestrator process graph.
+    """
+
+    def setUp(self):
+        """
+        Setup test.
+        """
+        self.tmp_path = tempfile.mkdtemp()
+        self.time_steps = pd.date_range('2025-01-09 00:00', '2025-01-09 02:00', freq='h')
+
+    def test_graph_diamond(self):
+
+        data_in = SourceData(path=self.tmp_path, file_name='in_%Y%m%d%H%M.nc')
+        data_in.n_reads = 0
+        data_out = OutputData(path=self.tmp_path, file_name='out_%Y%m%d%H%M.nc')
+        data_out.written = []
+
+        # shift -> (scale_a, scale_b) -> combine
+        orc_process = OrchestratorHandler(data_in=data_in, data_out=data_out, options={'graph_workers': 2})
+        orc_process.add_process(shift_data, name='shift', offset=1)
+        orc_process.add_process(scale_data, name='scale_a', inputs='shift', factor=2)
+        orc_process.add_process(scale_data, name='scale_b', inputs='shift', factor=3)
+        orc_process.add_process(combine_data, data_out, inputs={'data': 'scale_a', 'other': 'scale_b'})
+
+        assert orc_process.graph.get_layers() == [['shift'], ['scale_a', 'scale_b'], ['combine_data']]
+        assert orc_process.graph.get_sinks() == ['combine_data']
+
+        N_CALLS['shift'] = 0
+        orc_process.run(time=self.time_steps)
+
+        # the shared upstream process is run (and the source is read) once per time step
+        assert N_CALLS['shift'] == len(self.time_steps)
+        assert data_in.n_reads == len(self.time_steps)
+        assert [value for _, value in data_out.written] == [(ts.hour + 1) * 5 for ts in self.time_steps]
+
+    def test_graph_memory_output(self):
+
+        data_in = SourceData(path=self.tmp_path, file_name='in_%Y%m%d%H%M.nc')
+        data_in.n_reads = 0
+        data_out = OutputData(path=self.tmp_path, file_name='out_%Y%m%d%H%M.nc')
+        data_out.written = []
+
+        # the in memory outputs link the arguments to the previous processes (shift -> scale -> combine)
+        orc_process = OrchestratorHandler(data_in=data_in, data_out=data_out)
+        orc_process.add_process(shift_data, offset=1)
+        orc_process.add_process(scale_data, factor=2)
+        orc_process.add_process(combine_data, data_out, other=orc_process.processes[0].output)
+
+        assert isinstance(orc_process.processes[0].output, DataMem)
+        assert orc_process.processes[0].output.name == 'shift_data'
+        assert orc_process.graph.inputs['combine_data'] == {'data': 'scale_data', 'other': 'shift_data'}
+
+        orc_process.run(time=self.time_steps)
+        assert [value for _, value in data_out.written] == [(ts.hour + 1) * 3 for ts in self.time_steps]
+
+    def test_graph_stats(self):
+
+        data_in = SourceData(path=self.tmp_path, file_name='in_%Y%m%d%H%M.nc')
+        data_in.n_reads = 0
+        data_out = OutputData(path=self.tmp_path, file_name='out_%Y%m%d%H%M.nc')
+        data_out.written = []
+
+        stats_file = os.path.join(self.tmp_path, 'stats.csv')
+        orc_process = OrchestratorHandler(data_in=data_in, data_out=data_out, options={'stats_file': stats_file})
+        orc_process.add_process(shift_data, name='shift', offset=1)
+        orc_process.add_process(scale_data, data_out, name='scale', factor=2)
+        orc_process.run(time=self.time_steps)
+
+        # a record for each phase of each process and time step
+        stats = orc_process.get_stats()
+        phases = stats.groupby('process')['phase'].apply(list).to_dict()
+        assert phases['shift'] == ['get_data', 'fx'] * len(self.time_steps)
+        assert phases['scale'] == ['fx', 'write_data'] * len(self.time_steps)
+        assert (stats['wall_time'] >= 0).all()
+        assert stats['rss_peak_delta_process'].notna().all()
+        assert len(pd.read_csv(stats_file)) == len(stats)
+        with self.assertRaises(ValueError):
+            dump_stats(orc_process.stats, os.path.join(self.tmp_path, 'stats.txt'))
+
+    def test_stats_peak(self):
+
+        if not reset_rss_peak():
+            self.skipTest('peak rss not available')
+
+        # a temporary freed in the phase is counted in its peak (and in the peak of the enclosing phase)
+        stats = []
+        with measure_phase(stats, 'outer', 'fx'):
+            with measure_phase(stats, 'inner', 'fx'):
+                data_tmp = np.ones(2 ** 24)
+                del data_tmp
+        stats = {record['process']: record['rss_peak_delta_process'] for record in stats}
+        assert stats['inner'] >= 2 ** 27
+        assert stats['outer'] >= stats['inner']
+
+    def test_graph_undefined_input(self):
+
+        data_in = SourceData(path=self.tmp_path, file_name='in_%Y%m%d%H%M.nc')
+        orc_process = OrchestratorHandler(data_in=data_in)
+        with self.assertRaises(ValueError):
+            orc_process.add_process(scale_data, inputs='missing')
+
+
+if __name__ == '__main__':
+    unittest.main()
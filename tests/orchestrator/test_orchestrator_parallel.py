@@ -0,0 +1,70 @@
+import unittest
+import tempfile
+
+import pandas as pd
+
+from shybox.orchestrator_toolkit.lib_orchestrator_utils import as_process
+from shybox.orchestrator_toolkit.orchestrator_handler_base import OrchestratorHandler
+from shybox.type_toolkit.io_dataset_grid import DataObj
+
+
+class SourceData(DataObj):
+
+    """
+    Source returning the hour of the time step (hour 3 is missing).
+    """
+
+    def get_data(self, time=None, time_step=None, **kwargs):
+        if time_step.hour == 3:
+            raise IOError('Time step not available')
+        return time_step.hour
+
+
+class OutputData(DataObj):
+
+    """
+    Output collecting the written values.
+    """
+
+    def write_data(self, data, time=None, metadata=None, **kwargs):
+        self.written.append((time, data))
+
+
+@as_process(input_type='xarray', output_type='xarray')
+def scale_data(data, factor=1):
+    return data * factor
+
+
+class TestOrchestratorParallel(unittest.TestCase):
+
+    """
+    Tests for orchestrator parallel mode.
+    """
+
+    def setUp(self):
+        """
+        Setup test.
+        """
+        self.tmp_path = tempfile.mkdtemp()
+        self.time_steps = pd.date_range('2025-01-09 00:00', '2025-01-09 07:00', freq='h')
+
+    def test_parallel_run(self):
+
+        data_in = SourceData(path=self.tmp_path, file_name='in_%Y%m%d%H%M.nc')
+        data_out = OutputData(path=self.tmp_path, file_name='out_%Y%m%d%H%M.nc')
+        data_out.written = []
+
+        orc_process = OrchestratorHandler(
+            data_in=data_in, data_out=data_out, options={'run_mode': 'parallel', 'max_workers': 3})
+        orc_process.add_process(scale_data, data_out, factor=2)
+        orc_process.run(time=self.time_steps)
+
+        # outputs are written in time order, the failed time step is only reported
+        expected_times = [ts for ts in self.time_steps if ts.hour != 3]
+        assert [ts for ts, _ in data_out.written] == expected_times
+        assert [value for _, value in data_out.written] == [ts.hour * 2 for ts in expected_times]
+        assert list(orc_process.failed_steps.keys()) == [pd.Timestamp('2025-01-09 03:00')]
+
+
+if __name__ == '__main__':
+    unittest.main()
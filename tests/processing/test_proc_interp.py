@@ -0,0 +1,53 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+from shybox.processing_toolkit.lib_proc_interp import interpolate_data
+from shybox.processing_toolkit.lib_proc_plan import ResamplePlan
+
+
+class TestInterpolateData(unittest.TestCase):
+
+    """
+    Tests for interpolate data.
+    """
+
+    def setUp(self):
+        """
+        Setup test.
+        """
+        self.geo_x_in, self.geo_y_in = np.linspace(8.0, 10.0, 60), np.linspace(45.0, 44.0, 50)
+        self.geo_x_out, self.geo_y_out = np.linspace(8.1, 10.2, 70), np.linspace(44.9, 43.9, 65)
+        self.time = pd.date_range('2025-01-09 00:00', periods=3, freq='h')
+
+        rng = np.random.default_rng(0)
+        self.data = xr.Dataset(
+            {'rain': (('latitude', 'longitude'), rng.random((50, 60)), {'units': 'mm'}),
+             'air_t': (('time', 'latitude', 'longitude'), rng.random((3, 50, 60)), {'units': 'C'})},
+            coords={'longitude': self.geo_x_in, 'latitude': self.geo_y_in, 'time': self.time},
+            attrs={'source': 'test'})
+        self.ref = xr.DataArray(
+            np.zeros((65, 70)), dims=('latitude', 'longitude'),
+            coords={'longitude': self.geo_x_out, 'latitude': self.geo_y_out})
+
+    def test_interpolate_batched(self):
+
+        output = interpolate_data(self.data, ref=self.ref, method='gauss', max_distance=18000, neighbours=4)
+        plan = ResamplePlan.from_grids(self.geo_x_in, self.geo_y_in, self.geo_x_out, self.geo_y_out,
+                                       method='gauss', max_distance=18000, neighbours=4)
+
+        # all the variables are resampled together and unstacked with their dimensions and attributes
+        assert output['rain'].dims == ('latitude', 'longitude')
+        assert output['air_t'].dims == ('time', 'latitude', 'longitude')
+        assert output['air_t'].attrs == {'units': 'C'}
+        assert output.attrs == {'source': 'test'}
+        np.testing.assert_allclose(output['rain'].values, plan.apply(self.data['rain'].values))
+        for time_id in range(self.time.shape[0]):
+            np.testing.assert_allclose(output['air_t'].values[time_id],
+                                       plan.apply(self.data['air_t'].values[time_id]))
+
+
+if __name__ == '__main__':
+    unittest.main()
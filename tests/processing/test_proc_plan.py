@@ -0,0 +1,106 @@
+import unittest
+import tempfile
+import os
+
+import numpy as np
+
+from pyresample.geometry import GridDefinition
+from pyresample.kd_tree import resample_nearest, resample_gauss
+
+from scipy.interpolate import RegularGridInterpolator
+
+from concurrent.futures import ThreadPoolExecutor
+
+from shybox.processing_toolkit.lib_proc_plan import ResamplePlan, RegularResamplePlan, get_resample_plan, PLANS, PLANS_SIZE
+
+
+class TestResamplePlan(unittest.TestCase):
+
+    """
+    Tests for resampling plan.
+    """
+
+    def setUp(self):
+        """
+        Setup test.
+        """
+        self.geo_x_in, self.geo_y_in = np.linspace(8.0, 10.0, 60), np.linspace(45.0, 44.0, 50)
+        self.geo_x_out, self.geo_y_out = np.linspace(8.1, 10.2, 70), np.linspace(44.9, 43.9, 65)
+        self.values = np.random.default_rng(0).random((50, 60))
+        self.values[10:15, 10:15] = np.nan
+
+        self.grid_in = GridDefinition(*np.meshgrid(self.geo_x_in, self.geo_y_in))
+        self.grid_out = GridDefinition(*np.meshgrid(self.geo_x_out, self.geo_y_out))
+
+        PLANS.clear()
+
+    def test_plan_pyresample(self):
+
+        plan_nn = ResamplePlan.from_grids(self.geo_x_in, self.geo_y_in, self.geo_x_out, self.geo_y_out,
+                                          method='nn', max_distance=18000)
+        values_nn = resample_nearest(self.grid_in, self.values, self.grid_out,
+                                     radius_of_influence=18000, fill_value=np.nan)
+        np.testing.assert_allclose(plan_nn.apply(self.values), values_nn)
+
+        plan_gauss = ResamplePlan.from_grids(self.geo_x_in, self.geo_y_in, self.geo_x_out, self.geo_y_out,
+                                             method='gauss', max_distance=18000, neighbours=4)
+        values_gauss = resample_gauss(self.grid_in, self.values, self.grid_out, radius_of_influence=18000,
+                                      neighbours=4, sigmas=250000, fill_value=np.nan)
+        np.testing.assert_allclose(plan_gauss.apply(self.values), values_gauss)
+
+    def test_plan_regular(self):
+
+        # regular grids use the index arithmetic
+        plan_nn = get_resample_plan(self.geo_x_in, self.geo_y_in, self.geo_x_out, self.geo_y_out,
+                                    method='nn', max_distance=18000)
+        assert isinstance(plan_nn, RegularResamplePlan)
+        values_nn = resample_nearest(self.grid_in, self.values, self.grid_out,
+                                     radius_of_influence=18000, fill_value=np.nan)
+        np.testing.assert_allclose(plan_nn.apply(self.values), values_nn)
+
+        plan_linear = get_resample_plan(self.geo_x_in, self.geo_y_in, self.geo_x_out, self.geo_y_out,
+                                        method='linear')
+        interp_obj = RegularGridInterpolator((self.geo_y_in[::-1], self.geo_x_in), self.values[::-1],
+                                             bounds_error=False, fill_value=np.nan)
+        geo_y_grid, geo_x_grid = np.meshgrid(self.geo_y_out, self.geo_x_out, indexing='ij')
+        values_linear = interp_obj((geo_y_grid, geo_x_grid))
+        values_mask = np.isfinite(values_linear)
+        np.testing.assert_allclose(plan_linear.apply(self.values)[values_mask], values_linear[values_mask])
+
+    def test_plan_cache(self):
+
+        plan_dir = tempfile.mkdtemp()
+        plan_obj = get_resample_plan(self.geo_x_in, self.geo_y_in, self.geo_x_out, self.geo_y_out,
+                                     method='gauss', plan_dir=plan_dir)
+        assert get_resample_plan(self.geo_x_in, self.geo_y_in, self.geo_x_out, self.geo_y_out,
+                                 method='gauss', plan_dir=plan_dir) is plan_obj
+        assert len(os.listdir(plan_dir)) == 1
+
+        # the plan is loaded from disk when it is not in memory
+        PLANS.clear()
+        plan_file = get_resample_plan(self.geo_x_in, self.geo_y_in, self.geo_x_out, self.geo_y_out,
+                                      method='gauss', plan_dir=plan_dir)
+        assert plan_file is not plan_obj
+        np.testing.assert_array_equal(plan_file.apply(self.values), plan_obj.apply(self.values))
+
+    def test_plan_threads(self):
+
+        # the threads share the plans of the same grids and the cache is not larger than its size
+        def get_plan(step):
+            return get_resample_plan(self.geo_x_in, self.geo_y_in, self.geo_x_out + 0.01 * (step % 12),
+                                     self.geo_y_out, method='nn', max_distance=18000)
+
+        with ThreadPoolExecutor(8) as executor:
+            plans = list(executor.map(get_plan, range(96)))
+        assert len(PLANS) <= PLANS_SIZE
+        assert all([isinstance(plan_obj, RegularResamplePlan) for plan_obj in plans])
+
+        PLANS.clear()
+        with ThreadPoolExecutor(8) as executor:
+            plans = list(executor.map(get_plan, [0] * 32))
+        assert len(PLANS) == 1
+        assert all([plan_obj is plans[0] for plan_obj in plans])
+
+
+if __name__ == '__main__':
+    unittest.main()
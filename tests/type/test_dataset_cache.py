@@ -0,0 +1,126 @@
+import unittest
+import tempfile
+import os
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+from shybox.type_toolkit.io_dataset_base import Dataset
+from shybox.type_toolkit.io_dataset_grid import DataObj
+from shybox.type_toolkit.io_data_cache import DataCache, data_cache
+
+
+class CountingData(DataObj):
+
+    """
+    Dataset counting the files read.
+    """
+
+    type = 'counting_dataset'
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.n_reads = 0
+
+    def _read_data(self, input_path):
+        self.n_reads += 1
+        values = np.full((4, 5), float(os.path.getsize(input_path)))
+        return xr.DataArray(values, dims=['latitude', 'longitude'],
+                            coords={'latitude': np.linspace(45.0, 44.0, 4), 'longitude': np.linspace(8.0, 9.0, 5)})
+
+
+class TestDatasetCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.times = [pd.Timestamp('2025-01-01'), pd.Timestamp('2025-01-02')]
+        for time_id, time in enumerate(self.times):
+            with open(os.path.join(self.tmp_dir.name, time.strftime('rain_%Y%m%d.tif')), 'w') as file_handle:
+                file_handle.write('x' * (time_id + 1))
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def make_dataset(self, **kwargs):
+        return CountingData(loc_pattern=os.path.join(self.tmp_dir.name, 'rain_%Y%m%d.tif'), **kwargs)
+
+    def test_cache_hits(self):
+        data_obj = self.make_dataset(data_cache_size=2 ** 20)
+        for _ in range(3):
+            for time_id, time in enumerate(self.times):
+                data = data_obj.get_data(time)
+                self.assertEqual(float(data[0, 0]), time_id + 1)
+
+        self.assertEqual(data_obj.n_reads, 2)
+        self.assertEqual((data_obj.data_cache.hits, data_obj.data_cache.misses), (4, 2))
+
+        # the returned data are copies of the cached data
+        data.values[:] = -1
+        self.assertEqual(float(data_obj.get_data(self.times[1])[0, 0]), 2)
+
+    def test_cache_shared(self):
+        data_obj, data_other = self.make_dataset(), self.make_dataset(nan_value=-1)
+        self.assertIs(data_obj.data_cache, data_cache)
+
+        # the steps of a daily file share the entry, the entries of the datasets are not mixed
+        entries = len(data_cache)
+        for time in pd.date_range(self.times[0], periods=6, freq='4h'):
+            data_obj.get_data(time)
+            data_other.get_data(time)
+        self.assertEqual((data_obj.n_reads, data_other.n_reads), (1, 1))
+        self.assertEqual(len(data_cache), entries + 2)
+
+    def test_cache_lazy(self):
+        data_cache_lazy = DataCache(2 ** 20)
+        data_lazy = xr.DataArray(np.ones((4, 5)), dims=['latitude', 'longitude']).chunk({'latitude': 2})
+        data_cache_lazy.set(('lazy', None), data_lazy)
+        data_cache_lazy.set(('eager', None), data_lazy.compute())
+        self.assertEqual(list(data_cache_lazy._entries), [('eager', None)])
+        self.assertFalse(DataCache.is_lazy(xr.Dataset({'rain': data_lazy.compute()})))
+
+    def test_cache_budget(self):
+        data_obj = self.make_dataset(data_cache_size=100)
+        for time in self.times + self.times:
+            data_obj.get_data(time)
+        self.assertEqual(data_obj.n_reads, 4)
+        self.assertLessEqual(data_obj.data_cache.nbytes, 100)
+
+    def test_cache_invalidation(self):
+        data_obj = self.make_dataset()
+        data_obj.get_data(self.times[0])
+
+        data_obj.rm_data(self.times[0])
+        self.assertEqual(len(data_obj.data_cache), 0)
+        with self.assertRaises(ValueError):
+            data_obj.get_data(self.times[0])
+
+    def test_cache_external_write(self):
+        data_obj = self.make_dataset()
+        self.assertEqual(float(data_obj.get_data(self.times[0])[0, 0]), 1)
+
+        # a file rewritten outside of the dataset is read again
+        file_name = data_obj.get_key(self.times[0])
+        with open(file_name, 'w') as file_handle:
+            file_handle.write('x' * 5)
+        os.utime(file_name, ns=(os.stat(file_name).st_atime_ns, os.stat(file_name).st_mtime_ns + 10 ** 9))
+        self.assertEqual(float(data_obj.get_data(self.times[0])[0, 0]), 5)
+        self.assertEqual(data_obj.n_reads, 2)
+
+    def test_template_skeleton(self):
+        data_obj = self.make_dataset()
+        data_obj.get_data(self.times[0])
+        template_dict = data_obj.get_template_dict(make_it=False)
+
+        data_1 = Dataset.set_data_to_template(np.ones((4, 5)), template_dict)
+        data_2 = Dataset.set_data_to_template(np.zeros((4, 5)), template_dict)
+        data_1.attrs['name'] = 'rain'
+
+        self.assertIs(Dataset.get_template_skeleton(template_dict), Dataset.get_template_skeleton(template_dict))
+        self.assertTrue(data_1.latitude.equals(data_2.latitude))
+        self.assertNotIn('name', data_2.attrs)
+        self.assertEqual(float(data_1.sum() - data_2.sum()), 20)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+import tempfile
+import os
+
+from unittest import mock
+
+import pandas as pd
+
+from shybox.type_toolkit.io_dataset_grid import DataObj
+from shybox.type_toolkit.io_inventory import FileInventory
+
+
+class TestDatasetInventory(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.data_dir = os.path.join(self.tmp_dir.name, 'data')
+        for file_time in ['2025-01-01', '2025-01-02', '2025-02-03']:
+            self.touch(pd.Timestamp(file_time).strftime('%Y/%m/rain_%Y%m%d.tif'))
+        self.touch('2025/01/readme.txt')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def touch(self, file_name):
+        file_path = os.path.join(self.data_dir, file_name)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        open(file_path, 'w').close()
+        return file_path
+
+    def make_dataset(self, inventory):
+        return DataObj(loc_pattern=os.path.join(self.data_dir, '%Y', '%m', 'rain_%Y%m%d.tif'),
+                       inventory=inventory, inventory_dir=os.path.join(self.tmp_dir.name, 'inventory'))
+
+    def test_inventory_matches_walk(self):
+        data_walk, data_inventory = self.make_dataset(False), self.make_dataset(True)
+
+        self.assertIsNone(data_walk.inventory)
+        self.assertEqual(sorted(data_walk.get_available_keys()), sorted(data_inventory.get_available_keys()))
+
+        time_range = pd.date_range('2025-01-02', '2025-02-28')
+        self.assertEqual(data_walk.get_times(time_range), data_inventory.get_times(time_range))
+        self.assertEqual(len(data_inventory.get_times(time_range)), 2)
+
+    def test_time_bounds(self):
+        for inventory in [False, True]:
+            data_obj = self.make_dataset(inventory)
+            self.assertEqual(data_obj.get_first_date(), pd.Timestamp('2025-01-01'))
+            self.assertEqual(data_obj.get_last_date(), pd.Timestamp('2025-02-03'))
+            self.assertEqual(data_obj.get_last_date(now=pd.Timestamp('2025-01-31')), pd.Timestamp('2025-01-02'))
+            self.assertEqual(data_obj.get_first_date(n=2), [pd.Timestamp('2025-01-01'), pd.Timestamp('2025-01-02')])
+            self.assertEqual(data_obj.get_time_bounds(), (pd.Timestamp('2025-01-01'), pd.Timestamp('2025-02-03')))
+
+    def test_inventory_refresh(self):
+        data_inventory = self.make_dataset(True)
+        self.assertEqual(len(data_inventory.get_available_keys()), 3)
+
+        file_new = self.touch('2025/02/rain_20250204.tif')
+        self.assertIn(file_new, data_inventory.get_available_keys())
+
+        os.remove(file_new)
+        self.assertNotIn(file_new, data_inventory.get_available_keys())
+        self.assertEqual(len(data_inventory.get_available_keys()), 3)
+
+    def test_inventory_scan_changed(self):
+        data_inventory = self.make_dataset(True)
+        data_inventory.get_available_keys()
+
+        # only the changed directories are listed again (the new ones are walked)
+        with mock.patch.object(FileInventory, '_scan_dir', wraps=FileInventory._scan_dir) as scan_dir:
+            self.assertEqual(len(data_inventory.get_available_keys()), 3)
+            self.assertEqual(scan_dir.call_count, 0)
+
+            self.touch('2025/02/rain_20250205.tif')
+            self.touch('2025/03/rain_20250301.tif')
+            self.assertEqual(len(data_inventory.get_available_keys()), 5)
+            self.assertEqual(sorted(os.path.relpath(call.args[0], self.data_dir) for call in scan_dir.call_args_list),
+                             ['2025', '2025/02', '2025/03'])
+
+    def test_inventory_opt_in(self):
+        data_obj = DataObj(loc_pattern=os.path.join(self.data_dir, '%Y', '%m', 'rain_%Y%m%d.tif'))
+        self.assertIsNone(data_obj.inventory)
+        with self.assertRaises(ValueError):
+            DataObj(loc_pattern=os.path.join(self.data_dir, '%Y', '%m', 'rain_%Y%m%d.tif'), inventory=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
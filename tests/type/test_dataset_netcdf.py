@@ -0,0 +1,122 @@
+import unittest
+import tempfile
+import subprocess
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+from shybox.type_toolkit.io_dataset_base import Dataset
+from shybox.type_toolkit.io_dataset_grid import DataNetcdf
+from shybox.type_toolkit.io_handle_pool import HandlePool
+
+
+def get_grid(value):
+    values = np.full((40, 50), value, dtype='float32')
+    values[0, 0] = np.nan
+    return xr.DataArray(values, dims=['latitude', 'longitude'], name='rain',
+                        coords={'latitude': np.linspace(45.0, 44.0, 40), 'longitude': np.linspace(8.0, 9.0, 50)})
+
+
+class TestDatasetNetcdf(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.times = pd.date_range('2025-01-01', periods=10, freq='h')
+        self.handle_pool = HandlePool(max_handles=2)
+
+    def tearDown(self):
+        self.handle_pool.close()
+        self.tmp_dir.cleanup()
+
+    def make_dataset(self, **kwargs):
+        return Dataset.from_options({'type': 'netcdf_dataset', 'handle_pool': self.handle_pool,
+                                     'loc_pattern': os.path.join(self.tmp_dir.name, 'rain_%Y.nc'), **kwargs})
+
+    def test_append_and_read(self):
+        data_nc = self.make_dataset()
+        self.assertIsInstance(data_nc, DataNetcdf)
+        for time_id, time in enumerate(self.times):
+            data_nc.write_data(get_grid(time_id), time)
+
+        self.assertEqual(os.listdir(self.tmp_dir.name), ['rain_2025.nc'])
+        data = data_nc.get_data(self.times[3])
+        self.assertEqual(data.shape, (40, 50))
+        self.assertEqual(float(data.mean()), 3.0)
+        self.assertTrue(np.isnan(data.values[0, 0]))
+        self.assertEqual(data_nc.get_time_bounds(), (self.times[0], self.times[-1]))
+
+        # a single file with an unlimited time dimension, the read handle is kept open
+        with xr.open_dataset(os.path.join(self.tmp_dir.name, 'rain_2025.nc')) as data_file:
+            self.assertEqual(data_file['rain'].shape, (10, 40, 50))
+            self.assertEqual(tuple(data_file['rain'].encoding['chunksizes']), (1, 40, 50))
+        self.assertEqual(len(self.handle_pool), 1)
+        misses = self.handle_pool.misses
+        data_nc.get_data(self.times[7])
+        self.assertEqual(self.handle_pool.misses, misses)
+
+        # rewrite in place, time not in the file before its end
+        data_nc.write_data(get_grid(99), self.times[3])
+        self.assertEqual(float(data_nc.get_data(self.times[3]).mean()), 99.0)
+        with self.assertRaises(ValueError):
+            data_nc.write_data(get_grid(0), self.times[3] + pd.Timedelta(minutes=30))
+
+        data_nc.rm_data(self.times[5])
+        self.assertFalse(np.isfinite(data_nc.get_data(self.times[5]).values).any())
+
+    def test_bbox_and_reopen(self):
+        data_nc = self.make_dataset()
+        for time_id, time in enumerate(self.times[:3]):
+            data_nc.write_data(get_grid(time_id), time)
+
+        data_crop = self.make_dataset(bbox=(8.2, 44.2, 8.5, 44.6)).get_data(self.times[2])
+        self.assertEqual(data_crop.shape, (16, 15))
+
+        # the handles of the files changed by other writers are reopened
+        self.handle_pool.close()
+        other_nc = DataNetcdf(loc_pattern=os.path.join(self.tmp_dir.name, 'rain_%Y.nc'), handle_pool=HandlePool())
+        other_nc.write_data(get_grid(7), self.times[3])
+        other_nc.handle_pool.close()
+        self.assertEqual(float(data_nc.get_data(self.times[3]).mean()), 7.0)
+
+    def test_read_other_process(self):
+        # the write handles are closed after each write: the file is not locked for the other processes
+        data_nc = self.make_dataset()
+        data_nc.write_data(get_grid(1), self.times[0])
+        data_nc.get_data(self.times[0])
+        data_nc.write_data(get_grid(2), self.times[1])
+
+        file_name = os.path.join(self.tmp_dir.name, 'rain_2025.nc')
+        code = f'import xarray as xr\nwith xr.open_dataset({file_name!r}) as data: print(data["rain"].shape)'
+        process = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True)
+        self.assertEqual(process.returncode, 0, process.stderr)
+        self.assertEqual(process.stdout.strip(), '(2, 40, 50)')
+
+        # the write handles are kept open with keep_write
+        pool = HandlePool(keep_write=True)
+        other_nc = DataNetcdf(loc_pattern=os.path.join(self.tmp_dir.name, 'other_%Y.nc'), handle_pool=pool)
+        other_nc.write_data(get_grid(0), self.times[0])
+        misses = pool.misses
+        for time_id, time in enumerate(self.times[1:3]):
+            other_nc.write_data(get_grid(time_id), time)
+        self.assertEqual(pool.misses, misses)
+        pool.close()
+
+    def test_write_numpy(self):
+        # the arrays written through the template take the name of the variable of the file
+        data_nc = self.make_dataset()
+        data_nc.write_data(get_grid(1), self.times[0])
+        data_nc.write_data(np.full((40, 50), 2, dtype='float32'), self.times[1])
+
+        other_nc = self.make_dataset()
+        other_nc.write_data(np.full((40, 50), 3, dtype='float32'), self.times[2])
+        self.assertEqual([float(data_nc.get_data(time).mean()) for time in self.times[1:3]], [2.0, 3.0])
+
+        with xr.open_dataset(os.path.join(self.tmp_dir.name, 'rain_2025.nc')) as data_file:
+            self.assertEqual(list(data_file.data_vars), ['rain'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+import tempfile
+import os
+
+import warnings
+import netCDF4
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+from concurrent.futures import ThreadPoolExecutor
+
+from shybox.type_toolkit.io_dataset_base import Dataset
+from shybox.type_toolkit.io_dataset_grid import DataZarr
+
+
+def get_grid(value, dtype='float32'):
+    return xr.DataArray(np.full((40, 50), value, dtype=dtype), dims=['latitude', 'longitude'], name='rain',
+                        coords={'latitude': np.linspace(45.0, 44.0, 40), 'longitude': np.linspace(8.0, 9.0, 50)})
+
+
+class TestDatasetZarr(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.times = pd.date_range('2025-01-01', periods=10, freq='h')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def make_dataset(self, file_name='rain_%Y.zarr', **kwargs):
+        return Dataset.from_options({'type': 'zarr_dataset', 'loc_pattern': os.path.join(self.tmp_dir.name, file_name),
+                                     'time_chunk': 1, 'time_shard': 6, **kwargs})
+
+    def test_append_and_read(self):
+        data_zarr = self.make_dataset()
+        self.assertIsInstance(data_zarr, DataZarr)
+        for time_id, time in enumerate(self.times):
+            data_zarr.write_data(get_grid(time_id), time)
+
+        self.assertEqual(os.listdir(self.tmp_dir.name), ['rain_2025.zarr'])
+        self.assertEqual(float(data_zarr.get_data(self.times[3]).mean()), 3.0)
+        self.assertTrue(data_zarr.check_data(self.times[9]))
+        self.assertFalse(data_zarr.check_data(self.times[9] + pd.Timedelta(hours=1)))
+
+        self.assertEqual(data_zarr.get_time_bounds(), (self.times[0], self.times[-1]))
+        self.assertEqual(len(data_zarr.get_times(pd.date_range('2025-01-01', '2025-01-02'))), 10)
+
+        # rewrite in place, time not in the store before its end
+        data_zarr.write_data(get_grid(99), self.times[3])
+        self.assertEqual(float(self.make_dataset().get_data(self.times[3]).mean()), 99.0)
+        with self.assertRaises(ValueError):
+            data_zarr.write_data(get_grid(0), self.times[3] + pd.Timedelta(minutes=30))
+
+    def test_allocate_concurrent(self):
+        data_zarr = self.make_dataset('forecast.zarr')
+        times = pd.date_range('2025-02-01', periods=72, freq='h')
+        data_zarr.allocate(times, get_grid(0))
+        self.assertTrue(np.isnan(data_zarr.get_data(times[50]).values).all())
+
+        with ThreadPoolExecutor(4) as executor:
+            list(executor.map(lambda step: data_zarr.write_data(get_grid(step[0]), step[1]), enumerate(times)))
+        self.assertEqual([float(data_zarr.get_data(time).mean()) for time in times[::12]], [0, 12, 24, 36, 48, 60])
+
+        data_zarr.rm_data(times[5])
+        self.assertTrue(np.isnan(data_zarr.get_data(times[5]).values).all())
+        self.assertTrue(data_zarr.check_data(times[6]))
+
+    def test_rm_int(self):
+        # the removed steps of the integer variables without a _FillValue take the netcdf default fill value
+        data_zarr = self.make_dataset('flag_%Y.zarr')
+        for time_id, time in enumerate(self.times[:3]):
+            data_zarr.write_data(get_grid(time_id, dtype='int32'), time)
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', RuntimeWarning)
+            data_zarr.rm_data(self.times[1])
+
+        data_removed = self.make_dataset('flag_%Y.zarr').get_data(self.times[1])
+        self.assertEqual(data_removed.dtype, np.int32)
+        self.assertTrue((data_removed.values == netCDF4.default_fillvals['i4']).all())
+        self.assertEqual(float(data_zarr.get_data(self.times[2]).mean()), 2.0)
+
+    def test_write_numpy(self):
+        # the arrays written through the template take the name of the variable of the store
+        data_zarr = self.make_dataset()
+        data_zarr.write_data(get_grid(1), self.times[0])
+        self.make_dataset().write_data(np.full((40, 50), 2, dtype='float32'), self.times[1])
+
+        self.assertEqual(float(data_zarr.get_data(self.times[1]).mean()), 2.0)
+        with xr.open_zarr(os.path.join(self.tmp_dir.name, 'rain_2025.zarr'), consolidated=False) as data_store:
+            self.assertEqual(list(data_store.data_vars), ['rain'])
+
+
+if __name__ == '__main__':
+    unittest.main()
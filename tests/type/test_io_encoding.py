@@ -0,0 +1,114 @@
+import unittest
+import tempfile
+import os
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+import rasterio as rio
+
+from shybox.type_toolkit.io_encoding import get_encoding, get_chunks, get_preset, get_geotiff_options, TILE_SIZE
+from shybox.type_toolkit.io_utils import write_to_file, write_geotiff
+
+
+def get_cube(n_time=6, n_lat=80, n_lon=100):
+    values = np.random.default_rng(1).normal(10.0, 3.0, (n_time, n_lat, n_lon))
+    values[:, 0, 0] = np.nan
+    return xr.Dataset(
+        {'rain': (('time', 'latitude', 'longitude'), values)},
+        coords={'time': pd.date_range('2025-01-01', periods=n_time, freq='h'),
+                'latitude': np.linspace(45.0, 44.0, n_lat), 'longitude': np.linspace(8.0, 9.0, n_lon)})
+
+
+class TestIOEncoding(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.data = get_cube()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_presets(self):
+        self.assertIsNone(get_preset('none'))
+        self.assertEqual(get_preset('default', complevel=1)['complevel'], 1)
+        self.assertEqual(get_preset({'zlib': False})['chunks'], 'space')
+        with self.assertRaises(ValueError):
+            get_preset('unknown')
+
+    def test_chunks(self):
+        self.assertEqual(get_chunks(self.data['rain'], 'space'), (1, 80, 100))
+        self.assertEqual(get_chunks(self.data['rain'], 'time'), (6, TILE_SIZE, TILE_SIZE))
+        self.assertEqual(get_chunks(self.data['rain'], {'time': 2, 'latitude': 500}), (2, 80, 100))
+        self.assertIsNone(get_chunks(self.data['rain'], None))
+
+    def test_encoding(self):
+        encoding = get_encoding(self.data, 'default', variables={'rain': {'complevel': 2}})
+        self.assertEqual(encoding['rain']['complevel'], 2)
+        self.assertEqual(encoding['rain']['dtype'], 'float32')
+        self.assertEqual(get_encoding(self.data, 'fast')['rain']['contiguous'], True)
+        self.assertEqual(get_encoding(self.data, 'none'), {})
+
+    def test_compact_roundtrip(self):
+        file_name = os.path.join(self.tmp_dir.name, 'rain_compact.nc')
+        write_to_file(self.data, file_name, 'netcdf', encoding='compact')
+
+        with xr.open_dataset(file_name) as data:
+            self.assertEqual(data['rain'].encoding['dtype'], np.dtype('int16'))
+            rain = data['rain'].values
+        tolerance = float(np.nanmax(self.data['rain']) - np.nanmin(self.data['rain'])) / 65534
+        np.testing.assert_allclose(rain, self.data['rain'].values, atol=tolerance)
+        self.assertTrue(np.isnan(rain[:, 0, 0]).all())
+
+    def test_write_default(self):
+        file_name = os.path.join(self.tmp_dir.name, 'rain_default.nc')
+        write_to_file(self.data['rain'], file_name, 'netcdf')
+
+        with xr.open_dataset(file_name) as data:
+            encoding = data['rain'].encoding
+            self.assertEqual(encoding['dtype'], np.dtype('float32'))
+            self.assertTrue(encoding['zlib'])
+            self.assertEqual(tuple(encoding['chunksizes']), (1, 80, 100))
+
+    def test_geotiff_options(self):
+        grid_large = xr.DataArray(np.zeros((1000, 1200), dtype='float32'), dims=['y', 'x'])
+        grid_small = xr.DataArray(np.zeros((100, 120), dtype='int16'), dims=['y', 'x'])
+
+        options = get_geotiff_options(grid_large)
+        self.assertTrue(options['tiled'])
+        self.assertEqual((options['blockxsize'], options['predictor'], options['compress']), (256, 3, 'DEFLATE'))
+        self.assertNotIn('tiled', get_geotiff_options(grid_small))
+        self.assertEqual(get_geotiff_options(grid_small)['predictor'], 2)
+
+        self.assertEqual(get_geotiff_options(grid_large, None), get_geotiff_options(grid_large, 'none'))
+        self.assertEqual(get_geotiff_options(grid_large, 'none')['compress'], 'LZW')
+        self.assertEqual(get_geotiff_options(grid_large, overviews='auto')['overview_factors'], [2, 4, 8])
+
+        options = get_geotiff_options(grid_large, 'cog', blocksize=256)
+        self.assertEqual((options['driver'], options['blocksize'], options['overviews']), ('COG', 256, 'AUTO'))
+
+    def test_write_geotiff(self):
+        values = np.random.default_rng(1).normal(10.0, 3.0, (1000, 1200)).astype('float32')
+        grid = xr.DataArray(values, dims=['y', 'x'],
+                            coords={'y': np.linspace(45.0, 44.0, 1000), 'x': np.linspace(8.0, 9.0, 1200)})
+        grid = grid.rio.write_crs('EPSG:4326')
+
+        file_name = os.path.join(self.tmp_dir.name, 'grid_default.tif')
+        write_geotiff(grid, file_name, overviews='auto')
+        with rio.open(file_name) as dst:
+            self.assertEqual(dst.block_shapes, [(256, 256)])
+            self.assertEqual(dst.compression, rio.enums.Compression.deflate)
+            self.assertEqual(dst.overviews(1), [2, 4, 8])
+            np.testing.assert_array_equal(dst.read(1), values)
+
+        file_name = os.path.join(self.tmp_dir.name, 'grid_cog.tif')
+        write_geotiff(grid, file_name, 'cog')
+        with rio.open(file_name) as dst:
+            self.assertEqual(dst.block_shapes, [(512, 512)])
+            self.assertEqual(dst.compression, rio.enums.Compression.deflate)
+            self.assertEqual(dst.overviews(1), [2, 4])
+            np.testing.assert_array_equal(dst.read(1), values)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+import tempfile
+import os
+
+import numpy as np
+import xarray as xr
+import dask.array as da
+
+from shybox.type_toolkit.io_utils import read_from_file
+
+
+class TestReadFromFile(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self.tmp_dir.name, 'rain.nc')
+
+        latitude, longitude = np.linspace(47.0, 36.0, 111), np.linspace(6.0, 19.0, 131)
+        self.data = xr.Dataset(
+            {'rain': (('time', 'latitude', 'longitude'), np.random.default_rng(0).random((3, 111, 131)))},
+            coords={'time': np.array(['2025-01-01', '2025-01-02', '2025-01-03'], dtype='datetime64[ns]'),
+                    'latitude': latitude, 'longitude': longitude})
+        self.data.to_netcdf(self.file_name)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_read_eager(self):
+        data = read_from_file(self.file_name)
+        self.assertIsInstance(data.data, np.ndarray)
+        np.testing.assert_array_equal(data.values, self.data['rain'].values)
+
+        # the file is closed after the read
+        os.remove(self.file_name)
+        self.assertEqual(float(data.sum()), float(self.data['rain'].sum()))
+
+    def test_read_crop(self):
+        bbox, sel = (8.0, 40.0, 10.0, 42.0), {'time': np.datetime64('2025-01-02')}
+        data = read_from_file(self.file_name, bbox=bbox, sel=sel)
+
+        data_expected = self.data['rain'].sel(time=sel['time'], latitude=slice(42.0, 40.0), longitude=slice(8.0, 10.0))
+        self.assertEqual(data.shape, data_expected.shape)
+        np.testing.assert_array_equal(data.values, data_expected.values)
+
+    def test_read_lazy(self):
+        data = read_from_file(self.file_name, lazy=True, chunks={'time': 1}, bbox=(8.0, 40.0, 10.0, 42.0))
+        self.assertIsInstance(data.data, da.Array)
+        self.assertEqual(data.chunks[0], (1, 1, 1))
+
+        data_expected = self.data['rain'].sel(latitude=slice(42.0, 40.0), longitude=slice(8.0, 10.0))
+        np.testing.assert_array_equal(data.values, data_expected.values)
+        data.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+import datetime as dt
+
+import pandas as pd
+
+from shybox.type_toolkit.parse_utils import PathPattern, substitute_string, extract_date_and_tags
+
+
+class TestPathPattern(unittest.TestCase):
+
+    def test_format(self):
+        time = dt.datetime(2025, 3, 7, 5, 9, 2)
+        for pattern in ['/data/%Y/%m/%d/rain_%Y%m%d%H%M.tif', '/data/x_%Y%j_{n:03d}.nc',
+                        '/data/%y%b/f_%%_%H.txt', '/data/static.tif']:
+            path_pattern = PathPattern(pattern)
+            self.assertEqual(path_pattern.format(time, n=7), time.strftime(substitute_string(pattern, {'n': 7})))
+            self.assertEqual(path_pattern.format(None, n=7), substitute_string(pattern, {'n': 7}))
+
+            times = pd.date_range('2024-12-31 22:00', periods=5, freq='h')
+            self.assertEqual(path_pattern.format_times(times, n=3),
+                             [t.strftime(substitute_string(pattern, {'n': 3})) for t in times])
+
+    def test_format_lists(self):
+        path_pattern = PathPattern('/data/{a}/{b}')
+        self.assertEqual(path_pattern.format(a=[1, 2], b=[3, 4]),
+                         substitute_string('/data/{a}/{b}', {'a': [1, 2], 'b': [3, 4]}))
+        self.assertEqual(path_pattern.format(a=1), '/data/1/{b}')
+
+    def test_parse(self):
+        path_pattern = PathPattern('/data/{tile}/%Y/%m/rain_%Y%m%d%H.tif')
+        self.assertEqual(path_pattern.parse('/data/it/2025/03/rain_2025030705.tif'),
+                         (dt.datetime(2025, 3, 7, 5), {'tile': 'it'}))
+        self.assertEqual(extract_date_and_tags('/data/it/2025/03/rain_2025030705.tif', path_pattern.pattern),
+                         path_pattern.parse('/data/it/2025/03/rain_2025030705.tif'))
+        with self.assertRaises(ValueError):
+            path_pattern.parse('/data/it/2025/03/snow_2025030705.tif')
+
+
+if __name__ == '__main__':
+    unittest.main()